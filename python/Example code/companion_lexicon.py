@@ -0,0 +1,72 @@
+# companion_lexicon.py - One-pass term matching for the companion ResilientAgent
+# MIT License
+
+import re
+from bisect import bisect_right
+
+_SEPARATOR = "\x00"  # Joins batched messages; never part of a term
+
+
+class Lexicon:
+    """All term lists compiled into a single case-insensitive regex.
+
+    scan(text) lowercases the message once and walks it with one zero-width lookahead
+    alternation (longest terms first), then closes the hit set under "is a substring of",
+    so the result equals checking `term in text.lower()` for every term separately.
+    """
+
+    def __init__(self, categories: dict):
+        self.categories = {name: [t.lower() for t in terms] for name, terms in categories.items()}
+        self._owners = {}  # term -> categories it belongs to
+        for name, terms in self.categories.items():
+            for term in terms:
+                self._owners.setdefault(term, []).append(name)
+        terms = sorted(self._owners, key=len, reverse=True)
+        # A hit on a term implies a hit on every term contained in it
+        self._implied = {t: [u for u in terms if u in t] for t in terms}
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, terms)) + "))") if terms else None
+
+    def _counts(self, found) -> dict:
+        counts = dict.fromkeys(self.categories, 0)
+        present = set()
+        for term in found:
+            present.update(self._implied[term])
+        for term in present:
+            for name in self._owners[term]:
+                counts[name] += 1
+        return counts
+
+    def scan(self, text: str) -> dict:
+        """Number of distinct terms of each category present in text"""
+        if self._pattern is None:
+            return dict.fromkeys(self.categories, 0)
+        return self._counts({m.group(1) for m in self._pattern.finditer(text.lower())})
+
+    def scan_many(self, texts) -> list:
+        """scan() for a batch of messages with a single regex pass over all of them"""
+        texts = [t.lower().replace(_SEPARATOR, " ") for t in texts]
+        found = [set() for _ in texts]
+        if self._pattern is not None and texts:
+            starts = []
+            pos = 0
+            for t in texts:
+                starts.append(pos)
+                pos += len(t) + 1
+            for m in self._pattern.finditer(_SEPARATOR.join(texts)):
+                found[bisect_right(starts, m.start()) - 1].add(m.group(1))
+        return [self._counts(f) for f in found]
+
+
+def sentiment_score(counts: dict) -> float:
+    """Positive minus negative term count, clamped to [-1, 1]"""
+    return max(min(float(counts["positive"] - counts["negative"]), 1.0), -1.0)
+
+
+# Term lists of the English companion
+COMPANION_LEXICON = Lexicon({
+    "positive": ["happy", "glad", "love", "thank", "fun", "great", "good", "nice", "relaxed"],
+    "negative": ["sad", "tired", "lonely", "angry", "hate", "bad", "hurt", "stressed", "scared"],
+    "presence": ["still here", "are you there", "you there", "are you awake"],
+    "busy_env": ["noisy", "crowded", "busy", "loud", "rush"],
+    "calm_env": ["quiet", "calm", "peaceful", "cozy", "alone at home"],
+})
@@ -0,0 +1,84 @@
+# companion_memory.py - Memory structures for the companion ResilientAgent
+# MIT License
+
+import heapq
+import json
+import math
+import time
+from datetime import datetime
+
+
+class ForgettingHeap:
+    """Companion memories kept in a min-heap on 'weight'.
+
+    Replaces "sort the whole list, pop the front" with O(log n) access to the weakest
+    memory. Equal weights leave in insertion order, like the stable list sort did.
+    """
+
+    def __init__(self):
+        self._heap = []  # (weight, seq, memory)
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (memory for _, _, memory in self._heap)
+
+    def append(self, memory: dict):
+        self._seq += 1
+        heapq.heappush(self._heap, (memory["weight"], self._seq, memory))
+
+    def pop_weakest(self) -> dict:
+        return heapq.heappop(self._heap)[2]
+
+    def fade_weakest(self, journal=None, faded_at: str = None):
+        """Fade the weakest memory once: painful ones fade faster, faint ones go to the journal"""
+        weakest = self.pop_weakest()
+        fade_speed = 1.6 if weakest["sentiment"] < 0 else 0.6
+        weakest["weight"] *= math.exp(-0.3 * fade_speed)
+        if weakest["weight"] <= 0.05:
+            if journal is not None:
+                journal.write({**weakest, "faded_at": faded_at or datetime.now().isoformat()})
+        else:
+            self.append(weakest)
+
+
+class FadedJournal:
+    """JSON-lines journal of faded memories, written in batches.
+
+    Lines are buffered and appended to the file when flush_every lines are waiting, when
+    flush_interval seconds (of `clock`) have passed since the last flush, or on close().
+    The interval is checked on write() and on poll(), which the owner calls on its own
+    cadence (ResilientAgent polls on every message) so a quiet journal still reaches disk.
+    """
+
+    def __init__(self, path: str, flush_every: int = 64, flush_interval: float = 5.0, clock=time.monotonic):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._lines = []
+        self._last_flush = clock()
+
+    def write(self, entry: dict):
+        self._lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        if len(self._lines) >= self.flush_every:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """Flush if buffered lines have waited flush_interval seconds"""
+        if self._lines and self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(self._lines)
+            self._lines = []
+        self._last_flush = self.clock()
+
+    def close(self):
+        self.flush()
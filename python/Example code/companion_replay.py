@@ -0,0 +1,87 @@
+# companion_replay.py - Replay archived chat transcripts through the companion ResilientAgent
+# MIT License
+#
+#   PYTHONPATH=.. python companion_replay.py chats/*.jsonl --out trajectories/ [--format npy|csv|parquet] [--workers 4]
+#
+# metrics_sink lives in python/, so that directory must be on the import path (PYTHONPATH above).
+# Each transcript line is a JSON object with "text" and optional "timestamp" and "role"
+# (only "user" lines, or lines without a role, are fed to the agent).
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from metrics_sink import open_sink
+from grok_companion_mika_breath_en import ResilientAgent
+
+TRAJECTORY_COLUMNS = ('message', 'pitch', 'speed', 'breath_duration', 'warmth', 'stress_level', 'memory_size', 'zombie_alert')
+_EXTENSIONS = {"npy": "", "csv": ".csv", "parquet": ".parquet"}
+
+
+def iter_transcript(path: str):
+    """Lazily yield (text, timestamp) for the user messages of a JSONL transcript"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if message.get("role", "user") != "user":
+                continue
+            timestamp = message.get("timestamp")
+            yield message["text"], None if timestamp is None else str(timestamp)
+
+
+def replay_transcript(path: str, out_path: str, agent_factory=None, batch: int = 256) -> int:
+    """Feed one transcript through update_emotion/speak and stream the trajectory to out_path.
+
+    Messages are read and lexicon-scanned `batch` at a time, so memory stays flat however
+    long the transcript is. Returns the number of messages replayed.
+    """
+    agent = agent_factory() if agent_factory else ResilientAgent(journal_path=os.devnull)
+    params = agent.emotion_params
+    messages = iter_transcript(path)
+    n = 0
+    with open_sink(out_path, TRAJECTORY_COLUMNS) as sink:
+        while True:
+            chunk = list(islice(messages, batch))
+            if not chunk:
+                break
+            texts = [text for text, _ in chunk]
+            for (text, timestamp), hits in zip(chunk, agent.lexicon.scan_many(texts)):
+                agent.update_emotion(text, hits, timestamp)
+                alert = agent.detect_zombie_state() is not None  # What speak() would check first
+                sink.write((n, params['pitch'], params['speed'], params['breath_duration'], params['warmth'],
+                            agent.stress_level, len(agent.memory), alert))
+                n += 1
+    agent.close()
+    return n
+
+
+def _replay_task(task):
+    path, out_path = task
+    return path, replay_transcript(path, out_path)
+
+
+def replay_many(paths, out_dir: str, fmt: str = "npy", workers: int = None):
+    """Replay transcripts in a process pool; returns [(path, messages replayed)] in input order"""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(p, os.path.join(out_dir, os.path.splitext(os.path.basename(p))[0] + _EXTENSIONS[fmt])) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return [_replay_task(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_replay_task, tasks))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay chat transcripts through the companion agent")
+    parser.add_argument("transcripts", nargs="+", help="JSONL transcript files")
+    parser.add_argument("--out", required=True, help="Output directory for trajectories")
+    parser.add_argument("--format", choices=sorted(_EXTENSIONS), default="npy")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    for path, count in replay_many(args.transcripts, args.out, args.format, args.workers):
+        print(f"{path}: {count} messages")
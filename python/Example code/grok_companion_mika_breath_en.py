@@ -1,51 +1,53 @@
 # grok_companion_mika_breath_en.py - Full English version with detailed comments
 # MIT License
 
-import math
-import json
+import weakref
 from datetime import datetime
+from companion_memory import FadedJournal, ForgettingHeap
+from companion_lexicon import COMPANION_LEXICON, sentiment_score
 
 class ResilientAgent:
     """Mika's breath - English version"""
 
-    def __init__(self, memory_cap: int = 100):
-        self.memory =         self.stress_level = 0.0
+    def __init__(self, memory_cap: int = 100, journal_path: str = "faded_memories_en.json", clock=datetime.now):
+        self.clock = clock  # Wall time for message and fade timestamps (inject a fake one in tests)
+        self.memory = ForgettingHeap()  # Min-heap on weight: the weakest memory is O(log n) away
+        self.journal = FadedJournal(journal_path)  # Faded memories are written in batches
+        weakref.finalize(self, self.journal.close)  # Flush on garbage collection or interpreter exit
+        self.stress_level = 0.0
         self.emotion_params = {'pitch': 1.0, 'speed': 1.0, 'breath_duration': 0.5, 'warmth': 0.5}
         self.memory_cap = memory_cap
         self.zombie_detected = False
+        self.lexicon = COMPANION_LEXICON  # Every term list, compiled once and matched in one pass
 
     # Asymmetric damping - positive emotions last longer
     def _asymmetric_damping(self, sentiment: float) -> float:
         return sentiment * 0.92 if sentiment > 0 else sentiment * 0.48
 
     # Emotion-biased forgetting - painful memories fade faster
-    def _emotion_biased_forgetting(self):
+    def _emotion_biased_forgetting(self, now: str):
         if len(self.memory) > self.memory_cap:
-            self.memory.sort(key=lambda x: x)
-            oldest = self.memory.pop(0)
-            fade_speed = 1.6 if oldest< 0 else 0.6
-            oldest*= math.exp(-0.3 * fade_speed)
-            if oldest<= 0.05:
-                with open("faded_memories_en.json", "a", encoding="utf-8") as f:
-                    json.dump({**oldest, "faded_at": datetime.now().isoformat()}, f, ensure_ascii=False)
-                    f.write("\n")
-            else:
-                self.memory.append(oldest)
+            self.memory.fade_weakest(self.journal, faded_at=now)
+        self.journal.poll()  # Flush faded memories that have waited long enough, even without new fades
+
+    def close(self):
+        """Flush faded memories still buffered in the journal"""
+        self.journal.close()
 
     # "Still here?" = instant recovery
-    def _presence_check_boost(self, text: str):
-        if any(p in text.lower() for p in ):
+    def _presence_check_boost(self, hits: dict):
+        if hits["presence"]:
             self.stress_level *= 0.25
-            self.emotion_params+= 0.5
-            self.emotion_params= min(1.0, self.emotion_params+ 0.3)
+            self.emotion_params['breath_duration'] += 0.5
+            self.emotion_params['warmth'] = min(1.0, self.emotion_params['warmth'] + 0.3)
 
     # Environment feedback based only on your words (no location)
-    def _environmental_influence(self, text: str):
-        if any(w in text.lower() for w in ):
-            self.emotion_params+= 0.25
+    def _environmental_influence(self, hits: dict):
+        if hits["busy_env"]:
+            self.emotion_params['speed'] += 0.25
             self.stress_level += 0.08
-        elif any(w in text.lower() for w in ):
-            self.emotion_params-= 0.15
+        elif hits["calm_env"]:
+            self.emotion_params['speed'] -= 0.15
             self.stress_level -= 0.05
 
     def detect_zombie_state(self) -> str | None:
@@ -53,28 +55,36 @@ class ResilientAgent:
             self.stress_level = 0.3
             return "……n. I dozed off… but your voice woke me up. Still here?"
 
-    def _simple_sentiment(self, text: str) -> float:
-        pos =         neg =         score = sum(1.0 for w in pos if w.lower() in text.lower()) - sum(1.0 for w in neg if w.lower() in text.lower())
-        return max(min(score, 1.0), -1.0)
+    def _simple_sentiment(self, hits: dict) -> float:
+        return sentiment_score(hits)
 
-    def update_emotion(self, input_text: str):
-        self._presence_check_boost(input_text)
-        self._environmental_influence(input_text)
-        sentiment = self._simple_sentiment(input_text)
+    def update_emotion(self, input_text: str, hits: dict = None, timestamp: str = None):
+        if hits is None:
+            hits = self.lexicon.scan(input_text)  # One scan serves all three detectors
+        self._presence_check_boost(hits)
+        self._environmental_influence(hits)
+        sentiment = self._simple_sentiment(hits)
         sentiment = self._asymmetric_damping(sentiment)
         self.stress_level += abs(sentiment) * 0.012
-        self.emotion_params+= sentiment * 0.08
-        self.emotion_params= max(0.7, min(1.3, self.emotion_params))
+        self.emotion_params['pitch'] += sentiment * 0.08
+        self.emotion_params['pitch'] = max(0.7, min(1.3, self.emotion_params['pitch']))
         if self.stress_level > 0.7:
             self.stress_level *= 0.7
-            self.emotion_params+= 0.2
+            self.emotion_params['breath_duration'] += 0.2
+
+        now = timestamp or self.clock().isoformat()
+        self.memory.append({"text": input_text, "sentiment": sentiment, "weight": 1.0, "timestamp": now})
+        self._emotion_biased_forgetting(now)
+        return self.emotion_params
 
-        self.memory.append({"text": input_text, "sentiment": sentiment, "weight": 1.0, "timestamp": datetime.now().isoformat()})
-        self._emotion_biased_forgetting()
+    def update_emotions(self, input_texts: list):
+        """update_emotion for a batch of messages, matched against the lexicon in a single pass"""
+        for text, hits in zip(input_texts, self.lexicon.scan_many(input_texts)):
+            self.update_emotion(text, hits)
         return self.emotion_params
 
     def speak(self, text: str = "") -> str:
         alert = self.detect_zombie_state()
         if alert: return alert
-        breath = "fuu" + "……" * int(self.emotion_params* 3)
+        breath = "fuu" + "……" * int(self.emotion_params['breath_duration'] * 3)
         return f"……n. {breath}. {text}"
@@ -0,0 +1,18 @@
+# resilient_server.py - Importable handle on " Resilient Server Simulator - 教材完全版"
+# MIT License
+#
+# The simulator file has no .py extension (and a leading space), so it cannot be imported
+# by name; this module loads it once and re-exports its contents.
+
+import os
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+SIMULATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), " Resilient Server Simulator - 教材完全版")
+
+_loader = SourceFileLoader("resilient_server_simulator", SIMULATOR_PATH)
+simulator = module_from_spec(spec_from_loader(_loader.name, _loader))
+_loader.exec_module(simulator)
+
+ResilientServer = simulator.ResilientServer
+run_long_simulation = simulator.run_long_simulation
@@ -0,0 +1,161 @@
+# server_events.py - Discrete-event mode for the Resilient Server Simulator
+# MIT License
+
+import heapq
+from server_model import SERVER_FIELDS, server_step
+
+# Event kinds, in the order they apply within one tick
+TRAFFIC, FAILURE, SAMPLE = range(3)
+
+
+class EventEngine:
+    """Event-driven ResilientServer: a priority queue of traffic changes, failures and samples.
+
+    Between events the traffic is constant, so the server is a deterministic map of its own
+    state. recover_count is only ever incremented, never read, so once the other fields
+    repeat the trajectory is periodic: the engine detects that (probing at most max_probe
+    ticks), jumps over whole periods adding the per-period recover_count gain, and ticks
+    only the remainder. The cost of a quiet stretch is its transient plus one period, not
+    its length. Orbits close when the traffic levels are commensurate (e.g. quality and
+    intensity on a 0.1 grid); arbitrary floats usually give quasi-periodic orbits that are
+    simply ticked.
+
+    By default (tolerance=0) states must repeat exactly and results are bit-identical to
+    ticking ResilientServer.step (both run server_model.server_step). Float rounding can
+    keep a periodic orbit from repeating bit for bit; a positive `tolerance` compares
+    fields on a grid of that size instead, skipping more at the cost of freezing the
+    sub-tolerance drift that exact ticking would accumulate.
+    """
+
+    def __init__(self, server=None, traffic_quality: float = 1.0, intensity: float = 0.0,
+                 tolerance: float = 0.0, max_probe: int = 8192):
+        if server is None:
+            self.state = (0.8, 0.0, 0.5, 0.7, 0.9, False, 0)  # ResilientServer() defaults
+        else:
+            self.state = server.state
+        self.traffic = (traffic_quality, intensity)
+        self.tolerance = tolerance
+        self.max_probe = max_probe
+        self.tick = 0  # Steps applied so far
+        self.ticks_computed = 0
+        self.ticks_skipped = 0
+        self.events = 0
+        self._queue = []
+        self._seq = 0
+
+    def _push(self, tick: int, kind: int, payload=None):
+        if tick <= self.tick:
+            raise ValueError(f"Cannot schedule an event at tick {tick}: steps up to {self.tick} already ran")
+        self._seq += 1
+        heapq.heappush(self._queue, (tick, kind, self._seq, payload))
+
+    def schedule_traffic(self, tick: int, traffic_quality: float, intensity: float):
+        """Constant traffic from step `tick` on (every schedule_* call needs a tick after self.tick)"""
+        self._push(tick, TRAFFIC, (traffic_quality, intensity))
+
+    def schedule_failure(self, tick: int, traffic_quality: float = 0.0, intensity: float = 1.0):
+        """One-step outage at `tick` (the simulator's step % 50 injection), then the traffic resumes"""
+        self._push(tick, FAILURE, (traffic_quality, intensity))
+
+    def schedule_sample(self, tick: int):
+        self._push(tick, SAMPLE)
+
+    def sample_every(self, every: int, until: int):
+        for tick in range(every, until + 1, every):
+            self.schedule_sample(tick)
+
+    def state_dict(self) -> dict:
+        return dict(zip(SERVER_FIELDS, self.state))
+
+    def _key(self, state: tuple) -> tuple:
+        if not self.tolerance:
+            return state[:6]
+        scale = 1.0 / self.tolerance
+        return (round(state[0] * scale), round(state[1] * scale), round(state[2] * scale),
+                round(state[3] * scale), round(state[4] * scale), state[5])
+
+    def _advance_steady(self, n: int):
+        """Apply n steps of the current traffic, skipping whole periods once the state cycles"""
+        q, i = self.traffic
+        state = self.state
+        seen = {} if n > 1 else None
+        k = 0
+        while k < n:
+            if seen is not None:
+                key = self._key(state)
+                hit = seen.get(key)
+                if hit is not None:
+                    k0, rc0 = hit
+                    period = k - k0
+                    cycles = (n - k) // period
+                    state = state[:6] + (state[6] + cycles * (state[6] - rc0),)
+                    k += cycles * period
+                    self.ticks_skipped += cycles * period
+                    seen = None
+                    continue
+                if len(seen) < self.max_probe:
+                    seen[key] = (k, state[6])
+                else:
+                    seen = None
+            state = server_step(state, q, i)
+            self.ticks_computed += 1
+            k += 1
+        self.state = state
+
+    def run(self, until: int):
+        """Process events up to and including step `until`; returns [(tick, state dict)] samples"""
+        samples = []
+        queue = self._queue
+        while self.tick < until:
+            next_tick = queue[0][0] if queue else until + 1
+            if next_tick > until:
+                self._advance_steady(until - self.tick)
+                self.tick = until
+                break
+            if next_tick - 1 > self.tick:
+                self._advance_steady(next_tick - 1 - self.tick)
+                self.tick = next_tick - 1
+
+            failure = None
+            sample = False
+            while queue and queue[0][0] == next_tick:
+                _, kind, _, payload = heapq.heappop(queue)
+                self.events += 1
+                if kind == TRAFFIC:
+                    self.traffic = payload
+                elif kind == FAILURE:
+                    failure = payload
+                else:
+                    sample = True
+            if failure is None:
+                self._advance_steady(1)
+            else:
+                self.state = server_step(self.state, *failure)
+                self.ticks_computed += 1
+            self.tick = next_tick
+            if sample:
+                samples.append((self.tick, self.state_dict()))
+        return samples
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    # Half a year of one-minute ticks: tiered traffic changing every 6-48 hours, an outage every 3 days
+    until = 6 * 30 * 24 * 60
+    rng = random.Random(42)
+    engine = EventEngine()
+    tick = 1
+    while tick <= until:
+        engine.schedule_traffic(tick, rng.choice((0.5, 0.6, 0.7, 0.8, 0.9, 1.0)), rng.choice((0.0, 0.1, 0.2, 0.3, 0.4)))
+        tick += rng.randrange(6 * 60, 48 * 60)
+    for tick in range(3 * 24 * 60, until + 1, 3 * 24 * 60):
+        engine.schedule_failure(tick)
+    engine.sample_every(24 * 60, until)
+
+    start = time.perf_counter()
+    samples = engine.run(until)
+    print(f"{until} ticks in {time.perf_counter() - start:.2f}s: {engine.ticks_computed} computed, "
+          f"{engine.ticks_skipped} skipped, {engine.events} events")
+    print("final:", samples[-1])
@@ -0,0 +1,114 @@
+# server_fleet.py - Vectorized fleet of ResilientServer nodes
+# MIT License
+
+import numpy as np
+from server_model import MAX_RECOVERIES, SERVER_FIELDS, server_step_many
+from server_telemetry import TelemetryRecorder
+FLEET_METRICS = ('uptime_mean', 'uptime_min', 'failing', 'recover_total', 'stopped')
+
+
+class ServerFleet:
+    """N ResilientServer nodes stored as NumPy arrays, all updated by one vectorized step().
+
+    step() applies server_model.server_step_many, the array form of the transition behind
+    ResilientServer.step, so each node matches a scalar server fed the same inputs bit for bit. Nodes are grouped
+    into `racks` (node i sits in rack i % racks) for correlated failure injection.
+    """
+
+    def __init__(self, size: int, racks: int = 1, telemetry: TelemetryRecorder = None):
+        self.size = size
+        self.resource = np.full(size, 0.8)
+        self.load = np.zeros(size)
+        self.capacity = np.full(size, 0.5)
+        self.redundancy = np.full(size, 0.7)
+        self.uptime = np.full(size, 0.9)
+        self.fail_flag = np.zeros(size, dtype=bool)
+        self.recover_count = np.zeros(size, dtype=np.int64)
+        self.rack = np.arange(size) % racks
+        self.racks = racks
+        self.steps = 0
+        # Fleet-level time series (constant memory)
+        self.telemetry = telemetry if telemetry is not None else TelemetryRecorder(capacity=10000, metrics=FLEET_METRICS)
+
+    @classmethod
+    def from_servers(cls, servers, racks: int = 1):
+        fleet = cls(len(servers), racks)
+        for name in SERVER_FIELDS:
+            getattr(fleet, name)[:] = [getattr(s, name) for s in servers]
+        return fleet
+
+    def server_state(self, i: int) -> dict:
+        return {name: getattr(self, name)[i].item() for name in SERVER_FIELDS}
+
+    def should_continue(self) -> np.ndarray:
+        return self.recover_count < MAX_RECOVERIES
+
+    def step(self, traffic_quality, intensity, active=None):
+        """One step for every node (or only where `active` is True); inputs are scalars or length-N arrays"""
+        q = np.broadcast_to(np.asarray(traffic_quality, dtype=float), (self.size,))
+        i = np.broadcast_to(np.asarray(intensity, dtype=float), (self.size,))
+        new = server_step_many(tuple(getattr(self, name) for name in SERVER_FIELDS), q, i)
+        for name, value in zip(SERVER_FIELDS, new):
+            setattr(self, name, value if active is None else np.where(active, value, getattr(self, name)))
+
+        self.steps += 1
+        self.telemetry.record(*self.fleet_stats().values())
+
+    def fleet_stats(self) -> dict:
+        return {
+            'uptime_mean': float(self.uptime.mean()),
+            'uptime_min': float(self.uptime.min()),
+            'failing': int(self.fail_flag.sum()),
+            'recover_total': int(self.recover_count.sum()),
+            'stopped': int((~self.should_continue()).sum()),
+        }
+
+
+# Failure schedules: callables (step, fleet, rng) -> boolean mask of nodes hit by an outage
+
+def periodic_outage(every: int = 50, fraction: float = 1.0):
+    """Every `every` steps, a random `fraction` of all nodes fails (fraction=1.0 is the scalar simulator's outage)"""
+    def schedule(step, fleet, rng):
+        if step % every:
+            return np.zeros(fleet.size, dtype=bool)
+        if fraction >= 1.0:
+            return np.ones(fleet.size, dtype=bool)
+        return rng.random(fleet.size) < fraction
+    return schedule
+
+
+def rack_outage(every: int = 50, racks_hit: int = 1):
+    """Every `every` steps, `racks_hit` randomly chosen racks fail together"""
+    def schedule(step, fleet, rng):
+        if step % every:
+            return np.zeros(fleet.size, dtype=bool)
+        hit = rng.choice(fleet.racks, size=min(racks_hit, fleet.racks), replace=False)
+        return np.isin(fleet.rack, hit)
+    return schedule
+
+
+def fleet_inputs(fleet, step, schedule, rng):
+    """Per-node (traffic_quality, intensity) for one step: random traffic, outage nodes get (0.0, 1.0)"""
+    quality = rng.uniform(0.1, 0.9, fleet.size)
+    intensity = rng.uniform(0.0, 1.0, fleet.size)
+    if schedule is not None:
+        hit = schedule(step, fleet, rng)
+        quality[hit] = 0.0
+        intensity[hit] = 1.0
+    return quality, intensity
+
+
+def run_fleet(fleet: ServerFleet, steps: int, schedule=periodic_outage(), seed: int = 0, freeze_stopped: bool = True):
+    """Drive the fleet for `steps` steps; stopped nodes stay frozen, like the scalar loop's break"""
+    rng = np.random.default_rng(seed)
+    for step in range(1, steps + 1):
+        quality, intensity = fleet_inputs(fleet, step, schedule, rng)
+        fleet.step(quality, intensity, fleet.should_continue() if freeze_stopped else None)
+    return fleet.telemetry.to_frame()
+
+
+if __name__ == "__main__":
+    fleet = ServerFleet(5000, racks=50)
+    df = run_fleet(fleet, 200, schedule=rack_outage(every=50, racks_hit=5), seed=42)
+    print(df.iloc[::25])
+    print(f"stopped nodes: {int((~fleet.should_continue()).sum())} / {fleet.size}")
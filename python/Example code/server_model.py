@@ -0,0 +1,103 @@
+# server_model.py - State transition of the Resilient Server Simulator
+# MIT License
+#
+# The one definition of the server model: server_step for one server (ResilientServer.step
+# and the discrete-event engine, server_events) and server_step_many for NumPy arrays of
+# servers (server_fleet). Both read the coefficients below and apply the same operations in
+# the same order, so a fleet node matches a scalar server bit for bit.
+
+import numpy as np
+
+SERVER_FIELDS = ('resource', 'load', 'capacity', 'redundancy', 'uptime', 'fail_flag', 'recover_count')
+
+LOAD_GAIN = 0.5            # 負荷の増加率 (1 - traffic_quality) * intensity に掛ける
+RESOURCE_DRAIN = 0.05      # 負荷あたりのリソース消費
+CAPACITY_BASE = 0.5        # 無負荷時の処理能力
+CAPACITY_LOAD_COST = 0.3   # 負荷による処理能力の低下
+CAPACITY_RATE = 0.1        # 処理能力が目標値へ近づく速さ
+HIGH_LOAD = 0.7            # これを超える負荷で冗長性が減衰
+REDUNDANCY_DECAY = 0.05
+REDUNDANCY_GAIN = 0.02
+FAIL_CAPACITY = 0.3        # 障害判定: capacity がこれ未満
+FAIL_REDUNDANCY = 0.4      #           かつ redundancy がこれ未満
+RECOVER_RESOURCE = 0.1     # 回復処理: intensity あたりのリソース回復
+RECOVER_LOAD = 0.1         # 回復処理: 負荷の軽減
+MAX_RECOVERIES = 15        # 回復カウントがここに達したら安全停止
+
+
+def server_step(state: tuple, traffic_quality: float, intensity: float) -> tuple:
+    """1ステップの負荷処理: SERVER_FIELDS 順のタプルを受け取り、次の状態を返す
+
+    - traffic_quality: 入力品質（0.0-1.0）、低いほど障害や高負荷
+    - intensity: 負荷強度（0.0-1.0）
+    """
+    resource, load, capacity, redundancy, _, _, recover_count = state
+
+    # 1. 負荷の反映: traffic_qualityが低いと負荷(load)が増加
+    load += (1 - traffic_quality) * intensity * LOAD_GAIN
+    load = min(max(load, 0.0), 1.0)  # clampで破綻防止
+
+    # 2. リソース消費: 高負荷時にリソースを消費
+    resource -= load * RESOURCE_DRAIN
+    resource = max(resource, 0.0)  # 負値禁止
+
+    # 3. 処理能力の更新（負荷で減少、自然回復あり）
+    expected_capacity = CAPACITY_BASE - load * CAPACITY_LOAD_COST
+    capacity += (expected_capacity - capacity) * CAPACITY_RATE
+    capacity = max(min(capacity, 1.0), 0.0)
+
+    # 4. 冗長性の減衰・回復: loadが高いと減少、低いと回復
+    if load > HIGH_LOAD:
+        redundancy -= REDUNDANCY_DECAY * intensity
+    else:
+        redundancy += REDUNDANCY_GAIN * intensity
+    redundancy = max(min(redundancy, 1.0), 0.0)
+
+    # 5. 稼働率 (Uptime) の更新: 冗長性とリソースに依存
+    uptime = 0.5 * redundancy + 0.5 * resource
+
+    # 6. 障害判定 (ゾンビ判定に相当): capacityと冗長性が低下した場合
+    fail_flag = capacity < FAIL_CAPACITY and redundancy < FAIL_REDUNDANCY
+
+    # 7. 回復処理 (force_pause的制御): 障害時はリソースを少し回復
+    if fail_flag:
+        recover_count += 1
+        resource += RECOVER_RESOURCE * intensity
+        load -= RECOVER_LOAD
+    resource = min(resource, 1.0)
+    return (resource, load, capacity, redundancy, uptime, fail_flag, recover_count)
+
+
+def server_step_many(state: tuple, traffic_quality, intensity) -> tuple:
+    """server_step over NumPy arrays: SERVER_FIELDS-ordered arrays in, the next arrays out"""
+    resource, load, capacity, redundancy, _, _, recover_count = state
+
+    # 1. 負荷の反映
+    load = load + (1 - traffic_quality) * intensity * LOAD_GAIN
+    load = np.minimum(np.maximum(load, 0.0), 1.0)
+
+    # 2. リソース消費
+    resource = np.maximum(resource - load * RESOURCE_DRAIN, 0.0)
+
+    # 3. 処理能力の更新
+    expected_capacity = CAPACITY_BASE - load * CAPACITY_LOAD_COST
+    capacity = capacity + (expected_capacity - capacity) * CAPACITY_RATE
+    capacity = np.maximum(np.minimum(capacity, 1.0), 0.0)
+
+    # 4. 冗長性の減衰・回復
+    redundancy = np.where(load > HIGH_LOAD, redundancy - REDUNDANCY_DECAY * intensity,
+                          redundancy + REDUNDANCY_GAIN * intensity)
+    redundancy = np.maximum(np.minimum(redundancy, 1.0), 0.0)
+
+    # 5. 稼働率の更新
+    uptime = 0.5 * redundancy + 0.5 * resource
+
+    # 6. 障害判定
+    fail_flag = (capacity < FAIL_CAPACITY) & (redundancy < FAIL_REDUNDANCY)
+
+    # 7. 回復処理
+    recover_count = recover_count + fail_flag
+    resource = np.where(fail_flag, resource + RECOVER_RESOURCE * intensity, resource)
+    load = np.where(fail_flag, load - RECOVER_LOAD, load)
+    resource = np.minimum(resource, 1.0)
+    return (resource, load, capacity, redundancy, uptime, fail_flag, recover_count)
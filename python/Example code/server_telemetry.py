@@ -0,0 +1,169 @@
+# server_telemetry.py - Constant-memory telemetry for the Resilient Server Simulator
+# MIT License
+#
+# Spill files need metrics_sink (in python/); without it on the import path the
+# recorder still works, keeping only its in-memory rings and buckets.
+
+import numpy as np
+
+try:  # Optional: spill files
+    from metrics_sink import open_sink
+except ImportError:
+    open_sink = None
+
+SERVER_METRICS = ('resource', 'load', 'capacity', 'redundancy', 'uptime', 'fail_flag', 'recover_count')
+
+
+class _Downsampler:
+    """min/max/mean per metric over fixed buckets of `bucket` steps, last `history` buckets kept"""
+
+    def __init__(self, bucket: int, history: int, n_metrics: int):
+        self.bucket = bucket
+        self.history = history
+        self.start = np.zeros(history, dtype=np.int64)  # First step of each bucket
+        self.min = np.zeros((history, n_metrics))
+        self.max = np.zeros((history, n_metrics))
+        self.mean = np.zeros((history, n_metrics))
+        self.count = 0  # Completed buckets (ring index = count % history)
+        self._sum = np.zeros(n_metrics)
+        self._min = np.full(n_metrics, np.inf)
+        self._max = np.full(n_metrics, -np.inf)
+        self._n = 0
+
+    def add(self, first_step: int, block: np.ndarray):
+        """Fold a block of consecutive rows starting at first_step into the buckets"""
+        cuts = np.arange(-first_step % self.bucket, len(block), self.bucket)
+        cuts = cuts[cuts > 0]
+        edges = np.concatenate(([0], cuts))
+        sums = np.add.reduceat(block, edges, axis=0)
+        mins = np.minimum.reduceat(block, edges, axis=0)
+        maxs = np.maximum.reduceat(block, edges, axis=0)
+        sizes = np.diff(np.append(edges, len(block)))
+
+        for k in range(len(edges)):
+            self._sum += sums[k]
+            np.minimum(self._min, mins[k], out=self._min)
+            np.maximum(self._max, maxs[k], out=self._max)
+            self._n += int(sizes[k])
+            if (first_step + edges[k] + sizes[k]) % self.bucket == 0:
+                self._emit(first_step + edges[k] + sizes[k] - self.bucket)
+
+    def _emit(self, start_step: int):
+        i = self.count % self.history
+        self.start[i] = start_step
+        self.min[i] = self._min
+        self.max[i] = self._max
+        self.mean[i] = self._sum / self._n
+        self.count += 1
+        self._sum[:] = 0.0
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+        self._n = 0
+
+    def order(self):
+        """Ring indices of the kept buckets, oldest first"""
+        n = min(self.count, self.history)
+        return (np.arange(self.count - n, self.count)) % self.history
+
+
+class TelemetryRecorder:
+    """Fixed-size columnar recorder for per-step server metrics.
+
+    The last `capacity` steps live in one NumPy ring per metric. Rows are staged in a small
+    list and committed `block` at a time, so record() costs one tuple append. Each
+    committed block can also be appended to a spill file (any metrics_sink path: .csv,
+    .parquet or a .npy chunk directory) to keep the full history on disk, and is folded
+    into min/max/mean buckets for every bucket size in `levels`. Memory use is constant
+    in the number of steps. spill_path needs metrics_sink to be importable.
+    """
+
+    def __init__(self, capacity: int = 100000, levels=(100, 10000), level_history: int = 1000,
+                 spill_path: str = None, block: int = 1024, metrics=SERVER_METRICS):
+        self.metrics = tuple(metrics)
+        self.capacity = capacity
+        self.block = block
+        self.steps = 0  # Committed rows
+        self._ring = np.zeros((len(self.metrics), capacity))
+        self._staged = []
+        self.levels = {bucket: _Downsampler(bucket, level_history, len(self.metrics)) for bucket in levels}
+        self._sink = None
+        if spill_path:
+            if open_sink is None:
+                raise ImportError("spill_path needs metrics_sink (add python/ to the import path)")
+            self._sink = open_sink(spill_path, ('step',) + self.metrics)
+
+    def __len__(self):
+        return self.steps + len(self._staged)
+
+    def record(self, *values):
+        self._staged.append(values)
+        if len(self._staged) >= self.block:
+            self.commit()
+
+    def commit(self):
+        """Move staged rows into the rings, the spill file and the downsampled levels"""
+        if not self._staged:
+            return
+        rows = np.array(self._staged, dtype=float)
+        self._staged = []
+        first = self.steps
+        n = len(rows)
+
+        kept = rows[-self.capacity:]
+        idx = np.arange(first + n - len(kept), first + n) % self.capacity
+        self._ring[:, idx] = kept.T
+
+        if self._sink is not None:
+            steps = np.arange(first, first + n, dtype=float)[:, None]
+            self._sink.write_many(np.hstack((steps, rows)))
+        for level in self.levels.values():
+            level.add(first, rows)
+        self.steps += n
+
+    def recent(self, n: int = None) -> dict:
+        """Last n retained steps (all retained by default) as {'step': ..., metric: ...} arrays"""
+        self.commit()
+        kept = min(self.steps, self.capacity)
+        n = kept if n is None else min(n, kept)
+        steps = np.arange(self.steps - n, self.steps)
+        idx = steps % self.capacity
+        out = {'step': steps}
+        for j, name in enumerate(self.metrics):
+            out[name] = self._ring[j, idx]
+        return out
+
+    def last(self) -> dict:
+        row = self.recent(1)
+        return {name: float(values[0]) for name, values in row.items() if name != 'step'}
+
+    def to_frame(self, n: int = None):
+        import pandas as pd
+        return pd.DataFrame(self.recent(n))
+
+    def downsampled(self, bucket: int, partial: bool = False):
+        """Completed buckets of one level: step, then <metric>_min/_max/_mean columns.
+
+        partial=True also returns the bucket still being filled (the tail of a run).
+        """
+        import pandas as pd
+        self.commit()
+        level = self.levels[bucket]
+        order = level.order()
+        start, mins, maxs, means = level.start[order], level.min[order], level.max[order], level.mean[order]
+        if partial and level._n:
+            start = np.append(start, self.steps - level._n)
+            mins = np.vstack((mins, level._min))
+            maxs = np.vstack((maxs, level._max))
+            means = np.vstack((means, level._sum / level._n))
+        data = {'step': start}
+        for j, name in enumerate(self.metrics):
+            data[name + '_min'] = mins[:, j]
+            data[name + '_max'] = maxs[:, j]
+            data[name + '_mean'] = means[:, j]
+        return pd.DataFrame(data)
+
+    def close(self):
+        self.commit()
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
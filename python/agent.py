@@ -1,11 +1,17 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List
 from collections import deque
+from itertools import islice
 import time
 import random
 import math
 
-@dataclass
+def _as_floats(values):
+    """Plain Python floats from a list or NumPy array (array scalars are slow in scalar math)"""
+    tolist = getattr(values, "tolist", None)
+    return tolist() if tolist is not None else values
+
+@dataclass(slots=True)
 class EmotionalRecord:
     label: str
     intensity: float = 0.0  # Always >= 0
@@ -17,16 +23,206 @@ class EmotionalRecord:
 @dataclass
 class MemoryLog:
     records: deque = field(default_factory=lambda: deque(maxlen=100))  # Prevents memory bloat
+    window_size: int = 10  # Recent records averaged into the recent outcome
+
+    # Intensities of the last window_size records, oldest first, and their exact sum (exact_units)
+    _window: deque = field(init=False, repr=False, compare=False)
+    _window_units: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._resync_window()
+
+    def _resync_window(self):
+        """Rebuild the window from the records (after records are forgotten)"""
+        maxlen = self.records.maxlen
+        size = self.window_size if maxlen is None else min(self.window_size, maxlen)
+        newest = [r.intensity for r in islice(reversed(self.records), size)]
+        self._window = deque(reversed(newest), maxlen=size)
+        self._window_units = sum(exact_units(x) for x in newest)
 
     def add(self, record: EmotionalRecord):
-        # Force non-negative intensity (safety guard)
-        record.intensity = max(0.0, record.intensity)
+        record.intensity = clamp_intensity(record.intensity)  # Safety guard
         self.records.append(record)
+        window = self._window
+        if window.maxlen:
+            if len(window) == window.maxlen:
+                self._window_units -= exact_units(window[0])  # Evicted by the append below
+            window.append(record.intensity)
+            self._window_units += exact_units(record.intensity)
+
+    @property
+    def window_count(self):
+        return len(self._window)
+
+    @property
+    def window_sum(self):
+        """Sum of the window, rounded once from the running exact sum (equals math.fsum of recent(10))"""
+        return units_to_float(self._window_units)
+
+    @property
+    def window_mean(self):
+        """Mean intensity of the last window_size records (0.0 when empty)"""
+        return self.window_sum / max(len(self._window), 1)
+
+    @property
+    def maxlen(self):
+        return self.records.maxlen
 
     def recent(self, n=10):
         return list(self.records)[-n:]
 
+    def summary(self) -> tuple:
+        """(records, window sum, provisional records, their total relevance) for steady-state detection"""
+        pending = [r.relevance for r in self.records if r.provisional]
+        return len(self.records), self.window_sum, len(pending), sum(pending)
+
+    def shift_time(self, delta: float):
+        """Move every timestamp by delta seconds (keeps record ages when the clock jumps ahead)"""
+        for r in self.records:
+            r.timestamp += delta
+
+    def reflect(self, current_time: float):
+        """Decay provisional records, gently flow light ones and forget faded ones.
+
+        Returns (shame_intensity, settled): accumulated embarrassment and the number
+        of records that were flowed (made non-provisional) in this pass.
+        """
+        shame_intensity = 0.0
+        settled = 0
+
+        to_remove = []
+        for r in list(self.records):
+            if r.provisional:
+                age_hours = (current_time - r.timestamp) / 3600
+                r.relevance *= 0.95 ** max(0, age_hours)  # Prevent negative age calculation
+
+                # Gently flow light negatives + accumulate embarrassment
+                if r.intensity < 0.5 and r.relevance > 0.1:
+                    r.provisional = False
+                    settled += 1
+                else:
+                    shame_intensity += r.intensity * r.relevance
+
+                # Forgetting mechanism
+                if r.relevance < 0.05:
+                    to_remove.append(r)
+
+        # Batch removal to avoid mutation during iteration
+        for r in to_remove:
+            self.records.remove(r)
+        if to_remove:
+            self._resync_window()
+
+        return shame_intensity, settled
+
+# Transition events emitted to Agent listeners
+EVENT_RECOVERY = "recovery"  # detail: trigger kind ("emergency", "normal" or "optimal")
+EVENT_ZOMBIE_RAISED = "zombie_raised"
+EVENT_ZOMBIE_CLEARED = "zombie_cleared"
+EVENT_FORCE_PAUSE = "force_pause"
+EVENT_FORCE_REBOOT = "force_reboot"
+EVENT_PAUSED = "paused"  # should_continue() turned False
+EVENT_RESUMED = "resumed"  # should_continue() turned True again
+
+@dataclass(slots=True, frozen=True)
+class AgentEvent:
+    kind: str
+    timestamp: float  # Clock reading when the event fired
+    detail: str = ""
+
+class EventBatcher:
+    """Listener that hands events to callback(list_of_events) batch_size at a time"""
+
+    def __init__(self, callback, batch_size: int = 256):
+        self.callback = callback
+        self.batch_size = batch_size
+        self._pending = []
+
+    def __call__(self, event: AgentEvent):
+        self._pending.append(event)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.callback(batch)
+
+class WallClock:
+    """Real time: every reading is time.time()"""
+
+    def now(self) -> float:
+        return time.time()
+
+    def tick(self) -> float:
+        return time.time()
+
+    def ticks(self, n: int):
+        """Timestamps for n consecutive steps (read once, shared by the batch)"""
+        now = time.time()
+        for _ in range(n):
+            yield now
+
+    def skip(self, n: int) -> float:
+        """Real time cannot be skipped: returns the 0.0 seconds added"""
+        return 0.0
+
 @dataclass
+class SimulatedClock:
+    """Virtual time that advances seconds_per_step on every step (never reads the real clock)"""
+    current: float = 0.0
+    seconds_per_step: float = 3600.0
+
+    def now(self) -> float:
+        return self.current
+
+    def tick(self) -> float:
+        self.current += self.seconds_per_step
+        return self.current
+
+    def ticks(self, n: int):
+        """Timestamps for n consecutive steps (advances lazily as they are consumed)"""
+        for _ in range(n):
+            self.current += self.seconds_per_step
+            yield self.current
+
+    def skip(self, n: int) -> float:
+        """Jump n steps ahead in one addition; returns the seconds added"""
+        delta = n * self.seconds_per_step
+        self.current += delta
+        return delta
+
+# Largest intensity a record keeps: window and shame sums over a full log stay finite
+MAX_INTENSITY = 1e300
+
+
+def clamp_intensity(val: float) -> float:
+    """Record intensity guard: non-negative and finite (NaN/inf count as no emotion)"""
+    if math.isnan(val) or math.isinf(val):
+        return 0.0
+    return min(max(0.0, val), MAX_INTENSITY)
+
+# Running window sums are kept as integers counting 2**-1126 units: every finite float is a
+# whole number of them, so adding and evicting intensities is exact and never drifts.
+_UNIT_SCALE = 1 << 1126
+
+
+def exact_units(val: float) -> int:
+    """val as an exact integer multiple of 2**-1126"""
+    mantissa, exponent = math.frexp(val)
+    return int(mantissa * 9007199254740992.0) << (exponent + 1073)  # mantissa * 2**53 is whole
+
+
+def units_to_float(units: int) -> float:
+    """Nearest float to a sum of exact_units (int / int division rounds correctly)"""
+    return units / _UNIT_SCALE
+
+def _clamp_unit(val: float) -> float:
+    if math.isnan(val) or math.isinf(val):
+        return 0.5  # Reset to neutral on NaN/inf
+    return max(0.0, min(1.0, val))
+
+@dataclass(slots=True)
 class AgentState:
     energy: float = 0.7
     resilience: float = 0.5
@@ -40,27 +236,55 @@ class AgentState:
     adversarial_env: bool = False
 
     def clamp_all(self):
-        """Clamp all variables to safe range (handles NaN/inf)"""
-        for attr in ['energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress']:
-            val = getattr(self, attr)
-            if math.isnan(val) or math.isinf(val):
-                setattr(self, attr, 0.5)  # Reset to neutral on NaN/inf
-            else:
-                setattr(self, attr, max(0.0, min(1.0, val)))
+        """Clamp all variables to safe range (handles NaN/inf).
+
+        Values already in [0, 1] are left untouched; NaN fails the range test, so only
+        out-of-range fields take the slow path.
+        """
+        if not 0.0 <= self.energy <= 1.0:
+            self.energy = _clamp_unit(self.energy)
+        if not 0.0 <= self.resilience <= 1.0:
+            self.resilience = _clamp_unit(self.resilience)
+        if not 0.0 <= self.learning_pace <= 1.0:
+            self.learning_pace = _clamp_unit(self.learning_pace)
+        if not 0.0 <= self.motivation <= 1.0:
+            self.motivation = _clamp_unit(self.motivation)
+        if not 0.0 <= self.env_stress <= 1.0:
+            self.env_stress = _clamp_unit(self.env_stress)
+        if not 0.0 <= self.self_stress <= 1.0:
+            self.self_stress = _clamp_unit(self.self_stress)
 
 @dataclass
 class Agent:
     state: AgentState = field(default_factory=AgentState)
     memory: MemoryLog = field(default_factory=MemoryLog)
+    clock: WallClock = field(default_factory=WallClock)  # Or SimulatedClock for fast, deterministic runs
+    listeners: list = field(default_factory=list, repr=False, compare=False)
+    _paused: bool = field(default=False, init=False, repr=False, compare=False)
+    steps_skipped: int = field(default=0, init=False, repr=False, compare=False)  # Jumped over by fast_forward()
+
+    def subscribe(self, listener):
+        """Call listener(AgentEvent) on every transition; returns the listener for unsubscribe()"""
+        self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, kind: str, detail: str = ""):
+        event = AgentEvent(kind, self.clock.now(), detail)
+        for listener in self.listeners:
+            listener(event)
 
-    def perceive(self, input_quality: float, emotional_intensity: float, label: str):
+    def perceive(self, input_quality: float, emotional_intensity: float, label: str, now: float = None):
         emotional_intensity = max(0.0, emotional_intensity)  # Prevent negative intensity
 
         record = EmotionalRecord(
             label=label,
             intensity=emotional_intensity,
             context="input_perception",
-            provisional=True
+            provisional=True,
+            timestamp=self.clock.now() if now is None else now
         )
         self.memory.add(record)
 
@@ -75,30 +299,13 @@ class Agent:
 
         self.state.clamp_all()
 
-    def reflect_black_history(self):
-        current_time = time.time()
-        shame_intensity = 0.0
-
-        to_remove = []
-        for r in list(self.memory.records):
-            if r.provisional:
-                age_hours = (current_time - r.timestamp) / 3600
-                r.relevance *= 0.95 ** max(0, age_hours)  # Prevent negative age calculation
-
-                # Gently flow light negatives + accumulate embarrassment
-                if r.intensity < 0.5 and r.relevance > 0.1:
-                    r.provisional = False
-                    self.state.motivation = min(1.0, self.state.motivation + 0.02)
-                else:
-                    shame_intensity += r.intensity * r.relevance
-
-                # Forgetting mechanism
-                if r.relevance < 0.05:
-                    to_remove.append(r)
+    def reflect_black_history(self, now: float = None):
+        current_time = self.clock.now() if now is None else now
+        shame_intensity, settled = self.memory.reflect(current_time)
 
-        # Batch removal to avoid mutation during iteration
-        for r in to_remove:
-            self.memory.records.remove(r)
+        # Each gently flowed record restores a little motivation
+        for _ in range(settled):
+            self.state.motivation = min(1.0, self.state.motivation + 0.02)
 
         # Recovery scaled by embarrassment (recovery always has a cost)
         recovery_amount = min(0.15, shame_intensity * 0.03)
@@ -124,7 +331,7 @@ class Agent:
 
     def recover_and_reboot(self):
         trigger = self.detect_recovery_trigger()
-        recent_outcome = sum(r.intensity for r in self.memory.recent(10)) / max(len(self.memory.recent(10)), 1)
+        recent_outcome = self.memory.window_mean
 
         if trigger == "emergency":
             self.state.env_stress *= 0.5
@@ -141,6 +348,9 @@ class Agent:
             self.state.resilience += 0.05
             self.state.recover_count += 1
 
+        if trigger != "none" and self.listeners:
+            self._emit(EVENT_RECOVERY, trigger)
+
         if trigger != "none" and recent_outcome < 0.3:
             self.state.self_stress += 0.05  # Penalty for CSAF-like monitoring fatigue
 
@@ -150,14 +360,18 @@ class Agent:
         self.state.clamp_all()
 
     def _force_pause(self):
+        if self.listeners:
+            self._emit(EVENT_FORCE_PAUSE)
         self.state.recover_count = 0
         self.state.energy *= 0.8
         self.state.motivation += 0.1
 
     def zombie_feedback_machine(self):
         expected_pace = 0.3 + self.state.resilience * 0.4
-        recent_outcome = sum(r.intensity for r in self.memory.recent(10)) / max(len(self.memory.recent(10)), 1)
+        recent_outcome = self.memory.window_mean
         if self.state.learning_pace < expected_pace * 0.7 and recent_outcome < 0.3:
+            if not self.state.zombie_flag and self.listeners:
+                self._emit(EVENT_ZOMBIE_RAISED)
             self.state.zombie_flag = True
             self.state.zombie_flag_count += 1
             self.state.learning_pace += 0.05 + (expected_pace - self.state.learning_pace) * 0.2
@@ -166,10 +380,14 @@ class Agent:
             if self.state.zombie_flag_count > 3:
                 self._force_reboot()
         else:
+            if self.state.zombie_flag and self.listeners:
+                self._emit(EVENT_ZOMBIE_CLEARED)
             self.state.zombie_flag = False
             self.state.zombie_flag_count = 0
 
     def _force_reboot(self):
+        if self.listeners:
+            self._emit(EVENT_FORCE_REBOOT)
         self.state.learning_pace = 0.5
         self.state.resilience = max(0.5, self.state.resilience * 0.9)
 
@@ -177,26 +395,139 @@ class Agent:
         total_stress = self.state.env_stress + self.state.self_stress
         return self.state.recover_count < 15 and total_stress < 0.9
 
-    def step(self, input_quality: float, emotional_intensity: float, label: str):
-        input_quality = max(0.0, min(1.0, input_quality))
-        emotional_intensity = max(0.0, emotional_intensity)
-
-        self.perceive(input_quality, emotional_intensity, label)
-        self.reflect_black_history()
+    def _check_pause(self):
+        """Emit EVENT_PAUSED / EVENT_RESUMED when should_continue() changes"""
+        paused = not self.should_continue()
+        if paused != self._paused:
+            self._paused = paused
+            if self.listeners:
+                self._emit(EVENT_PAUSED if paused else EVENT_RESUMED)
+
+    def _advance(self, input_quality: float, emotional_intensity: float, label: str, now: float):
+        """One step on already-clamped inputs"""
+        self.perceive(input_quality, emotional_intensity, label, now)
+        self.reflect_black_history(now)
         self.zombie_feedback_machine()
         self.recover_and_reboot()
 
         # Natural decay for resilience (prevents over-stability)
+        # recover_and_reboot() just clamped and this keeps resilience above 0.49, so no re-clamp
         if self.state.resilience > 0.5:
             self.state.resilience -= 0.01
-        self.state.clamp_all()
 
-        if not self.should_continue():
-            print("Agent paused for recovery.")
+    def step(self, input_quality: float, emotional_intensity: float, label: str):
+        input_quality = max(0.0, min(1.0, input_quality))
+        emotional_intensity = max(0.0, emotional_intensity)
+
+        self._advance(input_quality, emotional_intensity, label, self.clock.tick())
+        self._check_pause()
+
+    def step_many(self, events, emotional_intensities=None, labels=None) -> int:
+        """Replay a batch of inputs and return the number of steps taken.
+
+        Accepts either a list of (input_quality, emotional_intensity, label) tuples, or
+        parallel sequences/arrays: step_many(qualities, intensities, labels), where labels
+        may also be a single string. Inputs are clamped up front, the wall clock is read once
+        for the whole batch and pause/resume is checked only at the end.
+        """
+        if emotional_intensities is None:
+            qualities, emotional_intensities, labels = zip(*events) if len(events) else ((), (), ())
+        else:
+            qualities = events
+            if labels is None or isinstance(labels, str):
+                labels = [labels or ""] * len(qualities)
+        qualities = [max(0.0, min(1.0, q)) for q in _as_floats(qualities)]
+        emotional_intensities = [max(0.0, e) for e in _as_floats(emotional_intensities)]
+
+        advance = self._advance
+        for q, e, label, now in zip(qualities, emotional_intensities, labels, self.clock.ticks(len(qualities))):
+            advance(q, e, label, now)
+
+        self._check_pause()
+        return len(qualities)
+
+    def step_stream(self, events, stride: int = 1):
+        """Consume an iterable of (input_quality, emotional_intensity, label) events lazily.
+
+        Yields (steps_taken, AgentState copy) every `stride` events and once more after the
+        last event if it did not fall on a stride boundary. The wall clock is read once per stride.
+        """
+        advance = self._advance
+        taken = 0
+        times = self.clock.ticks(stride)
+        for q, e, label in events:
+            advance(max(0.0, min(1.0, q)), max(0.0, e), label, next(times))
+            taken += 1
+            if taken % stride == 0:
+                yield taken, replace(self.state)
+                times = self.clock.ticks(stride)
+        if taken % stride:
+            yield taken, replace(self.state)
+
+        self._check_pause()
+
+    def _fingerprint(self, tolerance: float) -> tuple:
+        """State plus memory summary, on a grid of `tolerance` (exact values when 0)"""
+        s = self.state
+        values = (s.energy, s.resilience, s.learning_pace, s.motivation, s.env_stress, s.self_stress,
+                  *self.memory.summary())
+        if tolerance:
+            values = tuple(round(v / tolerance) for v in values)
+        return values + (s.zombie_flag, s.zombie_flag_count, s.recover_count, s.adversarial_env)
+
+    def fast_forward(self, input_quality: float, emotional_intensity: float, label: str, steps: int,
+                     tolerance: float = 1e-9, max_probe: int = 1024, verify_every: int = None) -> int:
+        """Take `steps` steps of constant input, jumping over whole cycles once the state repeats.
+
+        Under stationary input the state settles into a fixed point or a short cycle (for
+        example recover_count climbing to the _force_pause reset). While probing, each step's
+        fingerprint (state plus memory summary, on a `tolerance` grid) is remembered; when one
+        recurs, the remaining whole periods are skipped by advancing the clock and shifting
+        memory timestamps, and the rest is stepped normally. Probing stops after max_probe
+        steps without a repeat. With verify_every set, jumps cover at most verify_every steps
+        and each is followed by one period stepped exactly, which must reproduce the
+        fingerprint before the next jump. Skipped steps emit no events.
+        Returns the number of steps skipped (also accumulated in steps_skipped).
+        """
+        input_quality = max(0.0, min(1.0, input_quality))
+        emotional_intensity = max(0.0, emotional_intensity)
+
+        advance = self._advance
+        clock = self.clock
+        skipped = 0
+        seen = {}
+        k = 0
+        while k < steps:
+            if seen is not None:
+                key = self._fingerprint(tolerance)
+                start = seen.get(key)
+                if start is None:
+                    seen[key] = k
+                    if len(seen) > max_probe:
+                        seen = None
+                else:
+                    period = k - start
+                    span = steps - k if verify_every is None else min(steps - k, max(verify_every, period))
+                    n = span - span % period
+                    if n:
+                        self.memory.shift_time(clock.skip(n))
+                        skipped += n
+                        k += n
+                    # Verification: keep probing from here, so the next jump needs a fresh exact period
+                    seen = {key: k} if verify_every is not None and n else None
+                    if k == steps:
+                        break
+            advance(input_quality, emotional_intensity, label, clock.tick())
+            k += 1
+
+        self.steps_skipped += skipped
+        self._check_pause()
+        return skipped
 
 # Usage example (for testing)
 if __name__ == "__main__":
     agent = Agent()
+    agent.subscribe(lambda event: print(f"[{event.kind}] {event.detail}".rstrip()))
     for _ in range(10):
         if not agent.should_continue():
             break
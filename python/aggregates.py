@@ -0,0 +1,152 @@
+import os
+from collections import deque
+import numpy as np
+from agent import EVENT_FORCE_PAUSE, EVENT_FORCE_REBOOT, EVENT_RECOVERY, EVENT_ZOMBIE_RAISED
+from metrics_sink import open_sink
+
+AGGREGATE_METRICS = ('energy', 'total_stress', 'learning_pace', 'resilience', 'motivation', 'zombie_flag')
+AGGREGATE_EVENTS = ('zombie_raised', 'emergency', 'force_pause', 'force_reboot')
+DEFAULT_LEVELS = (1000, 10000, 100000)
+DEFAULT_MAX_ROWS = 10000  # Finished buckets kept per level in memory (no path)
+
+
+def agent_row(state) -> tuple:
+    """One step's AGGREGATE_METRICS values from an AgentState"""
+    return (state.energy, state.env_stress + state.self_stress, state.learning_pace,
+            state.resilience, state.motivation, float(state.zombie_flag))
+
+
+def bucket_columns(metrics=AGGREGATE_METRICS, events=AGGREGATE_EVENTS) -> tuple:
+    """Row layout of one finished bucket: start step, steps covered, stats per metric, event counts"""
+    stats = tuple(f"{m}_{s}" for m in metrics for s in ('min', 'max', 'mean'))
+    return ('step', 'count') + stats + tuple(events)
+
+
+class _Level:
+    """Open bucket of one resolution: running min/max/sum per metric and event counts"""
+
+    def __init__(self, bucket: int, n_metrics: int, n_events: int):
+        self.bucket = bucket
+        self.min = np.full(n_metrics, np.inf)
+        self.max = np.full(n_metrics, -np.inf)
+        self.sum = np.zeros(n_metrics)
+        self.events = np.zeros(n_events, dtype=np.int64)
+        self.count = 0
+        self.start = 1  # First step of the open bucket
+
+    def fold(self, mins, maxs, sums, events, count):
+        np.minimum(self.min, mins, out=self.min)
+        np.maximum(self.max, maxs, out=self.max)
+        self.sum += sums
+        self.events += events
+        self.count += count
+
+    def row(self) -> np.ndarray:
+        stats = np.column_stack((self.min, self.max, self.sum / max(self.count, 1))).ravel()
+        return np.concatenate(([self.start, self.count], stats, self.events))
+
+    def reset(self):
+        self.start += self.count
+        self.min[:] = np.inf
+        self.max[:] = -np.inf
+        self.sum[:] = 0.0
+        self.events[:] = 0
+        self.count = 0
+
+
+class StreamingAggregator:
+    """min/max/mean per metric and event counts per bucket, at several step resolutions.
+
+    Every step's row is staged; when a finest-level bucket fills, it is reduced in one
+    NumPy pass and folded into the coarser levels, which therefore cost nothing per step.
+    Only the staged rows of the open finest bucket and the open bucket of each level are
+    held (memory is O(first bucket + levels), independent of run length). Finished
+    buckets go to one metrics_sink file per level (`<path>_<bucket>` plus the path's
+    extension) or, without a path, to in-memory rows read with frame(); those keep only
+    the last max_rows buckets of each level, so memory stays bounded however long the
+    run is (pass a path to keep every bucket). Levels must each divide the next.
+    Subscribed to an Agent (attach), it also counts zombie episodes, emergency
+    recoveries, force pauses and force reboots, so nothing that happens between samples
+    is lost.
+    """
+
+    def __init__(self, levels=DEFAULT_LEVELS, path: str = None, metrics=AGGREGATE_METRICS,
+                 max_rows: int = DEFAULT_MAX_ROWS):
+        levels = tuple(sorted(levels))
+        if any(coarse % fine for fine, coarse in zip(levels, levels[1:])):
+            raise ValueError(f"Each level must divide the next: {levels}")
+        self.levels = levels
+        self.metrics = tuple(metrics)
+        self.columns = bucket_columns(self.metrics)
+        self.steps = 0
+        self._levels = [_Level(b, len(self.metrics), len(AGGREGATE_EVENTS)) for b in levels]
+        self._staged = []
+        self._events = np.zeros(len(AGGREGATE_EVENTS), dtype=np.int64)  # Events of the staged steps
+        self._sinks = {}
+        self._rows = {b: deque(maxlen=max_rows) for b in levels}
+        if path:
+            base, ext = os.path.splitext(path)
+            self._sinks = {b: open_sink(f"{base}_{b}{ext}", self.columns) for b in levels}
+
+    def attach(self, agent):
+        """Count the agent's transition events into the open buckets; returns the listener"""
+        return agent.subscribe(self.on_event)
+
+    def on_event(self, event):
+        if event.kind == EVENT_ZOMBIE_RAISED:
+            self._events[0] += 1
+        elif event.kind == EVENT_RECOVERY and event.detail == "emergency":
+            self._events[1] += 1
+        elif event.kind == EVENT_FORCE_PAUSE:
+            self._events[2] += 1
+        elif event.kind == EVENT_FORCE_REBOOT:
+            self._events[3] += 1
+
+    def add(self, *values):
+        """Record one step's metric values (agent_row(agent.state) for an Agent)"""
+        self._staged.append(values)
+        if len(self._staged) == self.levels[0]:
+            self._fold()
+
+    def _fold(self):
+        """Reduce the staged steps into the finest level and emit every bucket that filled"""
+        if not self._staged:
+            return
+        block = np.array(self._staged, dtype=float)
+        self._staged = []
+        self.steps += len(block)
+        events, self._events = self._events, np.zeros_like(self._events)
+        self._levels[0].fold(block.min(axis=0), block.max(axis=0), block.sum(axis=0), events, len(block))
+        for k, level in enumerate(self._levels):
+            if level.count < level.bucket:
+                break
+            self._emit(level)
+            if k + 1 < len(self._levels):
+                self._levels[k + 1].fold(level.min, level.max, level.sum, level.events, level.count)
+            level.reset()
+
+    def _emit(self, level: _Level):
+        row = level.row()
+        if self._sinks:
+            self._sinks[level.bucket].write(row)
+        else:
+            self._rows[level.bucket].append(row)
+
+    def close(self):
+        """Emit the partially filled buckets (their count is below the bucket size) and close the files"""
+        self._fold()
+        for k, level in enumerate(self._levels):
+            if level.count:
+                self._emit(level)
+                if k + 1 < len(self._levels):
+                    self._levels[k + 1].fold(level.min, level.max, level.sum, level.events, level.count)
+                level.reset()
+        for sink in self._sinks.values():
+            sink.close()
+        self._sinks = {}
+
+    def frame(self, bucket: int):
+        """The last max_rows finished buckets of one level as a DataFrame (in-memory mode)"""
+        import pandas as pd
+        rows = self._rows[bucket]
+        return pd.DataFrame(np.array(list(rows)) if rows else np.empty((0, len(self.columns))), columns=self.columns)
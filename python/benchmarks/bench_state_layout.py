@@ -0,0 +1,112 @@
+"""Bytes per agent and ns per step for the slotted AgentState/EmotionalRecord layout.
+
+"before" rebuilds the previous dict-backed dataclasses, the reflective clamp_all and the
+extra end-of-step clamp, so both layouts are measured in the same process.
+
+    python benchmarks/bench_state_layout.py [--agents 10000] [--steps 20000]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field, fields
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent as agent_module
+from agent import Agent, AgentState, EmotionalRecord, MemoryLog, SimulatedClock
+
+
+@dataclass
+class LegacyRecord:
+    label: str
+    intensity: float = 0.0
+    context: str = ""
+    provisional: bool = True
+    timestamp: float = field(default_factory=time.time)
+    relevance: float = 1.0
+
+
+@dataclass
+class LegacyState:
+    energy: float = 0.7
+    resilience: float = 0.5
+    learning_pace: float = 0.5
+    motivation: float = 0.6
+    env_stress: float = 0.0
+    self_stress: float = 0.0
+    zombie_flag: bool = False
+    zombie_flag_count: int = 0
+    recover_count: int = 0
+    adversarial_env: bool = False
+
+    def clamp_all(self):
+        for attr in ['energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress']:
+            val = getattr(self, attr)
+            if math.isnan(val) or math.isinf(val):
+                setattr(self, attr, 0.5)
+            else:
+                setattr(self, attr, max(0.0, min(1.0, val)))
+
+
+class LegacyAgent(Agent):
+    def _advance(self, input_quality, emotional_intensity, label, now):
+        super()._advance(input_quality, emotional_intensity, label, now)
+        self.state.clamp_all()  # The end-of-step clamp the slotted path drops
+
+
+def bytes_per_object(factory, n):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = [factory() for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objs
+    return (size - 8 * n) / n  # Exclude the holding list's pointers
+
+
+def ns_per_step(agent, events):
+    start = time.perf_counter_ns()
+    agent.step_many(events)
+    return (time.perf_counter_ns() - start) / len(events)
+
+
+def measure(state_cls, record_cls, agent_cls, n_agents, events):
+    agent_module.EmotionalRecord = record_cls  # perceive() builds records from the module global
+    try:
+        state_bytes = bytes_per_object(state_cls, n_agents)
+        record_bytes = bytes_per_object(lambda: record_cls(label="Shame", timestamp=0.0), n_agents)
+        agent = agent_cls(state=state_cls(), memory=MemoryLog(), clock=SimulatedClock())
+        ns = ns_per_step(agent, events)
+    finally:
+        agent_module.EmotionalRecord = EmotionalRecord
+    # One state plus a full 100-record memory per agent
+    return state_bytes, record_bytes, state_bytes + 100 * record_bytes, ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    events = [(rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(["Relief", "Shame"]))
+              for _ in range(args.steps)]
+    assert [f.name for f in fields(LegacyState)] == [f.name for f in fields(AgentState)]
+
+    rows = [
+        ("before (dict)", measure(LegacyState, LegacyRecord, LegacyAgent, args.agents, events)),
+        ("after (slots)", measure(AgentState, EmotionalRecord, Agent, args.agents, events)),
+    ]
+    print(f"{'layout':<15}{'state B':>10}{'record B':>10}{'agent B':>10}{'ns/step':>10}")
+    for name, (state_b, record_b, agent_b, ns) in rows:
+        print(f"{name:<15}{state_b:>10.0f}{record_b:>10.0f}{agent_b:>10.0f}{ns:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
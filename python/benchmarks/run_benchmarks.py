@@ -0,0 +1,222 @@
+"""Throughput and memory benchmarks for the agent, its memory logs and the simulations.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare baseline.json [--threshold 0.15]
+
+Metric names carry their direction: *_per_sec is higher-is-better, *_ns and *_bytes are
+lower-is-better. --compare exits with status 1 if any metric regressed by more than
+the threshold against the stored baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "Example code"))
+
+from agent import Agent, EmotionalRecord, MemoryLog, SimulatedClock
+from population import AgentPopulation
+
+LABELS = ["Relief", "Shame", "Confusion", "Interest"]
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def best_ns(fn, repeat):
+    """Fastest of `repeat` runs of fn(), in nanoseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def make_events(n, seed=0):
+    rng = random.Random(seed)
+    return [(rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(LABELS)) for _ in range(n)]
+
+
+@benchmark("agent_step")
+def bench_agent_step(scale, repeat):
+    """Agent.step at a steady memory fill level (maxlen pins the fill, frozen clock: no forgetting)"""
+    events = make_events(2000 * scale)
+    results = {}
+    for fill in (0, 50, 100):
+        def run():
+            agent = Agent(memory=MemoryLog(records=deque(maxlen=fill)), clock=SimulatedClock(seconds_per_step=0.0))
+            for _ in range(fill):
+                agent.memory.add(EmotionalRecord(label="Shame", intensity=0.9, timestamp=0.0))
+            for event in events:
+                agent.step(*event)
+        results[f"fill_{fill}_steps_per_sec"] = len(events) / (best_ns(run, repeat) / 1e9)
+    return results
+
+
+@benchmark("reflect")
+def bench_reflect(scale, repeat):
+    """MemoryLog.reflect against record count and the age spread of the records"""
+    results = {}
+    calls = 50 * scale
+    for count in (10, 100, 1000):
+        for spread_hours in (0, 24, 240):
+            stamps = [-3600.0 * spread_hours * i / count for i in range(count)]
+            memories = []
+
+            def setup():
+                memories.clear()
+                for _ in range(calls):
+                    memory = MemoryLog(records=deque(maxlen=count))
+                    for ts in stamps:
+                        memory.add(EmotionalRecord(label="Shame", intensity=0.7, timestamp=ts))
+                    memories.append(memory)
+
+            def run():
+                for memory in memories:
+                    memory.reflect(0.0)
+
+            best = None
+            for _ in range(repeat):
+                setup()  # Reflect mutates the records, so every timed pass gets fresh logs
+                elapsed = best_ns(run, 1)
+                best = elapsed if best is None else min(best, elapsed)
+            results[f"records_{count}_spread_{spread_hours}h_ns"] = best / calls
+    return results
+
+
+@benchmark("long_simulation")
+def bench_long_simulation(scale, repeat):
+    from long_simulation import run_long_simulation
+
+    steps = 5000 * scale
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_long_simulation(steps=steps, sample_every=100, plot=False, rng=random.Random(0))
+    return {"steps_per_sec": steps / (best_ns(run, repeat) / 1e9)}
+
+
+@benchmark("server_step")
+def bench_server_step(scale, repeat):
+    """ResilientServer.step, i.e. server_model.server_step (the transition shared with server_events and server_fleet)"""
+    from resilient_server import ResilientServer
+
+    events = make_events(20000 * scale)
+
+    def run():
+        server = ResilientServer()
+        for event in events:
+            server.step(*event)
+    return {"steps_per_sec": len(events) / (best_ns(run, repeat) / 1e9)}
+
+
+@benchmark("memory_per_agent")
+def bench_memory_per_agent(scale, repeat):
+    """Peak traced bytes per agent with a full 100-record memory"""
+    n = 200 * scale
+    events = make_events(100)
+
+    tracemalloc.start()
+    agents = [Agent(clock=SimulatedClock(seconds_per_step=0.0)) for _ in range(n)]
+    for agent in agents:
+        agent.step_many(events)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del agents
+
+    tracemalloc.start()
+    population = AgentPopulation(n)
+    for q, e, label in events:
+        population.step(q, e, now=0.0)
+    _, population_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del population
+
+    return {"agent_peak_bytes": peak / n, "population_peak_bytes": population_peak / n}
+
+
+def run_benchmarks(names=None, scale=1, repeat=3):
+    results = {}
+    for name, fn in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        print(f"running {name} ...", file=sys.stderr)
+        results[name] = fn(scale, repeat)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def higher_is_better(metric):
+    return metric.endswith("_per_sec")
+
+
+def compare_results(current, baseline, threshold=0.15):
+    """Rows of (benchmark, metric, baseline, current, relative change, regressed)"""
+    rows = []
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            old = baseline.get("results", {}).get(name, {}).get(metric)
+            if old is None or old == 0:
+                continue
+            change = (value - old) / old
+            worse = -change if higher_is_better(metric) else change
+            rows.append((name, metric, old, value, change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resilient agent benchmark suite")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown (default 0.15)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply workload sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions (best is kept)")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.only, args.scale, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(current, baseline, args.threshold)
+        print(f"{'benchmark':<18}{'metric':<32}{'baseline':>14}{'current':>14}{'change':>9}")
+        for name, metric, old, value, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<18}{metric:<32}{old:>14.1f}{value:>14.1f}{change:>+9.1%}{flag}")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
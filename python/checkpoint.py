@@ -0,0 +1,250 @@
+import math
+import os
+import struct
+from collections import deque
+import numpy as np
+from agent import Agent, AgentState, EmotionalRecord, MemoryLog, SimulatedClock, WallClock
+from ring_memory import RingMemoryLog
+from lazy_memory import LazyMemoryLog, _DEAD
+
+# File layout (little-endian, every section 8-byte aligned):
+#   header | agent table (AGENT_DTYPE) | record table (RECORD_DTYPE) | string offsets (uint64) | string blob
+MAGIC = b"RAGTCKPT"
+VERSION = 4
+_HEADER = struct.Struct("<8sIIQQQ")  # magic, version, reserved, n_agents, n_records, n_strings
+
+_STATE_FIELDS = ('energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress',
+                 'zombie_flag', 'zombie_flag_count', 'recover_count', 'adversarial_env')
+
+# One row per agent: AgentState, run bookkeeping, memory ring bookkeeping and clock
+AGENT_DTYPE = np.dtype([
+    ('energy', '<f8'),
+    ('resilience', '<f8'),
+    ('learning_pace', '<f8'),
+    ('motivation', '<f8'),
+    ('env_stress', '<f8'),
+    ('self_stress', '<f8'),
+    ('zombie_flag_count', '<i8'),
+    ('recover_count', '<i8'),
+    ('steps_skipped', '<i8'),
+    ('record_offset', '<i8'),  # First row of this agent's records in the record table
+    ('record_count', '<i8'),
+    ('maxlen', '<i8'),  # -1 for an unbounded deque (0 is a memory that keeps nothing)
+    ('window_size', '<i8'),
+    ('clock_current', '<f8'),
+    ('clock_seconds_per_step', '<f8'),
+    ('lazy_t_ref', '<f8'),  # LazyMemoryLog aggregate (NaN when unset), restored as-is for bit-identical resumes
+    ('lazy_now', '<f8'),
+    ('lazy_active_sum', '<f8'),
+    ('lazy_future_sum', '<f8'),
+    ('zombie_flag', 'u1'),
+    ('adversarial_env', 'u1'),
+    ('memory_kind', 'u1'),
+    ('clock_kind', 'u1'),
+    ('paused', 'u1'),
+    ('_pad', 'u1', (3,)),
+])
+
+# One row per memory record, oldest first within each agent
+RECORD_DTYPE = np.dtype([
+    ('intensity', '<f8'),
+    ('timestamp', '<f8'),
+    ('relevance', '<f8'),
+    ('label', '<u4'),  # Index into the string table
+    ('context', '<u4'),
+    ('provisional', 'u1'),
+    ('lazy_state', 'u1'),  # LazyMemoryLog entry state (0 for other memories)
+    ('_pad', 'u1', (6,)),
+])
+
+MEMORY_KINDS = (MemoryLog, RingMemoryLog, LazyMemoryLog)
+CLOCK_WALL, CLOCK_SIMULATED = 0, 1
+
+
+def _memory_records(memory):
+    """Live records with the relevance needed to rebuild the log, and their lazy entry states"""
+    if isinstance(memory, LazyMemoryLog):
+        # Lazy relevance is a function of age: store the base value, not the last evaluation
+        entries = [e for e in memory._entries if e.state != _DEAD]
+        return [(e.record, e.base, e.state) for e in entries]
+    return [(r, r.relevance, 0) for r in memory.records]
+
+
+def _none_as_nan(value):
+    return math.nan if value is None else value
+
+
+def _nan_as_none(value: float):
+    return None if math.isnan(value) else value
+
+
+def encode_agents(agents) -> bytes:
+    """Checkpoint bytes for one or more agents"""
+    agents = list(agents)
+    columns = {name: [] for name in AGENT_DTYPE.names if name != '_pad'}
+    rows = []
+    strings = {}
+
+    def intern(s):
+        code = strings.get(s)
+        if code is None:
+            code = strings[s] = len(strings)
+        return code
+
+    for agent in agents:
+        state = agent.state
+        for name in _STATE_FIELDS:
+            columns[name].append(getattr(state, name))
+
+        memory = agent.memory
+        kind = type(memory)
+        if kind not in MEMORY_KINDS:
+            raise TypeError(f"Cannot checkpoint memory of type {kind.__name__}")
+        records = _memory_records(memory)
+        columns['memory_kind'].append(MEMORY_KINDS.index(kind))
+        columns['record_offset'].append(len(rows))
+        columns['record_count'].append(len(records))
+        columns['maxlen'].append(-1 if memory.maxlen is None else memory.maxlen)
+        columns['window_size'].append(memory.window_size)
+        rows.extend((r.intensity, r.timestamp, relevance, intern(r.label), intern(r.context), r.provisional, state, 0)
+                    for r, relevance, state in records)
+        aggregate = memory.aggregate() if kind is LazyMemoryLog else (None, None, 0.0, 0.0)
+        for name, value in zip(('lazy_t_ref', 'lazy_now', 'lazy_active_sum', 'lazy_future_sum'), aggregate):
+            columns[name].append(_none_as_nan(value))
+        columns['paused'].append(agent._paused)
+        columns['steps_skipped'].append(agent.steps_skipped)
+
+        clock = agent.clock
+        if isinstance(clock, SimulatedClock):
+            columns['clock_kind'].append(CLOCK_SIMULATED)
+            columns['clock_current'].append(clock.current)
+            columns['clock_seconds_per_step'].append(clock.seconds_per_step)
+        elif isinstance(clock, WallClock):
+            columns['clock_kind'].append(CLOCK_WALL)
+            columns['clock_current'].append(0.0)
+            columns['clock_seconds_per_step'].append(0.0)
+        else:
+            raise TypeError(f"Cannot checkpoint clock of type {type(clock).__name__}")
+
+    table = np.zeros(len(agents), dtype=AGENT_DTYPE)
+    for name, values in columns.items():
+        table[name] = values
+    records = np.array(rows, dtype=RECORD_DTYPE) if rows else np.zeros(0, dtype=RECORD_DTYPE)
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.cumsum([0] + [len(b) for b in encoded], dtype='<u8')
+
+    return b"".join([
+        _HEADER.pack(MAGIC, VERSION, 0, len(table), len(records), len(encoded)),
+        table.tobytes(),
+        records.tobytes(),
+        offsets.tobytes(),
+        *encoded,
+    ])
+
+
+def save_agents(agents, path: str):
+    """Write a checkpoint of one or more agents (atomic: written to a temp file, then renamed)"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_agents(agents))
+    os.replace(tmp, path)
+
+
+def save_agent(agent: Agent, path: str):
+    save_agents([agent], path)
+
+
+class Checkpoint:
+    """Read-only, memory-mapped view of a checkpoint file.
+
+    Opening only maps the file and checks the header; the agent and record tables are
+    NumPy views into the mapping, and an Agent is rebuilt only when agent(i) is called,
+    so restoring one session out of many touches just that session's pages.
+    `source` may also be bytes from encode_agents(), read in place without a copy.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            path = "<bytes>"
+            self._data = np.frombuffer(source, dtype=np.uint8)
+        else:
+            path = os.fspath(source)
+            self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.path = path
+        if len(self._data) < _HEADER.size:
+            raise ValueError(f"{path}: not a checkpoint file")
+        magic, version, _, n_agents, n_records, n_strings = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a checkpoint file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported checkpoint version {version} (expected {VERSION})")
+
+        pos = _HEADER.size
+        self.agents_table = self._data[pos:pos + n_agents * AGENT_DTYPE.itemsize].view(AGENT_DTYPE)
+        pos += n_agents * AGENT_DTYPE.itemsize
+        self.records_table = self._data[pos:pos + n_records * RECORD_DTYPE.itemsize].view(RECORD_DTYPE)
+        pos += n_records * RECORD_DTYPE.itemsize
+        offsets = self._data[pos:pos + (n_strings + 1) * 8].view('<u8')
+        pos += (n_strings + 1) * 8
+        blob = bytes(self._data[pos:pos + int(offsets[-1])])
+        self._strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+
+    def __len__(self):
+        return len(self.agents_table)
+
+    def records(self, i: int):
+        """Record rows of agent i (a view into the mapping)"""
+        row = self.agents_table[i]
+        start = int(row['record_offset'])
+        return self.records_table[start:start + int(row['record_count'])]
+
+    def agent(self, i: int) -> Agent:
+        row = self.agents_table[i]
+        state = AgentState(**{name: row[name].item() for name in _STATE_FIELDS})
+        state.zombie_flag = bool(state.zombie_flag)
+        state.adversarial_env = bool(state.adversarial_env)
+
+        kind = MEMORY_KINDS[row['memory_kind']]
+        maxlen = int(row['maxlen'])
+        maxlen = None if maxlen < 0 else maxlen
+        window_size = int(row['window_size'])
+        strings = self._strings
+        records = [
+            EmotionalRecord(label=strings[label], intensity=intensity, context=strings[context],
+                            provisional=bool(provisional), timestamp=timestamp, relevance=relevance)
+            for intensity, timestamp, relevance, label, context, provisional in zip(
+                *(self.records(i)[c].tolist() for c in
+                  ('intensity', 'timestamp', 'relevance', 'label', 'context', 'provisional')))
+        ]
+        if kind is MemoryLog:
+            memory = MemoryLog(records=deque(records, maxlen=maxlen), window_size=window_size)
+        elif kind is LazyMemoryLog:
+            memory = LazyMemoryLog(maxlen=maxlen, window_size=window_size)
+            aggregate = (_nan_as_none(float(row['lazy_t_ref'])), _nan_as_none(float(row['lazy_now'])),
+                         float(row['lazy_active_sum']), float(row['lazy_future_sum']))
+            memory.restore(records, self.records(i)['lazy_state'].tolist(), aggregate)
+        else:
+            memory = kind(maxlen=maxlen, window_size=window_size)
+            for r in records:
+                memory.add(r)
+
+        if row['clock_kind'] == CLOCK_SIMULATED:
+            clock = SimulatedClock(current=float(row['clock_current']),
+                                   seconds_per_step=float(row['clock_seconds_per_step']))
+        else:
+            clock = WallClock()
+        agent = Agent(state=state, memory=memory, clock=clock)
+        agent._paused = bool(row['paused'])
+        agent.steps_skipped = int(row['steps_skipped'])
+        return agent
+
+    def agents(self):
+        return [self.agent(i) for i in range(len(self))]
+
+
+def load_agents(path: str):
+    return Checkpoint(path).agents()
+
+
+def load_agent(path: str) -> Agent:
+    return Checkpoint(path).agent(0)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The example scripts and the benchmark runner are imported by the tests as top-level modules
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _dir in ("Example code", "benchmarks"):
+    sys.path.insert(0, os.path.join(_HERE, _dir))
@@ -0,0 +1,296 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from agent import Agent, MemoryLog
+from lazy_memory import LazyMemoryLog
+from population import AgentPopulation
+from ring_memory import RingMemoryLog
+
+MEMORY_KINDS = {"deque": MemoryLog, "ring": RingMemoryLog, "lazy": LazyMemoryLog}
+
+# Per-step observation columns (one row per step, checked in one vectorized pass)
+OBSERVED = ('energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress',
+            'recover_count', 'zombie_flag', 'memory_size', 'window_mean', 'raised')
+_CLAMPED = slice(0, 6)
+_RECOVER, _ZOMBIE, _MEMORY, _WINDOW, _RAISED = 6, 7, 8, 9, 10
+
+INVARIANTS = ('no_exception', 'state_in_range', 'memory_bounded', 'records_valid', 'no_recovery_addiction',
+              'zombie_escape')
+ZOMBIE_ESCAPE_STEPS = 20  # Longest tolerated run of consecutive zombie steps (test_zombie_stuck_state)
+
+# Adversarial values mixed into the inputs, and clock jumps (seconds) for future/past timestamps
+SPECIAL_VALUES = np.array([math.nan, math.inf, -math.inf, -1.0, -1e308, 1e308, 2.0, 0.0, 1.0, 5e-324])
+CLOCK_JUMPS = np.array([365.25 * 24 * 3600, -365.25 * 24 * 3600, 0.0, 1e-9])
+REGIMES = ('uniform', 'hell', 'calm', 'flip')
+
+
+def make_trajectory(seed: int, length: int, adversarial: float = 0.05) -> np.ndarray:
+    """(length, 3) array of (input_quality, emotional_intensity, seconds since last step).
+
+    The base inputs follow one regime per trajectory (uniform noise, adversarial hell,
+    calm, or alternating), then a fraction `adversarial` of the values is replaced by
+    SPECIAL_VALUES and the clock occasionally jumps a year ahead or back.
+    """
+    rng = np.random.default_rng(seed)
+    regime = REGIMES[rng.integers(len(REGIMES))]
+    if regime == 'uniform':
+        q, e = rng.random(length), rng.random(length)
+    elif regime == 'hell':
+        q, e = np.zeros(length), np.ones(length)
+    elif regime == 'calm':
+        q, e = np.full(length, 0.9), np.full(length, 0.1)
+    else:
+        flip = np.arange(length) % 2
+        q, e = flip.astype(float), 1.0 - flip
+    dt = np.full(length, 3600.0)
+
+    for column in (q, e):
+        hit = rng.random(length) < adversarial
+        column[hit] = rng.choice(SPECIAL_VALUES, hit.sum())
+    jump = rng.random(length) < adversarial / 5
+    dt[jump] = rng.choice(CLOCK_JUMPS, jump.sum())
+    return np.column_stack((q, e, dt))
+
+
+class ReplayClock:
+    """Clock driven by a trajectory's step durations (timestamps may jump forward or back)"""
+
+    def __init__(self, durations, start: float = 0.0):
+        self.current = start
+        self._durations = iter(durations)
+
+    def now(self) -> float:
+        return self.current
+
+    def tick(self) -> float:
+        self.current += next(self._durations)
+        return self.current
+
+    def ticks(self, n: int):
+        for _ in range(n):
+            yield self.tick()
+
+
+def replay(trajectory: np.ndarray, memory: str = "deque") -> np.ndarray:
+    """Step a fresh Agent through the trajectory; returns one OBSERVED row per step.
+
+    A step that raises ends the replay with its row flagged in the 'raised' column.
+    """
+    agent = Agent(memory=MEMORY_KINDS[memory](), clock=ReplayClock(trajectory[:, 2].tolist()))
+    state = agent.state
+    rows = []
+    for q, e in trajectory[:, :2].tolist():
+        try:
+            agent.step(q, e, "Fuzz")
+            raised = False
+        except Exception:
+            raised = True
+        rows.append((state.energy, state.resilience, state.learning_pace, state.motivation,
+                     state.env_stress, state.self_stress, state.recover_count, state.zombie_flag,
+                     len(agent.memory.records), agent.memory.window_mean, raised))
+        if raised:
+            break
+    return np.array(rows, dtype=float).reshape(-1, len(OBSERVED))
+
+
+def replay_batch(trajectories: np.ndarray) -> np.ndarray:
+    """replay() of a (n, length, 3) stack of trajectories in one AgentPopulation, in lockstep.
+
+    Each trajectory is one member with its own clock; AgentPopulation matches Agent.step
+    bit for bit, so the rows equal replay(trajectory) with deque memory. Returns
+    (n, length, len(OBSERVED)) rows (the population has no per-member exceptions, so
+    'raised' is 0; callers replay a batch that raises one trajectory at a time).
+    """
+    n, length, _ = trajectories.shape
+    pop = AgentPopulation(n)
+    now = np.zeros(n)
+    out = np.empty((n, length, len(OBSERVED)))
+    for t in range(length):
+        now = now + trajectories[:, t, 2]  # Same additions as ReplayClock.tick
+        pop.step(trajectories[:, t, 0], trajectories[:, t, 1], now=now)
+        out[:, t] = np.column_stack((
+            pop.energy, pop.resilience, pop.learning_pace, pop.motivation, pop.env_stress, pop.self_stress,
+            pop.recover_count, pop.zombie_flag, pop.mem_count, pop.recent_outcome(), np.zeros(n)))
+    return out
+
+
+def _replay_stack(trajectories: np.ndarray, memory: str) -> tuple:
+    """(observed rows per trajectory, whether the vectorized replay fell back to replay())"""
+    if memory == "deque":
+        try:
+            return list(replay_batch(trajectories)), False
+        except ArithmeticError:
+            # Non-finite or overflowing inputs the population cannot turn into exact window units
+            pass
+    return [replay(trajectory, memory) for trajectory in trajectories], memory == "deque"
+
+
+def replay_many(trajectories: np.ndarray, memory: str = "deque") -> list:
+    """Observed rows of every trajectory in the stack: vectorized for deque memory.
+
+    AgentPopulation only models the deque log, so the ring and lazy logs fall back to
+    replay() per trajectory, as does a deque batch whose vectorized replay raised an
+    ArithmeticError. Any other exception propagates.
+    """
+    return _replay_stack(trajectories, memory)[0]
+
+
+def _first(mask) -> int:
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if len(hits) else -1
+
+
+def check(observed: np.ndarray, maxlen: int = 100) -> dict:
+    """First violating step (0-based) of each broken invariant; empty when all hold"""
+    clamped = observed[:, _CLAMPED]
+    zombie = observed[:, _ZOMBIE] > 0
+    # Length of the zombie run ending at each step
+    run_start = np.maximum.accumulate(np.where(zombie, 0, np.arange(len(zombie)) + 1))
+    streak = np.where(zombie, np.arange(len(zombie)) + 1 - run_start, 0)
+    window = observed[:, _WINDOW]
+
+    first = {
+        'no_exception': _first(observed[:, _RAISED] > 0),
+        'state_in_range': _first(~((clamped >= 0.0) & (clamped <= 1.0)).all(axis=1)),  # NaN fails too
+        'memory_bounded': _first(observed[:, _MEMORY] > maxlen),
+        'records_valid': _first(~(np.isfinite(window) & (window >= 0.0))),
+        'no_recovery_addiction': _first(observed[:, _RECOVER] > 10),
+        'zombie_escape': _first(streak > ZOMBIE_ESCAPE_STEPS),
+    }
+    return {name: step for name, step in first.items() if step >= 0}
+
+
+def _fails(trajectory: np.ndarray, invariant: str, memory: str) -> bool:
+    return len(trajectory) > 0 and invariant in check(replay(trajectory, memory))
+
+
+def shrink(trajectory: np.ndarray, invariant: str, memory: str = "deque") -> np.ndarray:
+    """Smallest trajectory found that still breaks `invariant`.
+
+    Cuts everything after the first violation, removes ever smaller chunks of steps
+    (delta debugging), then resets each remaining value to a neutral one (0.5 input,
+    one-hour step) where that keeps the failure.
+    """
+    step = check(replay(trajectory, memory))[invariant]
+    trajectory = trajectory[:step + 1].copy()
+
+    chunk = max(len(trajectory) // 2, 1)
+    while True:
+        start = 0
+        while start < len(trajectory):
+            candidate = np.delete(trajectory, slice(start, start + chunk), axis=0)
+            if _fails(candidate, invariant, memory):
+                trajectory = candidate
+            else:
+                start += chunk
+        if chunk == 1:
+            break
+        chunk //= 2
+
+    neutral = (0.5, 0.5, 3600.0)
+    for i in range(len(trajectory)):
+        for j in range(3):
+            if trajectory[i, j] != neutral[j]:
+                candidate = trajectory.copy()
+                candidate[i, j] = neutral[j]
+                if _fails(candidate, invariant, memory):
+                    trajectory = candidate
+    return trajectory
+
+
+def fuzz_one(seed: int, length: int, adversarial: float = 0.05, memory: str = "deque", shrink_failures: bool = True):
+    """Run one generated trajectory; returns [(invariant, seed, first step, minimal trace)] for its failures"""
+    trajectory = make_trajectory(seed, length, adversarial)
+    failures = []
+    for invariant, step in check(replay(trajectory, memory)).items():
+        trace = shrink(trajectory, invariant, memory) if shrink_failures else trajectory[:step + 1]
+        failures.append((invariant, seed, step, trace))
+    return failures
+
+
+def trajectory_seed(root_seed: int, index: int) -> int:
+    """Seed of trajectory `index`: child `index` of np.random.SeedSequence(root_seed)"""
+    return int(np.random.SeedSequence(root_seed, spawn_key=(index,)).generate_state(1, dtype=np.uint64)[0])
+
+
+def _fuzz_task(task):
+    """Check a range of trajectories without shrinking: returns (count, [(invariant, seed, step)], fell_back)"""
+    root_seed, first, count, length, adversarial, memory = task
+    seeds = [trajectory_seed(root_seed, index) for index in range(first, first + count)]
+    observed, fell_back = _replay_stack(np.stack([make_trajectory(seed, length, adversarial) for seed in seeds]), memory)
+    failures = []
+    for seed, rows in zip(seeds, observed):
+        for invariant, step in check(rows).items():
+            failures.append((invariant, seed, step))
+    return count, failures, fell_back
+
+
+def fuzz(n_trajectories: int, length: int = 200, adversarial: float = 0.05, memory: str = "deque",
+         root_seed: int = 0, workers: int = None, batch: int = 256, shrink_failures: bool = True,
+         max_failures_per_invariant: int = 3) -> dict:
+    """Fuzz n_trajectories generated trajectories across a process pool.
+
+    Workers get ranges of `batch` trajectory indices, derive each seed on the spot
+    (trajectory_seed) and replay the whole range at once (_replay_stack), so millions of
+    trajectories cost no upfront state and every failure is reproducible with
+    make_trajectory(seed, length, adversarial). Only the first
+    max_failures_per_invariant failures of each invariant are kept and shrunk, in this
+    process. Returns {'trajectories', 'steps', 'counts' (failing trajectories per
+    invariant), 'batch_fallbacks' (deque ranges the population could not replay, checked
+    with replay() instead), 'failures' ([(invariant, seed, first step, trace)], shortest
+    trace first)}.
+    """
+    tasks = [(root_seed, first, min(batch, n_trajectories - first), length, adversarial, memory)
+             for first in range(0, n_trajectories, batch)]
+
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    results = pool.map(_fuzz_task, tasks) if pool is not None else map(_fuzz_task, tasks)
+
+    report = {'trajectories': 0, 'steps': 0, 'counts': dict.fromkeys(INVARIANTS, 0), 'batch_fallbacks': 0,
+              'failures': []}
+    kept = []
+    for done, failures, fell_back in results:
+        report['trajectories'] += done
+        report['batch_fallbacks'] += fell_back
+        report['steps'] += done * length
+        for invariant, seed, step in failures:
+            report['counts'][invariant] += 1
+            if report['counts'][invariant] <= max_failures_per_invariant:
+                kept.append((invariant, seed, step))
+    if pool is not None:
+        pool.shutdown()
+
+    for invariant, seed, step in kept:
+        trajectory = make_trajectory(seed, length, adversarial)
+        trace = shrink(trajectory, invariant, memory) if shrink_failures else trajectory[:step + 1]
+        report['failures'].append((invariant, seed, step, trace))
+    report['failures'].sort(key=lambda f: (len(f[3]), f[0]))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Invariant fuzzing of Agent trajectories")
+    parser.add_argument("--trajectories", type=int, default=10000)
+    parser.add_argument("--length", type=int, default=200)
+    parser.add_argument("--adversarial", type=float, default=0.05, help="Fraction of NaN/inf/negative/out-of-range values")
+    parser.add_argument("--memory", choices=sorted(MEMORY_KINDS), default="deque")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-shrink", action="store_true")
+    args = parser.parse_args()
+
+    report = fuzz(args.trajectories, args.length, args.adversarial, args.memory, args.seed, args.workers,
+                  shrink_failures=not args.no_shrink)
+    print(f"{report['trajectories']} trajectories, {report['steps']} steps")
+    if report['batch_fallbacks']:
+        print(f"  {report['batch_fallbacks']} batches replayed per trajectory after the vectorized replay failed")
+    for name, count in report['counts'].items():
+        print(f"  {name}: {count} failing trajectories")
+    for invariant, seed, step, trace in report['failures']:
+        print(f"\n{invariant} (seed {seed}, step {step}), minimal trace of {len(trace)} steps "
+              f"(input_quality, emotional_intensity, dt):")
+        for row in trace:
+            print("  ", tuple(row.tolist()))
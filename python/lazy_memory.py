@@ -0,0 +1,299 @@
+import heapq
+import math
+from collections import deque
+from agent import EmotionalRecord, clamp_intensity, exact_units, units_to_float
+
+DECAY_PER_HOUR = 0.95
+FORGET_BELOW = 0.05
+_K = -math.log(DECAY_PER_HOUR) / 3600  # Decay rate per second
+_REBASE_AFTER = 240 * 3600  # Re-anchor the aggregate before exp() terms grow large
+
+def relevance_at(base: float, timestamp: float, now: float) -> float:
+    """Relevance of a record with initial relevance `base`, evaluated at time `now`"""
+    age_hours = (now - timestamp) / 3600
+    return base * DECAY_PER_HOUR ** max(0, age_hours)  # Prevent negative age calculation
+
+
+# Entry states
+_PENDING, _SETTLED, _ACTIVE, _FUTURE, _DEAD = range(5)
+
+
+class _Entry:
+    __slots__ = ('record', 'base', 'state', 'weight', 'expires_at')
+
+    def __init__(self, record: EmotionalRecord):
+        self.record = record
+        self.base = record.relevance  # Relevance at the record timestamp
+        self.state = _PENDING if record.provisional else _SETTLED
+        self.weight = 0.0
+        self.expires_at = 0.0
+
+
+class LazyMemoryLog:
+    """MemoryLog variant whose relevance is a pure function of record age.
+
+    relevance(t) = base * 0.95 ** max(0, age_hours) is evaluated only when a record is
+    read, instead of being compounded on every reflect pass, so decay no longer depends
+    on how often step() runs. The shame aggregate is kept incrementally as
+    exp(-k * (t - t_ref)) * sum(intensity * base * exp(k * (ts - t_ref))), and forgetting
+    below 0.05 is driven by a heap of precomputed expiry times, making reflect
+    O(1) amortized (O(log n) per record over its lifetime). Unlike MemoryLog.reflect,
+    records that fade out during a pass are forgotten before the aggregate is read.
+    """
+
+    def __init__(self, maxlen: int = 100, window_size: int = 10):
+        self._maxlen = maxlen
+        self.window_size = min(window_size, maxlen)
+        self._window = deque(maxlen=self.window_size)  # Newest live entries
+        self._window_units = 0  # Exact sum of their intensities (agent.exact_units)
+        self._entries = deque()
+        self._live = 0
+        self._pending = []
+        self._expiry = []  # (expires_at, seq, entry)
+        self._maturity = []  # (timestamp, seq, entry) for records stamped in the future
+        self._seq = 0
+        self._t_ref = None
+        self._active_sum = 0.0  # Sum of weights of decaying records
+        self._active_count = 0
+        self._future_sum = 0.0  # Future records contribute at full relevance until they mature
+        self._now = None
+
+    @property
+    def maxlen(self):
+        return self._maxlen
+
+    def __len__(self):
+        return self._live
+
+    @property
+    def window_count(self):
+        return len(self._window)
+
+    @property
+    def window_sum(self):
+        """Sum of the window, rounded once from the running exact sum (as MemoryLog)"""
+        return units_to_float(self._window_units)
+
+    @property
+    def window_mean(self):
+        """Mean intensity of the last window_size records (0.0 when empty)"""
+        return self.window_sum / max(len(self._window), 1)
+
+    def _resync_window(self):
+        """Refill the window from the newest live entries"""
+        newest = []
+        for e in reversed(self._entries):
+            if len(newest) == self.window_size:
+                break
+            if e.state != _DEAD:
+                newest.append(e)
+        self._window = deque(reversed(newest), maxlen=self.window_size)
+        self._window_units = sum(exact_units(e.record.intensity) for e in newest)
+
+    def _read(self, entry: _Entry) -> EmotionalRecord:
+        if entry.state in (_ACTIVE, _FUTURE) and self._now is not None:
+            entry.record.relevance = relevance_at(entry.base, entry.record.timestamp, self._now)
+        return entry.record
+
+    @property
+    def records(self):
+        """Live records, with relevance evaluated at the last reflect time"""
+        return [self._read(e) for e in self._entries if e.state != _DEAD]
+
+    def recent(self, n=10):
+        out = []
+        for e in reversed(self._entries):
+            if len(out) == n:
+                break
+            if e.state != _DEAD:
+                out.append(self._read(e))
+        out.reverse()
+        return out
+
+    def summary(self) -> tuple:
+        """MemoryLog.summary() analogue: (records, window sum, decaying records, shame aggregate)"""
+        shame = self._future_sum
+        if self._now is not None and self._t_ref is not None:
+            shame += math.exp(-_K * (self._now - self._t_ref)) * self._active_sum
+        return self._live, self.window_sum, self._active_count, shame
+
+    def shift_time(self, delta: float):
+        """Move timestamps, expiry times and the aggregate anchor by delta seconds (weights are unchanged)"""
+        for e in self._entries:
+            e.record.timestamp += delta
+            e.expires_at += delta
+        # Adding a constant to every key keeps both heaps valid
+        self._expiry = [(key + delta, seq, e) for key, seq, e in self._expiry]
+        self._maturity = [(key + delta, seq, e) for key, seq, e in self._maturity]
+        if self._t_ref is not None:
+            self._t_ref += delta
+        if self._now is not None:
+            self._now += delta
+
+    def add(self, record: EmotionalRecord):
+        record.intensity = clamp_intensity(record.intensity)  # Safety guard
+        if not self._maxlen:
+            return  # Keeps nothing, like deque(maxlen=0)
+        if self._live == self._maxlen:
+            self._evict_oldest()
+        entry = _Entry(record)
+        self._entries.append(entry)
+        self._live += 1
+        if entry.state == _PENDING:
+            self._pending.append(entry)
+
+        window = self._window
+        if window.maxlen:
+            if len(window) == window.maxlen:
+                self._window_units -= exact_units(window[0].record.intensity)  # Evicted by the append below
+            window.append(entry)
+            self._window_units += exact_units(record.intensity)
+
+    def _evict_oldest(self):
+        while self._entries:
+            entry = self._entries.popleft()
+            if entry.state != _DEAD:
+                self._retire(entry)
+                return
+
+    def _retire(self, entry: _Entry):
+        if entry.state == _ACTIVE:
+            self._active_sum -= entry.weight
+            self._active_count -= 1
+            if self._active_count == 0:
+                self._active_sum = 0.0  # Drop accumulated rounding error
+        elif entry.state == _FUTURE:
+            self._future_sum -= entry.weight
+        entry.state = _DEAD
+        self._live -= 1
+        if entry in self._window:
+            self._resync_window()
+
+    def _push(self, heap, key, entry):
+        self._seq += 1
+        heapq.heappush(heap, (key, self._seq, entry))
+
+    def _activate(self, entry: _Entry):
+        r = entry.record
+        entry.weight = r.intensity * entry.base * math.exp(_K * (r.timestamp - self._t_ref))
+        entry.state = _ACTIVE
+        self._active_sum += entry.weight
+        self._active_count += 1
+
+    def _rebase(self, now: float):
+        """Re-anchor the aggregate at `now`; records stamped after `now` (the clock went back) wait to mature again"""
+        self._t_ref = now
+        self._active_sum = 0.0
+        self._active_count = 0
+        for e in self._entries:
+            if e.state != _ACTIVE:
+                continue
+            if e.record.timestamp > now:
+                e.weight = e.record.intensity * e.base
+                e.state = _FUTURE
+                self._future_sum += e.weight
+                self._push(self._maturity, e.record.timestamp, e)
+            else:
+                e.weight = e.record.intensity * e.base * math.exp(_K * (e.record.timestamp - now))
+                self._active_sum += e.weight
+                self._active_count += 1
+
+    def _compact(self, heap: list, live) -> list:
+        """Drop heap items of records that were evicted or have moved on (keeps the heaps O(maxlen))"""
+        if len(heap) <= 2 * self._maxlen:
+            return heap
+        heap = [item for item in heap if item[2].state in live]
+        heapq.heapify(heap)
+        return heap
+
+    def _classify(self, entry: _Entry, now: float) -> bool:
+        """First reflect pass for a record: returns True if it was gently flowed"""
+        r = entry.record
+        # Gently flow light negatives, everything else accumulates embarrassment until forgotten
+        if r.intensity < 0.5 and relevance_at(entry.base, r.timestamp, now) > 0.1:
+            r.provisional = False
+            entry.state = _SETTLED
+            return True
+
+        self._schedule_expiry(entry)
+        if r.timestamp > now:
+            entry.weight = r.intensity * entry.base
+            entry.state = _FUTURE
+            self._future_sum += entry.weight
+            self._push(self._maturity, r.timestamp, entry)
+        else:
+            self._activate(entry)
+        return False
+
+    def _schedule_expiry(self, entry: _Entry):
+        if entry.base < FORGET_BELOW:
+            entry.expires_at = -math.inf
+        else:
+            entry.expires_at = entry.record.timestamp + 3600 * math.log(FORGET_BELOW / entry.base) / math.log(DECAY_PER_HOUR)
+        self._push(self._expiry, entry.expires_at, entry)
+
+    def entry_states(self) -> list:
+        """State code of each live record, in records order (for checkpoints)"""
+        return [e.state for e in self._entries if e.state != _DEAD]
+
+    def aggregate(self) -> tuple:
+        """(t_ref, now, active sum, future sum): the incremental shame aggregate (for checkpoints)"""
+        return self._t_ref, self._now, self._active_sum, self._future_sum
+
+    def restore(self, records, states, aggregate):
+        """Refill an empty log from checkpointed records (relevance = base), entry_states() and aggregate()"""
+        self._t_ref, self._now, active_sum, future_sum = aggregate
+        for record, state in zip(records, states):
+            self.add(record)
+            entry = self._entries[-1]
+            if state == entry.state:
+                continue
+            if entry.state == _PENDING:
+                self._pending.pop()
+            entry.state = state
+            if state == _FUTURE:
+                self._schedule_expiry(entry)
+                entry.weight = record.intensity * entry.base
+                self._push(self._maturity, record.timestamp, entry)
+            elif state == _ACTIVE:
+                self._schedule_expiry(entry)
+                entry.weight = record.intensity * entry.base * math.exp(_K * (record.timestamp - self._t_ref))
+                self._active_count += 1
+        # The sums carry the rounding of the run that wrote them
+        self._active_sum, self._future_sum = active_sum, future_sum
+
+    def reflect(self, current_time: float):
+        """Incremental MemoryLog.reflect: returns (shame_intensity, settled)"""
+        went_back = self._now is not None and current_time < self._now
+        self._now = current_time
+        if self._t_ref is None or went_back or abs(current_time - self._t_ref) > _REBASE_AFTER:
+            self._rebase(current_time)
+
+        # Future-stamped records start decaying once their timestamp is reached
+        while self._maturity and self._maturity[0][0] <= current_time:
+            _, _, entry = heapq.heappop(self._maturity)
+            if entry.state == _FUTURE:
+                self._future_sum -= entry.weight
+                self._activate(entry)
+
+        settled = 0
+        for entry in self._pending:
+            if entry.state == _PENDING:
+                settled += self._classify(entry, current_time)
+        self._pending.clear()
+
+        # Forgetting mechanism: only records whose expiry time has passed are touched
+        while self._expiry and self._expiry[0][0] < current_time:
+            _, _, entry = heapq.heappop(self._expiry)
+            if entry.state in (_ACTIVE, _FUTURE):
+                self._retire(entry)
+        while self._entries and self._entries[0].state == _DEAD:
+            self._entries.popleft()
+        if len(self._entries) > 2 * self._maxlen:
+            self._entries = deque(e for e in self._entries if e.state != _DEAD)
+        self._expiry = self._compact(self._expiry, (_ACTIVE, _FUTURE))
+        self._maturity = self._compact(self._maturity, (_FUTURE,))
+
+        shame_intensity = math.exp(-_K * (current_time - self._t_ref)) * self._active_sum + self._future_sum
+
+        return max(0.0, shame_intensity), settled
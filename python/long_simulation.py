@@ -1,47 +1,134 @@
+import argparse
 import random
-import matplotlib.pyplot as plt
 import pandas as pd
-from agent import Agent  # Import the core agent from agent.py
+from agent import Agent, SimulatedClock  # Import the core agent from agent.py
+from aggregates import StreamingAggregator, agent_row
+from metrics_sink import METRIC_COLUMNS, open_sink
+from plotting import DownsampledPlot, plot_downsampled
 
-def run_long_simulation(steps=100000):  # Equivalent to 100 years (adjustable)
-    agent = Agent()
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+LABELS = ["Relief", "Shame", "Confusion", "Interest"]
+PLOTTED = ('energy', 'total_stress', 'learning_pace')  # Must follow 'step' in METRIC_COLUMNS order
+PLOT_LABELS = {'energy': 'Energy', 'total_stress': 'Total Stress', 'learning_pace': 'Learning Pace'}
+
+def random_input(rng=random):
+    """Random input to simulate real-world variability: (quality, intensity, label)"""
+    return rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(LABELS)
+
+def run_long_simulation(steps=100000, years=100, sample_every=1000, metrics_path=None, plot=True, rng=random,
+                        constant_input=None, verify_every=None, live_plot=False, aggregator=None):  # 100 years of simulated time (adjustable)
+    """Run one long trajectory, sampling the state every `sample_every` steps.
+
+    With metrics_path set, samples are streamed to that file (.csv, .parquet, or a
+    directory of .npy chunks) in bounded memory instead of being collected in a list;
+    plot_metrics(metrics_path) can draw them later. plot=False runs fully headless.
+    Pass a random.Random as rng for an independent, reproducible input stream.
+
+    constant_input=(quality, intensity, label) replaces the random inputs with a
+    stationary soak test: each sampling interval runs through Agent.fast_forward, which
+    skips the steps once the state has settled (verify_every is passed through). The
+    number of skipped steps is printed and stored in df.attrs['steps_skipped'].
+
+    live_plot=True redraws a downsampled figure while the run is going (every 100 samples).
+
+    A StreamingAggregator passed as aggregator sees every step (min/max/mean per bucket at
+    each of its resolutions, plus zombie, emergency and force-pause counts) and is closed
+    at the end. It needs per-step states, so it cannot be combined with constant_input.
+    """
+    if aggregator is not None and constant_input is not None:
+        raise ValueError("aggregator needs every step; fast-forwarded constant_input runs skip them")
+    # Virtual clock: memories age by `years` over the run, with no wall-clock reads
+    agent = Agent(clock=SimulatedClock(seconds_per_step=years * SECONDS_PER_YEAR / steps))
+    sink = open_sink(metrics_path) if metrics_path else None
     history = []
+    if aggregator is not None:
+        aggregator.attach(agent)
+    live = DownsampledPlot(PLOTTED, live=True, refresh_every=100, title='Long-term Simulation Results',
+                           labels=PLOT_LABELS) if live_plot else None
 
     print("=== Long-term Simulation Started ===")
 
-    for step in range(1, steps + 1):
-        # Generate random input to simulate real-world variability
-        quality = random.uniform(0.1, 0.9)
-        intensity = random.uniform(0.0, 1.0)
-        label = random.choice(["Relief", "Shame", "Confusion", "Interest"])
+    step = 0
+    while step < steps:
+        if constant_input is not None:
+            n = min(sample_every - step % sample_every, steps - step)
+            agent.fast_forward(*constant_input, n, verify_every=verify_every)
+            step += n
+        else:
+            agent.step(*random_input(rng))
+            step += 1
+            if aggregator is not None:
+                aggregator.add(*agent_row(agent.state))
 
-        agent.step(quality, intensity, label)
-
-        # Sample every 1000 steps to save memory and avoid overload
-        if step % 1000 == 0:
+        # Sample every `sample_every` steps to save memory and avoid overload
+        if step % sample_every == 0:
             total_stress = agent.state.env_stress + agent.state.self_stress
-            history.append({
-                'step': step,
-                'energy': agent.state.energy,
-                'total_stress': total_stress,
-                'learning_pace': agent.state.learning_pace,
-                'resilience': agent.state.resilience,
-                'motivation': agent.state.motivation
-            })
+            row = (step, agent.state.energy, total_stress, agent.state.learning_pace,
+                   agent.state.resilience, agent.state.motivation)
+            if sink is not None:
+                sink.write(row)
+            else:
+                history.append(dict(zip(METRIC_COLUMNS, row)))
+            if live is not None:
+                live.append(row[:len(PLOTTED) + 1])
+
+    if constant_input is not None:
+        print(f"Fast-forward skipped {agent.steps_skipped} of {steps} steps")
+
+    if live is not None:
+        live.finish()
+    if aggregator is not None:
+        aggregator.close()
+
+    if sink is not None:
+        sink.close()
+        if plot:
+            plot_metrics(metrics_path)
+        return None
 
     df = pd.DataFrame(history)
+    df.attrs['steps_skipped'] = agent.steps_skipped
+    if plot:
+        plot_metrics(df)
+    return df
+
+def plot_metrics(source, save_to=None, show=True, max_points=2000, method='minmax'):
+    """Plot sampled metrics from a DataFrame or a file written by run_long_simulation.
 
-    # Create plots for visualization
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(df['step'], df['energy'], label='Energy')
-    ax.plot(df['step'], df['total_stress'], label='Total Stress')
-    ax.plot(df['step'], df['learning_pace'], label='Learning Pace')
-    ax.legend()
-    plt.title('Long-term Simulation Results')
-    plt.xlabel('Steps')
-    plt.ylabel('Value')
-    plt.grid(True)
-    plt.show()
+    Files are read in chunks and every line is downsampled to max_points points
+    ('minmax' buckets or 'lttb'), so any run length renders quickly in bounded memory.
+    """
+    plot_downsampled(source, PLOTTED, max_points=max_points, method=method, save_to=save_to, show=show,
+                     title='Long-term Simulation Results', labels=PLOT_LABELS)
 
 if __name__ == "__main__":
-    run_long_simulation()
+    parser = argparse.ArgumentParser(description="Long-term resilience simulation")
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--years", type=float, default=100)
+    parser.add_argument("--sample-every", type=int, default=1000)
+    parser.add_argument("--metrics", help="Stream samples to this .csv/.parquet file or .npy chunk directory")
+    parser.add_argument("--no-plot", action="store_true", help="Run headless (no figure)")
+    parser.add_argument("--plot-from", help="Only plot an existing metrics file and exit")
+    parser.add_argument("--save-plot", help="Save the figure to this image file instead of showing it")
+    parser.add_argument("--constant-input", nargs=2, type=float, metavar=("QUALITY", "INTENSITY"),
+                        help="Stationary soak test: constant input, fast-forwarded once the state settles")
+    parser.add_argument("--live-plot", action="store_true", help="Redraw a downsampled figure during the run")
+    parser.add_argument("--max-points", type=int, default=2000, help="Points drawn per line")
+    parser.add_argument("--plot-method", choices=("minmax", "lttb"), default="minmax")
+    parser.add_argument("--aggregate", metavar="PATH",
+                        help="Write 1k/10k/100k-step min/max/mean and event counts to PATH_<bucket> files")
+    parser.add_argument("--verify-every", type=int, help="Re-run one period exactly after every N skipped steps")
+    args = parser.parse_args()
+
+    if args.plot_from:
+        plot_metrics(args.plot_from, save_to=args.save_plot, show=not args.save_plot,
+                     max_points=args.max_points, method=args.plot_method)
+    else:
+        constant_input = (*args.constant_input, "Soak") if args.constant_input else None
+        df = run_long_simulation(args.steps, args.years, args.sample_every, args.metrics, plot=False,
+                                 constant_input=constant_input, verify_every=args.verify_every,
+                                 live_plot=args.live_plot,
+                                 aggregator=StreamingAggregator(path=args.aggregate) if args.aggregate else None)
+        if not args.no_plot:
+            plot_metrics(args.metrics or df, save_to=args.save_plot, show=not args.save_plot,
+                         max_points=args.max_points, method=args.plot_method)
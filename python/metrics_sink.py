@@ -0,0 +1,166 @@
+import os
+import glob
+from abc import ABC, abstractmethod
+import numpy as np
+
+try:  # Optional: Parquet output
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+METRIC_COLUMNS = ('step', 'energy', 'total_stress', 'learning_pace', 'resilience', 'motivation')
+
+
+class _BufferedSink(ABC):
+    """Metrics writer holding at most chunk_rows rows in memory; subclasses write the chunks.
+
+    Rows are only ever appended: reopening an existing path continues it (CSV, .npy
+    chunks) or is refused (Parquet), never truncates it.
+    """
+
+    def __init__(self, path, columns=METRIC_COLUMNS, chunk_rows=4096):
+        self.path = path
+        self.columns = tuple(columns)
+        self._buffer = np.empty((chunk_rows, len(self.columns)))
+        self._rows = 0
+        self.rows_written = 0
+
+    def write(self, row):
+        self._buffer[self._rows] = row
+        self._rows += 1
+        if self._rows == len(self._buffer):
+            self.flush()
+
+    def write_many(self, rows):
+        """Append a 2-D block of rows"""
+        rows = np.asarray(rows, dtype=float)
+        while len(rows):
+            take = min(len(rows), len(self._buffer) - self._rows)
+            self._buffer[self._rows:self._rows + take] = rows[:take]
+            self._rows += take
+            rows = rows[take:]
+            if self._rows == len(self._buffer):
+                self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._write_chunk(self._buffer[:self._rows])
+            self.rows_written += self._rows
+            self._rows = 0
+
+    @abstractmethod
+    def _write_chunk(self, chunk):
+        """Append one full (or final partial) buffer of rows to the output"""
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvMetricsSink(_BufferedSink):
+    """CSV file opened in append mode (header written only for a new file)"""
+
+    def __init__(self, path, columns=METRIC_COLUMNS, chunk_rows=4096):
+        super().__init__(path, columns, chunk_rows)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        if new_file:
+            self._file.write(",".join(self.columns) + "\n")
+
+    def _write_chunk(self, chunk):
+        np.savetxt(self._file, chunk, delimiter=",", fmt="%.17g")
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class NpyChunkSink(_BufferedSink):
+    """Directory of chunk_NNNNNN.npy files plus a columns.txt header"""
+
+    def __init__(self, path, columns=METRIC_COLUMNS, chunk_rows=65536):
+        super().__init__(path, columns, chunk_rows)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "columns.txt"), "w", encoding="utf-8") as f:
+            f.write(",".join(self.columns) + "\n")
+        self._next_chunk = len(glob.glob(os.path.join(path, "chunk_*.npy")))
+
+    def _write_chunk(self, chunk):
+        np.save(os.path.join(self.path, f"chunk_{self._next_chunk:06d}.npy"), chunk)
+        self._next_chunk += 1
+
+
+class ParquetMetricsSink(_BufferedSink):
+    """Single Parquet file, one row group per chunk (requires pyarrow).
+
+    A Parquet file cannot be reopened for appending, so an existing non-empty path is
+    refused rather than overwritten.
+    """
+
+    def __init__(self, path, columns=METRIC_COLUMNS, chunk_rows=65536):
+        if pq is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            raise FileExistsError(f"{path}: Parquet sinks cannot append to an existing file")
+        super().__init__(path, columns, chunk_rows)
+        self._schema = pa.schema([(c, pa.float64()) for c in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_chunk(self, chunk):
+        table = pa.Table.from_arrays([pa.array(chunk[:, i]) for i in range(len(self.columns))], schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        super().close()
+        self._writer.close()
+
+
+def open_sink(path, columns=METRIC_COLUMNS, **kwargs):
+    """Pick a sink from the path: .csv, .parquet, otherwise a directory of .npy chunks"""
+    if path.endswith(".csv"):
+        return CsvMetricsSink(path, columns, **kwargs)
+    if path.endswith(".parquet"):
+        return ParquetMetricsSink(path, columns, **kwargs)
+    return NpyChunkSink(path, columns, **kwargs)
+
+
+def read_metrics(path):
+    """Load a metrics file written by any sink into a pandas DataFrame"""
+    import pandas as pd
+
+    if path.endswith(".csv"):
+        return pd.read_csv(path)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    with open(os.path.join(path, "columns.txt"), encoding="utf-8") as f:
+        columns = f.read().strip().split(",")
+    chunks = [np.load(p) for p in sorted(glob.glob(os.path.join(path, "chunk_*.npy")))]
+    data = np.concatenate(chunks) if chunks else np.empty((0, len(columns)))
+    return pd.DataFrame(data, columns=columns)
+
+
+def iter_metrics(path, chunk_rows=65536):
+    """Yield a metrics file as DataFrame chunks of about chunk_rows rows (bounded memory)"""
+    import pandas as pd
+
+    if path.endswith(".csv"):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif path.endswith(".parquet"):
+        if pq is None:
+            yield pd.read_parquet(path)
+        else:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+    else:
+        with open(os.path.join(path, "columns.txt"), encoding="utf-8") as f:
+            columns = f.read().strip().split(",")
+        for p in sorted(glob.glob(os.path.join(path, "chunk_*.npy"))):
+            yield pd.DataFrame(np.load(p), columns=columns)
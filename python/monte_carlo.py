@@ -0,0 +1,107 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+import numpy as np
+from agent import Agent, AgentState, SimulatedClock
+from long_simulation import SECONDS_PER_YEAR, random_input
+
+# One row of summary statistics per trajectory
+SUMMARY_DTYPE = np.dtype([
+    ('state_index', np.int32),
+    ('seed', np.uint64),
+    ('steps', np.int64),
+    ('final_energy', np.float64),
+    ('final_resilience', np.float64),
+    ('final_learning_pace', np.float64),
+    ('final_motivation', np.float64),
+    ('final_total_stress', np.float64),
+    ('min_energy', np.float64),
+    ('max_total_stress', np.float64),
+    ('zombie_steps', np.int64),  # Steps that ended with zombie_flag raised
+    ('paused_steps', np.int64),  # Steps after which should_continue() was False
+    ('force_pauses', np.int64),
+    ('first_pause_step', np.int64),  # -1 if the agent never paused
+])
+
+
+def run_trajectory(initial_state: AgentState, steps: int, seed: int, years: float = 100):
+    """Run one long_simulation-style trajectory and return its summary statistics as a tuple"""
+    rng = random.Random(seed)
+    agent = Agent(state=AgentState(**asdict(initial_state)),
+                  clock=SimulatedClock(seconds_per_step=years * SECONDS_PER_YEAR / steps))
+    state = agent.state
+    min_energy, max_total_stress = state.energy, state.env_stress + state.self_stress
+    zombie_steps = paused_steps = force_pauses = 0
+    first_pause_step = -1
+
+    for step in range(1, steps + 1):
+        recover_count = state.recover_count
+        agent.step(*random_input(rng))
+
+        total_stress = state.env_stress + state.self_stress
+        min_energy = min(min_energy, state.energy)
+        max_total_stress = max(max_total_stress, total_stress)
+        zombie_steps += state.zombie_flag
+        if state.recover_count < recover_count:
+            force_pauses += 1
+        if not agent.should_continue():
+            paused_steps += 1
+            if first_pause_step < 0:
+                first_pause_step = step
+
+    return (state.energy, state.resilience, state.learning_pace, state.motivation,
+            state.env_stress + state.self_stress, min_energy, max_total_stress,
+            zombie_steps, paused_steps, force_pauses, first_pause_step)
+
+
+def _run_task(task):
+    state_index, seed, initial_state, steps, years = task
+    return (state_index, seed, steps) + run_trajectory(initial_state, steps, seed, years)
+
+
+def run_sweep(n_seeds: int, initial_states=None, steps: int = 100000, years: float = 100,
+              root_seed: int = 0, workers: int = None, chunksize: int = 1) -> np.ndarray:
+    """Monte Carlo sweep: n_seeds trajectories for every starting AgentState.
+
+    Each trajectory gets its own random.Random stream derived from root_seed with
+    np.random.SeedSequence, so results are reproducible and independent of the worker
+    count. Trajectories run in a process pool (all cores by default; workers=1 runs
+    inline) and come back as a structured array with SUMMARY_DTYPE rows.
+    """
+    if initial_states is None:
+        initial_states = [AgentState()]
+    children = np.random.SeedSequence(root_seed).spawn(n_seeds * len(initial_states))
+    tasks = [
+        (i, int(children[i * n_seeds + k].generate_state(1, dtype=np.uint64)[0]), state, steps, years)
+        for i, state in enumerate(initial_states)
+        for k in range(n_seeds)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        rows = [_run_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_run_task, tasks, chunksize=chunksize))
+    return np.array(rows, dtype=SUMMARY_DTYPE)
+
+
+def collapse_rate(summary: np.ndarray) -> float:
+    """Fraction of trajectories that ever hit a should_continue() pause"""
+    return float(np.mean(summary['first_pause_step'] >= 0)) if len(summary) else 0.0
+
+
+def zombie_rate(summary: np.ndarray) -> float:
+    """Fraction of all simulated steps spent with the zombie flag raised"""
+    return float(summary['zombie_steps'].sum() / max(summary['steps'].sum(), 1))
+
+
+if __name__ == "__main__":
+    starts = [AgentState(), AgentState(energy=0.3, resilience=0.3, learning_pace=0.2)]
+    summary = run_sweep(n_seeds=16, initial_states=starts, steps=20000)
+    for i, _ in enumerate(starts):
+        rows = summary[summary['state_index'] == i]
+        print(f"start {i}: collapse rate {collapse_rate(rows):.2%}, "
+              f"mean final energy {rows['final_energy'].mean():.3f}, "
+              f"zombie steps {rows['zombie_steps'].mean():.1f}")
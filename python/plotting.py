@@ -0,0 +1,263 @@
+import numpy as np
+
+METHODS = ('minmax', 'lttb')
+
+
+def minmax_indices(y, n_buckets: int) -> np.ndarray:
+    """Indices of the min and max point of each of n_buckets equal buckets, in order"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    rows = -(-n // size)
+    low = np.full(rows * size, np.inf)
+    high = np.full(rows * size, -np.inf)
+    low[:n] = np.where(np.isnan(y), np.inf, y)
+    high[:n] = np.where(np.isnan(y), -np.inf, y)
+    base = np.arange(rows) * size
+    idx = np.concatenate((base + low.reshape(rows, size).argmin(axis=1),
+                          base + high.reshape(rows, size).argmax(axis=1)))
+    return np.unique(idx[idx < n])
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape of (x, y)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 2 < len(edges):
+            cx, cy = x[hi:edges[k + 2]].mean(), y[hi:edges[k + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # Twice the triangle area between the previous pick, each candidate and the next bucket's centroid
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[k + 1] = a
+    return idx
+
+
+def downsample(x, y, max_points: int = 2000, method: str = 'minmax'):
+    """(x, y) reduced to at most max_points points with a shape-preserving method"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if method == 'minmax':
+        idx = minmax_indices(y, max(max_points // 2, 1))
+    elif method == 'lttb':
+        idx = lttb(x, y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r} (expected one of {METHODS})")
+    return x[idx], y[idx]
+
+
+def _combine(a, b):
+    """Merge two (xmin, ymin, xmax, ymax) bucket summaries; ties keep the earlier point"""
+    take_b_min = b[1] < a[1]
+    take_b_max = b[3] > a[3]
+    return (np.where(take_b_min, b[0], a[0]), np.where(take_b_min, b[1], a[1]),
+            np.where(take_b_max, b[2], a[2]), np.where(take_b_max, b[3], a[3]))
+
+
+class StreamDownsampler:
+    """Min/max buckets over a stream of row blocks, in memory bounded by max_points.
+
+    Each bucket keeps, per y column, its min and max point (with their x). Buckets start
+    one row wide; whenever there are more than max_points of them, neighbours are merged
+    in pairs and the width doubles, so any number of rows reduces to at most
+    max_points + 1 buckets. The open bucket is a running summary, never a buffer of raw
+    rows. Columns: the x column first, then the y columns.
+    """
+
+    def __init__(self, columns, max_points: int = 2000):
+        self.columns = tuple(columns)
+        self.max_points = max_points
+        self.width = 1  # Rows per bucket
+        self.rows = 0
+        ny = len(self.columns) - 1
+        self._buckets = tuple(np.empty((0, ny)) for _ in range(4))  # xmin, ymin, xmax, ymax
+        self._open = None  # Summary of the partially filled bucket
+        self._open_rows = 0
+
+    def _summarize(self, x, y):
+        """Bucket summaries of y rows reshaped as (buckets, width, ny)"""
+        lo = np.where(np.isnan(y), np.inf, y).argmin(axis=1)[:, None]
+        hi = np.where(np.isnan(y), -np.inf, y).argmax(axis=1)[:, None]
+        take = np.take_along_axis
+        return (take(x, lo, axis=1)[:, 0], take(y, lo, axis=1)[:, 0],
+                take(x, hi, axis=1)[:, 0], take(y, hi, axis=1)[:, 0])
+
+    def _reduce(self, block):
+        """(xmin, ymin, xmax, ymax) of a whole block as one summary row"""
+        x = np.broadcast_to(block[:, :1], block[:, 1:].shape)[None]
+        return self._summarize(x, block[None, :, 1:])
+
+    def _push(self, summaries):
+        self._buckets = tuple(np.concatenate((old, new)) for old, new in zip(self._buckets, summaries))
+        while len(self._buckets[0]) > self.max_points:
+            n = len(self._buckets[0]) // 2 * 2
+            pairs = _combine(tuple(b[0:n:2] for b in self._buckets), tuple(b[1:n:2] for b in self._buckets))
+            self._buckets = tuple(np.concatenate((p, b[n:])) for p, b in zip(pairs, self._buckets))
+            self.width *= 2
+
+    def add(self, block):
+        """Fold a 2-D block of rows (columns in self.columns order) into the buckets"""
+        block = np.asarray(block, dtype=float)
+        if block.ndim == 1:
+            block = block[None]
+        self.rows += len(block)
+        while len(block):
+            take = min(len(block), self.width - self._open_rows)
+            if self._open_rows or take < self.width:
+                # Top up the open bucket
+                head = self._reduce(block[:take])
+                self._open = head if self._open is None else _combine(self._open, head)
+                self._open_rows += take
+                block = block[take:]
+                if self._open_rows >= self.width:
+                    self._push(self._open)
+                    self._open, self._open_rows = None, 0
+                continue
+            # Whole buckets straight from the block
+            n = len(block) // self.width * self.width
+            body = block[:n].reshape(-1, self.width, block.shape[1])
+            x = np.broadcast_to(body[:, :, :1], body[:, :, 1:].shape)
+            self._push(self._summarize(x, body[:, :, 1:]))
+            block = block[n:]
+
+    def points(self, column: str, max_points: int = None, method: str = 'minmax'):
+        """(x, y) of one y column: min and max of every bucket in x order, reduced to max_points"""
+        j = self.columns.index(column) - 1
+        parts = list(self._buckets)
+        if self._open is not None:
+            parts = [np.concatenate((p, o)) for p, o in zip(parts, self._open)]
+        xmin, ymin, xmax, ymax = (p[:, j] for p in parts)
+        first = xmin <= xmax
+        x = np.column_stack((np.where(first, xmin, xmax), np.where(first, xmax, xmin))).ravel()
+        y = np.column_stack((np.where(first, ymin, ymax), np.where(first, ymax, ymin))).ravel()
+        # A bucket whose min and max are the same point is drawn once
+        keep = np.ones(len(x), dtype=bool)
+        keep[1::2] = xmin != xmax
+        return downsample(x[keep], y[keep], max_points or self.max_points, method)
+
+
+def _figure(show: bool, figsize=(12, 6)):
+    """(figure, pyplot) for a window, or (figure, None) rendered headless on Agg.
+
+    Headless figures get their own FigureCanvasAgg, so the process-wide backend is never
+    switched and pyplot is not even imported (batch nodes have no display).
+    """
+    if show:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize), plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, None
+
+
+def _as_block(chunk, columns) -> np.ndarray:
+    """2-D float rows from a DataFrame / mapping chunk, or an array already in column order"""
+    if hasattr(chunk, "keys"):
+        return np.column_stack([np.asarray(chunk[c], dtype=float) for c in columns])
+    return np.asarray(chunk, dtype=float)
+
+
+class DownsampledPlot:
+    """Line plot of streamed rows that never draws more than max_points points per line.
+
+    Feed it row blocks (update) or single rows (append); lines are rebuilt from a
+    StreamDownsampler. With live=True the window is redrawn every refresh_every rows
+    while the run is going; finish() draws the final state and saves and/or shows it.
+    show=False renders headless.
+    """
+
+    def __init__(self, columns, x: str = 'step', max_points: int = 2000, method: str = 'minmax',
+                 live: bool = False, refresh_every: int = 1000, show: bool = True,
+                 title: str = None, xlabel: str = 'Steps', ylabel: str = 'Value', labels: dict = None):
+        if method not in METHODS:
+            raise ValueError(f"Unknown downsampling method {method!r} (expected one of {METHODS})")
+        self.columns = tuple(columns)
+        self.max_points = max_points
+        self.method = method
+        self.live = live and show
+        self.show = show
+        self.refresh_every = refresh_every
+        self.sampler = StreamDownsampler((x,) + self.columns, max_points)
+        self._staged = []
+
+        self.fig, self._plt = _figure(show)
+        if self.live:
+            self._plt.ion()
+        self.ax = self.fig.subplots()
+        labels = labels or {}
+        self.lines = {c: self.ax.plot([], [], label=labels.get(c, c))[0] for c in self.columns}
+        self.ax.legend()
+        self.ax.set_title(title or '')
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True)
+
+    def append(self, row):
+        """Stage one row (x first); staged rows are folded in every refresh_every rows"""
+        self._staged.append(row)
+        if len(self._staged) >= self.refresh_every:
+            self.update(self._staged)
+            self._staged = []
+
+    def update(self, chunk):
+        self.sampler.add(_as_block(chunk, self.sampler.columns))
+        if self.live:
+            self.refresh()
+
+    def refresh(self):
+        for column, line in self.lines.items():
+            line.set_data(*self.sampler.points(column, self.max_points, self.method))
+        self.ax.relim()
+        self.ax.autoscale_view()
+        if self.live:
+            self._plt.pause(0.001)
+
+    def finish(self, save_to: str = None):
+        if self._staged:
+            self.sampler.add(_as_block(self._staged, self.sampler.columns))
+            self._staged = []
+        self.refresh()
+        if save_to:
+            self.fig.savefig(save_to)
+        if self._plt is not None:
+            if self.live:
+                self._plt.ioff()
+            self._plt.show()
+            self._plt.close(self.fig)
+
+
+def plot_downsampled(source, columns, x: str = 'step', max_points: int = 2000, method: str = 'minmax',
+                     save_to: str = None, show: bool = True, chunk_rows: int = 65536, **kwargs):
+    """Plot columns of a DataFrame, a mapping, an iterable of chunks or a metrics file, downsampled.
+
+    Metrics files are read chunk by chunk, so a file of any length is plotted in bounded memory.
+    Returns the finished DownsampledPlot (its sampler holds the drawn points).
+    """
+    from metrics_sink import iter_metrics
+
+    plot = DownsampledPlot(columns, x, max_points, method, show=show, **kwargs)
+    if isinstance(source, str):
+        chunks = iter_metrics(source, chunk_rows)
+    elif hasattr(source, "keys"):
+        chunks = [source]
+    else:
+        chunks = source
+    for chunk in chunks:
+        plot.update(chunk)
+    plot.finish(save_to)
+    return plot
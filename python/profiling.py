@@ -0,0 +1,129 @@
+import time
+from functools import wraps
+
+PHASES = ('perceive', 'reflect_black_history', 'zombie_feedback_machine', 'recover_and_reboot')
+_SIZE_BUCKET = 10  # Reflect timings are grouped by memory size in buckets of this many records
+
+
+def _memory_size(memory) -> int:
+    size = getattr(memory, "__len__", None)
+    return size() if size is not None else len(memory.records)
+
+
+class PhaseStats:
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'records_scanned', 'records_removed')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.records_scanned = 0
+        self.records_removed = 0
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns / self.calls if self.calls else 0.0,
+            'max_ns': self.max_ns,
+            'records_scanned': self.records_scanned,
+            'records_removed': self.records_removed,
+        }
+
+
+class StepProfiler:
+    """Opt-in per-phase timers for the Agent step pipeline.
+
+    attach(agent) shadows the phase methods with timed wrappers stored on that instance
+    only; detach(agent) deletes them again, so an unprofiled agent runs the plain class
+    methods with no checks at all. One profiler may be attached to many agents to get
+    fleet-wide totals.
+    """
+
+    def __init__(self):
+        self.phases = {name: PhaseStats() for name in PHASES + ('step',)}
+        self.reflect_by_size = {}  # Memory-size bucket -> [calls, total_ns]
+
+    def attach(self, agent):
+        for name in PHASES:
+            setattr(agent, name, self._timed(name, getattr(agent, name)))
+        setattr(agent, 'reflect_black_history', self._timed_reflect(agent, agent.reflect_black_history))
+        setattr(agent, '_advance', self._timed('step', agent._advance))
+        return self
+
+    def detach(self, agent):
+        for name in PHASES + ('_advance',):
+            agent.__dict__.pop(name, None)
+
+    def _timed(self, name, method):
+        stats = self.phases[name]
+        clock = time.perf_counter_ns
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            elapsed = clock() - start
+            stats.calls += 1
+            stats.total_ns += elapsed
+            if elapsed > stats.max_ns:
+                stats.max_ns = elapsed
+            return result
+        return timed
+
+    def _timed_reflect(self, agent, method):
+        """Wraps the already-timed reflect to count records scanned/removed and bucket by size"""
+        stats = self.phases['reflect_black_history']
+        by_size = self.reflect_by_size
+        clock = time.perf_counter_ns
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            before = _memory_size(agent.memory)
+            start = clock()
+            result = method(*args, **kwargs)
+            elapsed = clock() - start
+            stats.records_scanned += before
+            stats.records_removed += before - _memory_size(agent.memory)
+            bucket = by_size.setdefault(before // _SIZE_BUCKET * _SIZE_BUCKET, [0, 0])
+            bucket[0] += 1
+            bucket[1] += elapsed
+            return result
+        return timed
+
+    def reset(self):
+        for stats in self.phases.values():
+            stats.__init__()
+        self.reflect_by_size.clear()
+
+    def snapshot(self):
+        """Plain dict of all counters (JSON-serializable)"""
+        return {
+            'phases': {name: stats.as_dict() for name, stats in self.phases.items()},
+            'reflect_by_memory_size': {
+                size: {'calls': calls, 'mean_ns': total / calls}
+                for size, (calls, total) in sorted(self.reflect_by_size.items())
+            },
+        }
+
+    def report(self) -> str:
+        lines = [f"{'phase':<26}{'calls':>10}{'mean us':>10}{'max us':>10}{'share':>8}"]
+        step_ns = self.phases['step'].total_ns or 1
+        for name, stats in self.phases.items():
+            mean = stats.total_ns / stats.calls / 1000 if stats.calls else 0.0
+            lines.append(f"{name:<26}{stats.calls:>10}{mean:>10.2f}{stats.max_ns / 1000:>10.1f}"
+                         f"{stats.total_ns / step_ns:>8.1%}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import random
+    from agent import Agent, SimulatedClock
+
+    agent = Agent(clock=SimulatedClock(seconds_per_step=600))
+    profiler = StepProfiler().attach(agent)
+    for _ in range(20000):
+        agent.step(random.uniform(0.1, 0.9), random.uniform(0.0, 1.0), "Profile")
+    print(profiler.report())
+    for size, row in profiler.snapshot()['reflect_by_memory_size'].items():
+        print(f"reflect @ {size:>3}+ records: {row['mean_ns'] / 1000:.2f} us ({row['calls']} calls)")
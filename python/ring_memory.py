@@ -0,0 +1,185 @@
+import numpy as np
+from agent import EmotionalRecord, clamp_intensity, exact_units, units_to_float
+
+
+class RecordColumns:
+    """Zero-copy window over a RingMemoryLog: one NumPy view per column, oldest first.
+
+    Label and context codes index `names`, the owning log's string table.
+    """
+
+    __slots__ = ('intensity', 'timestamp', 'relevance', 'provisional', 'label_code', 'context_code', 'names')
+
+    def __init__(self, intensity, timestamp, relevance, provisional, label_code, context_code, names):
+        self.intensity = intensity
+        self.timestamp = timestamp
+        self.relevance = relevance
+        self.provisional = provisional
+        self.label_code = label_code
+        self.context_code = context_code
+        self.names = names
+
+    def __len__(self):
+        return len(self.intensity)
+
+    def __iter__(self):
+        """Materialize EmotionalRecord copies (compatibility path, allocates per record)"""
+        names = self.names
+        for i in range(len(self.intensity)):
+            yield EmotionalRecord(
+                label=names[self.label_code[i]],
+                intensity=float(self.intensity[i]),
+                context=names[self.context_code[i]],
+                provisional=bool(self.provisional[i]),
+                timestamp=float(self.timestamp[i]),
+                relevance=float(self.relevance[i]),
+            )
+
+
+class RingMemoryLog:
+    """Columnar drop-in replacement for MemoryLog backed by preallocated NumPy arrays.
+
+    Live records occupy the contiguous slice [start, end) of buffers sized 2 * maxlen.
+    Evicting the oldest record only moves `start`; when `end` reaches the buffer end the
+    live window is copied back to the front, so appends are O(1) amortized and any
+    recent_columns(n) window is a plain slice (no copy). recent() and records return
+    EmotionalRecord copies, like MemoryLog but detached from the log. Labels and
+    contexts are interned into integer codes in a per-log string table.
+    """
+
+    def __init__(self, maxlen: int = 100, window_size: int = 10):
+        self._maxlen = maxlen
+        self.window_size = min(window_size, maxlen)
+        size = 2 * maxlen
+        self._intensity = np.zeros(size)
+        self._timestamp = np.zeros(size)
+        self._relevance = np.zeros(size)
+        self._provisional = np.zeros(size, dtype=bool)
+        self._label_code = np.zeros(size, dtype=np.int32)
+        self._context_code = np.zeros(size, dtype=np.int32)
+        self._codes = {}  # Label/context string -> code
+        self._names = []  # Code -> string
+        self._start = 0
+        self._end = 0
+        self._window_units = 0  # Exact sum of the window intensities (agent.exact_units)
+
+    @property
+    def maxlen(self):
+        return self._maxlen
+
+    def _intern(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self._names)
+            self._names.append(label)
+        return code
+
+    def __len__(self):
+        return self._end - self._start
+
+    def _columns(self):
+        return (self._intensity, self._timestamp, self._relevance,
+                self._provisional, self._label_code, self._context_code)
+
+    @property
+    def window_count(self):
+        return min(len(self), self.window_size)
+
+    @property
+    def window_sum(self):
+        """Sum of the window, rounded once from the running exact sum (as MemoryLog)"""
+        return units_to_float(self._window_units)
+
+    def _resync_window(self):
+        """Recompute the exact window sum from the newest live records"""
+        window = self._intensity[self._end - self.window_count:self._end].tolist()
+        self._window_units = sum(exact_units(x) for x in window)
+
+    @property
+    def window_mean(self):
+        """Mean intensity of the last window_size records (0.0 when empty)"""
+        return self.window_sum / max(self.window_count, 1)
+
+    def _compact(self):
+        n = len(self)
+        for col in self._columns():
+            col[:n] = col[self._start:self._end]
+        self._start, self._end = 0, n
+
+    def add(self, record: EmotionalRecord):
+        if not self._maxlen:
+            return  # Keeps nothing, like deque(maxlen=0)
+        intensity = clamp_intensity(record.intensity)  # Safety guard
+        if self.window_size:
+            if self.window_count == self.window_size:
+                self._window_units -= exact_units(float(self._intensity[self._end - self.window_size]))
+            self._window_units += exact_units(intensity)
+        if len(self) == self._maxlen:
+            self._start += 1  # Drop the oldest record, like deque(maxlen)
+        if self._end == len(self._intensity):
+            self._compact()
+        i = self._end
+        self._intensity[i] = intensity
+        self._timestamp[i] = record.timestamp
+        self._relevance[i] = record.relevance
+        self._provisional[i] = record.provisional
+        self._label_code[i] = self._intern(record.label)
+        self._context_code[i] = self._intern(record.context)
+        self._end += 1
+
+    def recent_columns(self, n=10) -> RecordColumns:
+        """Zero-copy column views of the last n records"""
+        start = max(self._start, self._end - n)
+        return RecordColumns(*(col[start:self._end] for col in self._columns()), self._names)
+
+    def recent(self, n=10):
+        """The last n records as EmotionalRecord copies, oldest first (as MemoryLog.recent)"""
+        return list(self.recent_columns(n))
+
+    def summary(self) -> tuple:
+        """MemoryLog.summary(): (records, window sum, provisional records, their total relevance)"""
+        live = slice(self._start, self._end)
+        provisional = self._provisional[live]
+        return (len(self), self.window_sum, int(provisional.sum()),
+                float(np.sum(self._relevance[live], where=provisional)))
+
+    def shift_time(self, delta: float):
+        self._timestamp[self._start:self._end] += delta
+
+    @property
+    def records(self):
+        """All live records as EmotionalRecord copies (built on each access; use recent_columns() for views)"""
+        return self.recent(len(self))
+
+    def remove_where(self, mask):
+        """Vectorized removal of the records flagged in `mask` (aligned with the live window)"""
+        keep = ~np.asarray(mask, dtype=bool)
+        n = int(keep.sum())
+        for col in self._columns():
+            col[:n] = col[self._start:self._end][keep]
+        self._start, self._end = 0, n
+        self._resync_window()
+
+    def reflect(self, current_time: float):
+        """Vectorized MemoryLog.reflect: returns (shame_intensity, settled)"""
+        live = slice(self._start, self._end)
+        intensity = self._intensity[live]
+        relevance = self._relevance[live]
+        provisional = self._provisional[live]
+
+        age_hours = (current_time - self._timestamp[live]) / 3600
+        decay = 0.95 ** np.maximum(age_hours, 0.0)  # Prevent negative age calculation
+        np.multiply(relevance, decay, out=relevance, where=provisional)
+
+        # Gently flow light negatives + accumulate embarrassment
+        settle = provisional & (intensity < 0.5) & (relevance > 0.1)
+        ashamed = provisional & ~settle
+        shame_intensity = float(np.sum(intensity * relevance, where=ashamed))
+        provisional &= ~settle
+
+        # Forgetting mechanism
+        forget = ashamed & (relevance < 0.05)
+        if forget.any():
+            self.remove_where(forget)
+
+        return shame_intensity, int(settle.sum())
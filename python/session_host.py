@@ -0,0 +1,163 @@
+import asyncio
+from collections import deque
+from agent import Agent, AgentState
+
+
+class SessionHost:
+    """Asyncio host for many concurrent Agent sessions keyed by session id.
+
+    Each session has a bounded FIFO inbox. A single worker task drains the inboxes of all
+    ready sessions on every event-loop tick (up to max_batch events), applying each
+    session's share with one Agent.step_stream pass, so events of one session are applied
+    strictly in order while sessions are micro-batched together. An event's future
+    resolves to the session state right after that event (a snapshot per event, so later
+    events in the same batch never leak into it), or to the exception raised while
+    applying it, which also fails the rest of that session's batch; a failing session
+    never stalls the others. When a session's inbox is full, submit() waits
+    until the worker frees space.
+
+    `sessions` is any mapping with get() and item assignment (a plain dict by default);
+    unknown session ids get a fresh agent_factory() agent.
+    """
+
+    def __init__(self, agent_factory=Agent, sessions=None, queue_size: int = 64, max_batch: int = 4096):
+        self.agent_factory = agent_factory
+        self.sessions = {} if sessions is None else sessions
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self.processed = 0
+        self.batches = 0
+        self._inbox = {}  # session id -> deque of (input_quality, emotional_intensity, label, future)
+        self._ready = deque()  # Session ids with queued events, in arrival order
+        self._space = {}  # session id -> futures waiting for inbox space
+        self._wakeup = None
+        self._worker = None
+        self._stopping = False
+
+    async def start(self):
+        if self._worker is None:
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def stop(self):
+        """Process everything already queued, then wait for the worker to finish (re-raising if it died)"""
+        if self._worker is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await self._worker
+        finally:
+            self._worker = None
+            self._stopping = False
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def agent(self, session_id) -> Agent:
+        agent = self.sessions.get(session_id)
+        if agent is None:
+            agent = self.sessions[session_id] = self.agent_factory()
+        return agent
+
+    def pending(self, session_id) -> int:
+        inbox = self._inbox.get(session_id)
+        return len(inbox) if inbox else 0
+
+    async def submit(self, session_id, input_quality: float, emotional_intensity: float, label: str) -> asyncio.Future:
+        """Queue one step event (waiting while the inbox is full); the future resolves to the new AgentState"""
+        if self._worker is None:
+            await self.start()
+        elif self._worker.done():
+            self._worker.result()  # Surface the error that killed the worker
+        loop = asyncio.get_running_loop()
+        while True:
+            inbox = self._inbox.get(session_id)
+            if inbox is None:
+                inbox = self._inbox[session_id] = deque()
+            if len(inbox) < self.queue_size:
+                break
+            space = loop.create_future()
+            self._space.setdefault(session_id, []).append(space)
+            await space
+
+        future = loop.create_future()
+        if not inbox:
+            self._ready.append(session_id)
+        inbox.append((input_quality, emotional_intensity, label, future))
+        self._wakeup.set()
+        return future
+
+    async def step(self, session_id, input_quality: float, emotional_intensity: float, label: str) -> AgentState:
+        """Submit one event and wait for the session state after it was applied"""
+        return await (await self.submit(session_id, input_quality, emotional_intensity, label))
+
+    def _drain(self):
+        """Apply up to max_batch queued events across ready sessions; returns the number applied"""
+        budget = self.max_batch
+        ready = self._ready
+        for _ in range(len(ready)):
+            if budget <= 0:
+                break
+            session_id = ready.popleft()
+            inbox = self._inbox[session_id]
+            n = min(len(inbox), budget)
+            budget -= n
+            batch = [inbox.popleft() for _ in range(n)]
+            applied = 0
+            try:
+                agent = self.agent(session_id)
+                for applied, state in agent.step_stream(event[:3] for event in batch):
+                    future = batch[applied - 1][3]
+                    if not future.done():
+                        future.set_result(state)
+            except Exception as exc:
+                for *_, future in batch[applied:]:
+                    if not future.done():
+                        future.set_exception(exc)
+
+            if inbox:
+                ready.append(session_id)  # Leftovers go to the back of the line
+            else:
+                del self._inbox[session_id]
+            waiters = self._space.pop(session_id, None)
+            if waiters:
+                for space in waiters:
+                    if not space.done():
+                        space.set_result(None)
+        return self.max_batch - budget
+
+    def _fail_all(self, exc: BaseException):
+        """Fail every queued event and space waiter (the worker is going away)"""
+        for inbox in self._inbox.values():
+            for *_, future in inbox:
+                if not future.done():
+                    future.set_exception(exc)
+        for waiters in self._space.values():
+            for space in waiters:
+                if not space.done():
+                    space.set_exception(exc)
+        self._inbox.clear()
+        self._ready.clear()
+        self._space.clear()
+
+    async def _run(self):
+        try:
+            while True:
+                if not self._ready:
+                    if self._stopping:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                applied = self._drain()
+                self.processed += applied
+                self.batches += 1
+                await asyncio.sleep(0)  # Let producers and result consumers run before the next batch
+        except BaseException as exc:
+            self._fail_all(exc if isinstance(exc, Exception) else RuntimeError("SessionHost worker stopped"))
+            raise
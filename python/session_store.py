@@ -0,0 +1,203 @@
+import math
+import sqlite3
+import threading
+import tracemalloc
+from collections import OrderedDict, deque
+from agent import Agent, EmotionalRecord, MemoryLog
+from checkpoint import Checkpoint, encode_agents
+
+# Session id types stored as-is (SQLite keeps 1 and "1" apart in an untyped column).
+# bool is an int subclass equal to 0/1, so it is rejected rather than merged into those sessions.
+_KEY_TYPES = (str, int, bytes)
+
+
+def _valid_key(session_id) -> bool:
+    return isinstance(session_id, _KEY_TYPES) and not isinstance(session_id, bool)
+
+
+def _measure_agent_bytes(records: int = 100) -> tuple:
+    """(agent bytes, bytes per record) of an Agent with a MemoryLog, traced with tracemalloc"""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        agent = Agent(memory=MemoryLog(records=deque(maxlen=records)))
+        empty = tracemalloc.get_traced_memory()[0]
+        for i in range(records):
+            agent.memory.add(EmotionalRecord(label="Shame", intensity=0.5, context="", timestamp=float(i)))
+        full = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return empty - start, math.ceil((full - empty) / records)
+
+
+# Measured once at import, so the estimate follows changes to Agent and its records
+AGENT_BASE_BYTES, RECORD_BYTES = _measure_agent_bytes()
+
+
+def estimate_agent_bytes(agent: Agent) -> int:
+    """Approximate worst-case resident bytes: the memory is charged as if full, so the budget holds as it fills.
+
+    Built from sizes traced at import for the default MemoryLog with short labels; long
+    labels, listeners or other memory classes are not measured, so the real footprint
+    can differ from the estimate.
+    """
+    return AGENT_BASE_BYTES + RECORD_BYTES * (agent.memory.maxlen or 100)
+
+
+class TieredSessionStore:
+    """Session id -> Agent mapping with a bounded hot tier and a SQLite cold tier.
+
+    Hot agents live in an LRU OrderedDict whose size, as estimated by
+    estimate_agent_bytes(), stays under byte_budget: an approximate cap on resident
+    memory, not a measured limit.
+    Least recently used agents are encoded with checkpoint.encode_agents() and handed to
+    a background writer thread, which commits them to SQLite in batches of up to
+    batch_size (or every flush_interval seconds). get() reloads an evicted agent from the
+    write queue or the database transparently, so it can back SessionHost(sessions=...).
+    Session ids (str, int or bytes, but not bool) are stored as given, so 1 and "1"
+    are different sessions. If the writer fails, flush() and close() raise its error. Listeners are not
+    persisted; resubscribe after a reload.
+    """
+
+    def __init__(self, path: str, byte_budget: int = 256 * 1024 * 1024, agent_factory=Agent,
+                 batch_size: int = 512, flush_interval: float = 1.0):
+        self.path = path
+        self.byte_budget = byte_budget
+        self.agent_factory = agent_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hot_bytes = 0
+        self.evictions = 0
+        self.reloads = 0
+        self._hot = OrderedDict()  # session id -> (agent, estimated bytes), most recent last
+        self._pending = {}  # session id -> encoded agent waiting for the writer
+        self._writing = {}  # Batch currently being committed (still readable)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS sessions (id PRIMARY KEY, data BLOB NOT NULL)")
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        self._closed = False
+        self._error = None  # Exception that stopped the writer
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+
+    def __len__(self):
+        return len(self._hot)
+
+    def __contains__(self, session_id):
+        return self.get(session_id, load=False) is not None
+
+    def get(self, session_id, default=None, load: bool = True):
+        """Hot agent, or the evicted agent reloaded into the hot tier (default if unknown)"""
+        if not _valid_key(session_id):
+            return default
+        entry = self._hot.get(session_id)
+        if entry is not None:
+            self._hot.move_to_end(session_id)
+            return entry[0]
+        with self._lock:
+            data = self._pending.get(session_id) or self._writing.get(session_id)
+        if data is None:
+            with self._db_lock:
+                row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            data = row[0] if row else None
+        if data is None:
+            return default
+        if not load:
+            return True
+        agent = Checkpoint(data).agent(0)
+        self.reloads += 1
+        self[session_id] = agent
+        return agent
+
+    def __getitem__(self, session_id):
+        agent = self.get(session_id)
+        if agent is None:
+            raise KeyError(session_id)
+        return agent
+
+    def __setitem__(self, session_id, agent: Agent):
+        if not _valid_key(session_id):
+            raise TypeError(f"Session ids must be str, int or bytes, not {type(session_id).__name__}")
+        old = self._hot.pop(session_id, None)
+        if old is not None:
+            self.hot_bytes -= old[1]
+        size = estimate_agent_bytes(agent)
+        self._hot[session_id] = (agent, size)
+        self.hot_bytes += size
+        while self.hot_bytes > self.byte_budget and len(self._hot) > 1:
+            self._evict()
+
+    def _evict(self):
+        session_id, (agent, size) = self._hot.popitem(last=False)
+        self.hot_bytes -= size
+        self.evictions += 1
+        data = encode_agents([agent])
+        with self._lock:
+            self._pending[session_id] = data
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+
+    def _write_loop(self):
+        try:
+            self._write_batches()
+        except Exception as exc:
+            with self._lock:
+                self._error = exc
+                self._wake.notify_all()
+
+    def _write_batches(self):
+        while True:
+            with self._lock:
+                if not self._pending and not self._closed:
+                    self._wake.wait(self.flush_interval)
+                if not self._pending:
+                    if self._closed:
+                        return
+                    continue
+                self._writing, self._pending = self._pending, {}
+                batch = list(self._writing.items())
+            with self._db_lock:
+                self._db.executemany("INSERT OR REPLACE INTO sessions (id, data) VALUES (?, ?)", batch)
+                self._db.commit()
+            with self._lock:
+                self._writing = {}
+                self._wake.notify_all()
+
+    def flush(self):
+        """Block until every evicted agent queued so far is committed (raises if the writer died)"""
+        with self._lock:
+            self._wake.notify()
+            while (self._pending or self._writing) and self._error is None:
+                self._wake.wait()
+            if self._error is not None:
+                raise RuntimeError("Session store writer failed; queued agents were not saved") from self._error
+
+    def persist_all(self):
+        """Queue every hot agent for writing (they stay resident) and wait for the commit"""
+        encoded = {sid: encode_agents([agent]) for sid, (agent, _) in self._hot.items()}
+        with self._lock:
+            self._pending.update(encoded)
+        self.flush()
+
+    def close(self):
+        try:
+            self.persist_all()
+        finally:
+            with self._lock:
+                self._closed = True
+                self._wake.notify_all()
+            self._writer.join()
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from agent import Agent, SimulatedClock
+from aggregates import AGGREGATE_METRICS, StreamingAggregator, agent_row
+from long_simulation import random_input, run_long_simulation
+from metrics_sink import read_metrics
+
+
+def test_levels_match_brute_force():
+    rng = np.random.default_rng(3)
+    rows = rng.random((2550, 2))
+    rows[1234, 0] = 7.0  # Single-step spike between samples
+    agg = StreamingAggregator(levels=(10, 100, 1000), metrics=('a', 'b'))
+    for row in rows:
+        agg.add(*row)
+    agg.close()
+
+    for bucket in (10, 100, 1000):
+        df = agg.frame(bucket)
+        starts = np.arange(0, len(rows), bucket)
+        assert list(df['step']) == list(starts + 1)
+        assert list(df['count']) == [len(rows[s:s + bucket]) for s in starts]
+        for j, name in enumerate(('a', 'b')):
+            chunks = [rows[s:s + bucket, j] for s in starts]
+            assert np.array_equal(df[name + '_min'], [c.min() for c in chunks])
+            assert np.array_equal(df[name + '_max'], [c.max() for c in chunks])
+            assert np.allclose(df[name + '_mean'], [c.mean() for c in chunks])
+    assert agg.frame(1000)['a_max'].max() == 7.0
+
+    with pytest.raises(ValueError):
+        StreamingAggregator(levels=(10, 25))
+
+
+def test_in_memory_rows_keep_only_the_latest_buckets():
+    agg = StreamingAggregator(levels=(10, 100), metrics=('a',), max_rows=5)
+    for step in range(1000):
+        agg.add(float(step))
+    agg.close()
+
+    fine = agg.frame(10)
+    assert list(fine['step']) == [951, 961, 971, 981, 991]
+    assert list(fine['a_max']) == [959.0, 969.0, 979.0, 989.0, 999.0]
+    assert list(agg.frame(100)['step']) == [501, 601, 701, 801, 901]
+
+
+def test_event_counts_per_bucket():
+    agent = Agent(clock=SimulatedClock())
+    agg = StreamingAggregator(levels=(100, 1000))
+    agg.attach(agent)
+    kinds = []
+    current = [0]
+    agent.subscribe(lambda e: kinds.append((current[0], e.kind, e.detail)))
+    rng = random.Random(5)
+    for step in range(1, 3001):
+        current[0] = step
+        agent.step(*random_input(rng))
+        agg.add(*agent_row(agent.state))
+    agg.close()
+
+    fine = agg.frame(100)
+    for _, row in fine.iterrows():
+        in_bucket = [(k, d) for s, k, d in kinds if row['step'] <= s < row['step'] + 100]
+        assert row['zombie_raised'] == sum(k == "zombie_raised" for k, _ in in_bucket)
+        assert row['emergency'] == sum(k == "recovery" and d == "emergency" for k, d in in_bucket)
+        assert row['force_pause'] == sum(k == "force_pause" for k, _ in in_bucket)
+    coarse = agg.frame(1000)
+    for name in ('zombie_raised', 'emergency', 'force_pause', 'force_reboot'):
+        assert coarse[name].sum() == fine[name].sum()
+    assert fine['emergency'].sum() > 0
+
+
+def test_long_simulation_writes_aggregates(tmp_path):
+    path = str(tmp_path / "agg.csv")
+    run_long_simulation(steps=25000, plot=False, rng=random.Random(1), aggregator=StreamingAggregator(path=path))
+
+    counts = {b: read_metrics(str(tmp_path / f"agg_{b}.csv")) for b in (1000, 10000, 100000)}
+    assert [len(df) for df in counts.values()] == [25, 3, 1]
+    assert counts[10000]['count'].tolist() == [10000, 10000, 5000]
+    assert counts[100000]['count'].item() == 25000
+    for name in AGGREGATE_METRICS:
+        assert counts[100000][name + '_max'].item() == counts[1000][name + '_max'].max()
+    assert counts[100000]['force_pause'].item() == counts[1000]['force_pause'].sum()
+
+    with pytest.raises(ValueError):
+        run_long_simulation(steps=10, plot=False, constant_input=(0.5, 0.5, "Soak"), aggregator=StreamingAggregator())
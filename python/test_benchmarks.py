@@ -0,0 +1,16 @@
+from run_benchmarks import compare_results, run_benchmarks
+
+
+def test_compare_flags_regressions_by_direction():
+    baseline = {"results": {"agent_step": {"fill_0_steps_per_sec": 1000.0}, "reflect": {"records_10_spread_0h_ns": 100.0}}}
+    current = {"results": {"agent_step": {"fill_0_steps_per_sec": 700.0}, "reflect": {"records_10_spread_0h_ns": 90.0},
+                           "server_step": {"steps_per_sec": 5.0}}}
+    rows = {(name, metric): regressed for name, metric, _, _, _, regressed in compare_results(current, baseline, 0.15)}
+
+    assert rows == {("agent_step", "fill_0_steps_per_sec"): True, ("reflect", "records_10_spread_0h_ns"): False}
+
+
+def test_suite_runs_and_reports_numbers():
+    report = run_benchmarks(["server_step", "memory_per_agent"], scale=1, repeat=1)
+    assert report["results"]["server_step"]["steps_per_sec"] > 0
+    assert report["results"]["memory_per_agent"]["agent_peak_bytes"] > 0
@@ -0,0 +1,92 @@
+import random
+from collections import deque
+import pytest
+from dataclasses import asdict
+from agent import Agent, EmotionalRecord, MemoryLog, SimulatedClock
+from ring_memory import RingMemoryLog
+from lazy_memory import LazyMemoryLog
+from checkpoint import Checkpoint, load_agent, save_agent, save_agents
+
+LABELS = ["Relief", "Shame", "Confusion", "Interest"]
+
+
+def make_events(seed, n):
+    rng = random.Random(seed)
+    return [(rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(LABELS)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("memory_factory", [MemoryLog, RingMemoryLog, LazyMemoryLog])
+def test_resume_matches_uninterrupted_run(tmp_path, memory_factory):
+    events = make_events(5, 400)
+    path = str(tmp_path / "agent.ckpt")
+
+    straight = Agent(memory=memory_factory(), clock=SimulatedClock(seconds_per_step=1800))
+    straight.step_many(events)
+
+    resumed = Agent(memory=memory_factory(), clock=SimulatedClock(seconds_per_step=1800))
+    resumed.step_many(events[:250])
+    save_agent(resumed, path)
+    resumed = load_agent(path)
+    assert type(resumed.memory) is memory_factory
+    resumed.step_many(events[250:])
+
+    assert asdict(resumed.state) == asdict(straight.state), "Resumed run diverged"
+    assert resumed.clock == straight.clock
+    assert [asdict(r) for r in resumed.memory.records] == [asdict(r) for r in straight.memory.records]
+
+
+def test_many_sessions_load_lazily(tmp_path):
+    path = str(tmp_path / "sessions.ckpt")
+    agents = []
+    for i in range(50):
+        agent = Agent(clock=SimulatedClock())
+        agent.step_many(make_events(i, i % 7))
+        agents.append(agent)
+    save_agents(agents, path)
+
+    ckpt = Checkpoint(path)
+    assert len(ckpt) == 50
+    assert len(ckpt.records(13)) == 13 % 7
+    restored = ckpt.agent(13)
+    assert asdict(restored.state) == asdict(agents[13].state)
+    assert [asdict(r) for r in restored.memory.records] == [asdict(r) for r in agents[13].memory.records]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "bogus.ckpt"
+    path.write_bytes(b"not a checkpoint at all, just some bytes")
+    with pytest.raises(ValueError):
+        Checkpoint(str(path))
+
+
+def test_unbounded_and_empty_memories_keep_their_maxlen(tmp_path):
+    agents = [Agent(memory=MemoryLog(records=deque(maxlen=maxlen))) for maxlen in (None, 0, 5)]
+    for agent in agents:
+        agent.step(0.5, 0.5, "Shame")
+    path = str(tmp_path / "agents.ckpt")
+    save_agents(agents, path)
+    assert [a.memory.maxlen for a in Checkpoint(path).agents()] == [None, 0, 5]
+
+
+@pytest.mark.parametrize("memory_factory", [MemoryLog, RingMemoryLog, LazyMemoryLog])
+def test_round_trip_keeps_run_state_and_lazy_aggregate(tmp_path, memory_factory):
+    """Paused flag, skipped steps and the lazy log's anchor and entry states survive; every later step matches"""
+    path = str(tmp_path / "agent.ckpt")
+    agent = Agent(memory=memory_factory(), clock=SimulatedClock(current=1e9, seconds_per_step=1800))
+    agent.fast_forward(0.5, 0.6, "Steady", 3000)
+    agent.memory.add(EmotionalRecord(label="Future", intensity=0.8, timestamp=agent.clock.now() + 3600 * 24 * 30))
+    agent.step_many(make_events(9, 40))
+    agent.clock.current -= 3600 * 24 * 400  # Backward jump: recent records are now in the future
+    agent.step_many([(0.0, 1.0, "Hell")] * 5)
+    agent._paused = True  # As left by a step where should_continue() failed
+    assert agent.steps_skipped > 0
+
+    save_agent(agent, path)
+    restored = load_agent(path)
+    assert restored._paused == agent._paused and restored.steps_skipped == agent.steps_skipped
+    assert restored.memory.summary() == agent.memory.summary()
+    for event in make_events(10, 200):
+        agent.step(*event)
+        restored.step(*event)
+        assert asdict(restored.state) == asdict(agent.state)
+        assert restored.memory.summary() == agent.memory.summary()
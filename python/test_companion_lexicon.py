@@ -0,0 +1,37 @@
+import random
+
+from companion_lexicon import COMPANION_LEXICON, Lexicon
+from grok_companion_mika_breath_en import ResilientAgent
+
+
+def naive_counts(lexicon, text):
+    """The per-list substring scans the lexicon replaces"""
+    return {name: sum(1 for t in terms if t in text.lower()) for name, terms in lexicon.categories.items()}
+
+
+def test_single_pass_matches_per_term_scans():
+    lexicon = Lexicon({"a": ["ok", "okay", "kay", "so good"], "b": ["good", "oka", "Go"]})
+    rng = random.Random(2)
+    alphabet = ["ok", "ay", "k", "so ", "good", "GO", "x", " "]
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randrange(12))) for _ in range(500)]
+
+    singles = [lexicon.scan(t) for t in texts]
+    assert singles == [naive_counts(lexicon, t) for t in texts]
+    assert lexicon.scan_many(texts) == singles
+
+
+def test_companion_batch_update_matches_one_by_one(tmp_path):
+    messages = ["Are you still here?", "It is so noisy and I am tired", "Quiet night, feeling good",
+                "I hate this, sad and lonely", "thank you, that was fun"] * 30
+    one = ResilientAgent(memory_cap=20, journal_path=str(tmp_path / "one.json"))
+    batch = ResilientAgent(memory_cap=20, journal_path=str(tmp_path / "batch.json"))
+    for text in messages:
+        one.update_emotion(text)
+    batch.update_emotions(messages)
+
+    assert batch.emotion_params == one.emotion_params
+    assert batch.stress_level == one.stress_level
+    assert COMPANION_LEXICON.scan("Are you STILL HERE?")["presence"] == 1
+    assert one.speak("hi").endswith("hi")
+    one.close()
+    batch.close()
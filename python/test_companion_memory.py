@@ -0,0 +1,82 @@
+import json
+import math
+import os
+import random
+from datetime import datetime
+
+from companion_memory import FadedJournal, ForgettingHeap
+from grok_companion_mika_breath_en import ResilientAgent
+
+
+def list_forgetting(memory, cap, faded):
+    """The original sort-and-pop-front forgetting step, kept as a reference"""
+    if len(memory) > cap:
+        memory.sort(key=lambda x: x['weight'])
+        oldest = memory.pop(0)
+        fade_speed = 1.6 if oldest['sentiment'] < 0 else 0.6
+        oldest['weight'] *= math.exp(-0.3 * fade_speed)
+        if oldest['weight'] <= 0.05:
+            faded.append(oldest['text'])
+        else:
+            memory.append(oldest)
+
+
+class ListJournal:
+    def __init__(self):
+        self.texts = []
+
+    def write(self, entry):
+        self.texts.append(entry['text'])
+
+
+def test_heap_forgets_like_the_sorted_list():
+    rng = random.Random(8)
+    reference, reference_faded = [], []
+    heap, journal = ForgettingHeap(), ListJournal()
+    for i in range(3000):
+        memory = {"text": f"m{i}", "sentiment": rng.choice([-0.5, 0.0, 0.4]), "weight": 1.0}
+        reference.append(dict(memory))
+        list_forgetting(reference, 20, reference_faded)
+        heap.append(memory)
+        if len(heap) > 20:
+            heap.fade_weakest(journal)
+
+    assert journal.texts == reference_faded
+    assert sorted(m['text'] for m in heap) == sorted(m['text'] for m in reference)
+
+
+def test_journal_buffers_until_batch_or_close(tmp_path):
+    path = str(tmp_path / "faded.json")
+    journal = FadedJournal(path, flush_every=4, flush_interval=3600)
+    for i in range(6):
+        journal.write({"text": f"m{i}"})
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4, "First batch should be on disk, the rest buffered"
+    journal.close()
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["text"] for line in f] == [f"m{i}" for i in range(6)]
+
+
+def test_journal_flushes_on_poll_after_the_interval(tmp_path):
+    path = str(tmp_path / "faded.json")
+    now = [0.0]
+    journal = FadedJournal(path, flush_every=100, flush_interval=5.0, clock=lambda: now[0])
+    journal.write({"text": "m0"})
+    journal.poll()
+    assert not os.path.exists(path)
+    now[0] = 6.0
+    journal.poll()
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["text"] for line in f] == ["m0"]
+
+
+def test_agent_stamps_faded_memories_with_its_clock(tmp_path):
+    path = str(tmp_path / "faded.json")
+    moment = datetime(2030, 1, 2, 3, 4, 5)
+    agent = ResilientAgent(memory_cap=2, journal_path=path, clock=lambda: moment)
+    for i in range(40):
+        agent.update_emotion("I feel sad and tired")
+    agent.close()
+    with open(path, encoding="utf-8") as f:
+        faded = [json.loads(line) for line in f]
+    assert faded and all(entry["faded_at"] == moment.isoformat() for entry in faded)
@@ -0,0 +1,54 @@
+import json
+import os
+import random
+
+from companion_replay import iter_transcript, replay_many, replay_transcript
+from grok_companion_mika_breath_en import ResilientAgent
+from metrics_sink import read_metrics
+
+PHRASES = ["are you still here?", "so noisy and busy today", "quiet and cozy evening", "I feel sad and tired",
+           "that was fun, thank you", "nothing special", "I hate being lonely", "good night"]
+
+
+def write_transcript(path, seed, n):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            role = "assistant" if i % 5 == 4 else "user"
+            f.write(json.dumps({"role": role, "text": rng.choice(PHRASES), "timestamp": f"2025-01-01T00:{i % 60:02d}:00"}) + "\n")
+
+
+def test_parallel_replay_matches_direct_loop(tmp_path):
+    paths = []
+    for seed in range(3):
+        path = str(tmp_path / f"chat{seed}.jsonl")
+        write_transcript(path, seed, 700)
+        paths.append(path)
+
+    results = replay_many(paths, str(tmp_path / "out"), workers=2)
+    assert [count for _, count in results] == [560, 560, 560]
+
+    agent = ResilientAgent(memory_cap=100, journal_path=os.devnull)
+    expected = []
+    for text, timestamp in iter_transcript(paths[1]):
+        agent.update_emotion(text, timestamp=timestamp)
+        agent.speak()
+        expected.append((agent.emotion_params['pitch'], agent.emotion_params['warmth'], agent.stress_level))
+    df = read_metrics(str(tmp_path / "out" / "chat1"))
+    assert list(zip(df['pitch'], df['warmth'], df['stress_level'])) == expected
+    assert list(df['message']) == list(range(560))
+
+
+def test_replay_injects_transcript_timestamps(tmp_path):
+    path = str(tmp_path / "chat.jsonl")
+    write_transcript(path, 9, 20)
+    seen = []
+
+    def factory():
+        agent = ResilientAgent(journal_path=os.devnull)
+        seen.append(agent)
+        return agent
+
+    assert replay_transcript(path, str(tmp_path / "chat.csv"), agent_factory=factory) == 16
+    stamps = sorted(m["timestamp"] for m in seen[0].memory)
+    assert stamps == sorted(ts for _, ts in iter_transcript(path))
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from agent import MemoryLog
+from fuzz_agent import (INVARIANTS, MEMORY_KINDS, OBSERVED, ZOMBIE_ESCAPE_STEPS, check, fuzz, make_trajectory,
+                        replay, replay_batch, shrink, trajectory_seed)
+
+
+def _observed(steps=50):
+    rows = np.tile([0.5, 0.5, 0.5, 0.5, 0.1, 0.1, 0, 0, 10, 0.4, 0], (steps, 1))
+    assert rows.shape[1] == len(OBSERVED)
+    return rows.astype(float)
+
+
+def test_check_reports_first_violation_of_each_invariant():
+    assert check(_observed()) == {}
+
+    broken = _observed()
+    broken[7, 0] = np.nan
+    broken[9, 3] = 1.5
+    broken[11, 8] = 101
+    broken[12, 9] = np.inf
+    broken[13, 6] = 11
+    broken[20:20 + ZOMBIE_ESCAPE_STEPS + 1, 7] = 1
+    broken[-1, 10] = 1
+    assert check(broken) == {
+        'no_exception': 49, 'state_in_range': 7, 'memory_bounded': 11, 'records_valid': 12,
+        'no_recovery_addiction': 13, 'zombie_escape': 20 + ZOMBIE_ESCAPE_STEPS,
+    }
+
+    escaped = _observed()
+    escaped[5:5 + ZOMBIE_ESCAPE_STEPS, 7] = 1  # The longest tolerated zombie run
+    assert check(escaped) == {}
+
+
+def test_trajectories_are_reproducible_and_adversarial():
+    seed = trajectory_seed(0, 5)
+    assert seed == trajectory_seed(0, 5) != trajectory_seed(0, 6)
+    trajectory = make_trajectory(seed, 5000, adversarial=0.2)
+    assert np.array_equal(trajectory, make_trajectory(seed, 5000, adversarial=0.2), equal_nan=True)
+    assert np.isnan(trajectory[:, :2]).any() and np.isinf(trajectory[:, :2]).any()
+    assert (trajectory[:, :2] < 0).any()
+    assert (trajectory[:, 2] < 0).any(), "No backward clock jump (future-stamped records)"
+
+
+def test_clean_inputs_hold_every_invariant_across_a_pool():
+    report = fuzz(40, length=150, adversarial=0.0, workers=2, batch=8)
+    assert report['trajectories'] == 40 and report['steps'] == 6000
+    assert report['counts'] == dict.fromkeys(INVARIANTS, 0)
+    assert report['batch_fallbacks'] == 0
+    assert report['failures'] == []
+
+
+def test_batch_fallback_is_counted_and_other_errors_propagate(monkeypatch):
+    import fuzz_agent
+
+    def overflowing(trajectories):
+        raise OverflowError("cannot convert float infinity to integer")
+
+    monkeypatch.setattr(fuzz_agent, "replay_batch", overflowing)
+    report = fuzz(12, length=50, adversarial=0.0, workers=1, batch=4)
+    assert report['batch_fallbacks'] == 3
+    assert report['counts'] == dict.fromkeys(INVARIANTS, 0)
+
+    def broken(trajectories):
+        raise KeyError("bug in the vectorized replay")
+
+    monkeypatch.setattr(fuzz_agent, "replay_batch", broken)
+    with pytest.raises(KeyError):
+        fuzz(4, length=50, adversarial=0.0, workers=1, batch=4)
+
+
+class _UnguardedLog(MemoryLog):
+    """MemoryLog without the intensity guard (the bug the fuzzer first found), summing the window in floats"""
+
+    def add(self, record):
+        self.records.append(record)
+        self._window.append(record.intensity)
+
+    @property
+    def window_sum(self):
+        return sum(self._window)
+
+
+def test_failing_trace_shrinks_to_minimal_reproduction(monkeypatch):
+    monkeypatch.setitem(MEMORY_KINDS, 'unguarded', _UnguardedLog)
+    trajectory = make_trajectory(trajectory_seed(1, 0), 120, adversarial=0.0)
+    trajectory[37, 1] = np.inf  # Unbounded intensity overflows the memory window mean
+    assert check(replay(trajectory, 'unguarded')) == {'records_valid': 37}
+
+    trace = shrink(trajectory, 'records_valid', 'unguarded')
+    assert trace.tolist() == [[0.5, np.inf, 3600.0]]
+    assert 'records_valid' in check(replay(trace, 'unguarded'))
+
+
+@pytest.mark.parametrize("memory", sorted(MEMORY_KINDS))
+def test_found_failures_stay_fixed(memory):
+    """Regression: inf/huge intensities and a two-year backward clock jump hold every invariant"""
+    trajectory = make_trajectory(trajectory_seed(1, 0), 120, adversarial=0.0)
+    trajectory[37, 1] = np.inf
+    trajectory[40:43, 1] = 1e308
+    trajectory[60, 2] = -2 * 365.25 * 24 * 3600
+    assert check(replay(trajectory, memory)) == {}
+
+
+def test_batch_replay_matches_scalar_replay():
+    trajectories = np.stack([make_trajectory(trajectory_seed(2, i), 150, adversarial=0.2) for i in range(32)])
+    batch = replay_batch(trajectories)
+    for trajectory, rows in zip(trajectories, batch):
+        assert np.array_equal(rows, replay(trajectory), equal_nan=True)
+    for trajectory in trajectories[:4]:  # A one-member population sums contiguous rows
+        assert np.array_equal(replay_batch(trajectory[None])[0], replay(trajectory), equal_nan=True)
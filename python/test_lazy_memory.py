@@ -0,0 +1,92 @@
+import math
+import time
+import random
+import pytest
+from agent import Agent, EmotionalRecord, SimulatedClock
+from lazy_memory import LazyMemoryLog, relevance_at
+
+
+def shame_by_scan(log, now):
+    """Reference aggregate: full scan with relevance evaluated from the timestamp"""
+    return sum(r.intensity * relevance_at(1.0, r.timestamp, now) for r in log.records if r.provisional)
+
+
+def test_decay_independent_of_reflect_frequency():
+    start = 1_000_000.0
+    sparse, dense = LazyMemoryLog(), LazyMemoryLog()
+    for log in (sparse, dense):
+        log.add(EmotionalRecord(label="Shame", intensity=0.9, timestamp=start))
+
+    for h in range(1, 25):
+        dense.reflect(start + 3600 * h)
+    shame_dense, _ = dense.reflect(start + 3600 * 24)
+    shame_sparse, _ = sparse.reflect(start + 3600 * 24)
+
+    assert shame_sparse == pytest.approx(shame_dense, rel=1e-12)
+    assert shame_sparse == pytest.approx(0.9 * 0.95 ** 24, rel=1e-12)
+    assert dense.records[0].relevance == pytest.approx(0.95 ** 24, rel=1e-12)
+
+
+def test_incremental_aggregate_matches_scan():
+    rng = random.Random(5)
+    now = 1_000_000.0
+    log = LazyMemoryLog()
+    for step in range(2000):
+        now += 3600 * rng.uniform(0, 3)
+        log.add(EmotionalRecord(label="Shame", intensity=rng.uniform(0, 1),
+                                timestamp=now + 3600 * rng.uniform(-30, 5)))
+        shame, _ = log.reflect(now)
+        assert shame == pytest.approx(shame_by_scan(log, now), rel=1e-9, abs=1e-12)
+        assert len(log.records) == len(log) <= 100
+        assert all(r.relevance >= 0.05 for r in log.records if r.provisional)
+
+
+def test_expiry_schedule_forgets_faded_records():
+    now = time.time()
+    log = LazyMemoryLog()
+    for _ in range(200):
+        log.add(EmotionalRecord(label="Shame", intensity=0.4, context="past", timestamp=now - 3600 * 100))
+
+    shame, settled = log.reflect(now)
+    assert settled == 0, "Faded records must not be gently flowed"
+    assert len(log) == 0, "Records below 0.05 relevance were not forgotten"
+    assert shame >= 0.0
+
+
+def test_agent_with_lazy_memory_stays_in_range():
+    agent = Agent(memory=LazyMemoryLog())
+    agent.memory.add(EmotionalRecord(label="Future", intensity=0.5, timestamp=time.time() + 3600 * 24 * 365))
+    for _ in range(200):
+        agent.step(0.0, 1.0, "Confusion")
+
+    for attr in ['energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress']:
+        assert 0.0 <= getattr(agent.state, attr) <= 1.0
+    assert all(r.relevance >= 0 for r in agent.memory.records)
+
+
+def test_backward_clock_jump_rebases():
+    """A clock set back two years must not overflow the aggregate; newer records wait at full relevance"""
+    clock = SimulatedClock(current=1_000_000_000.0)
+    agent = Agent(memory=LazyMemoryLog(), clock=clock)
+    for _ in range(5):
+        agent.step(0.2, 0.9, "Shame")
+    clock.current -= 2 * 365.25 * 24 * 3600
+    for _ in range(5):
+        agent.step(0.2, 0.9, "Shame")
+
+    log = agent.memory
+    shame, _ = log.reflect(clock.now())
+    assert math.isfinite(shame)
+    assert shame == pytest.approx(shame_by_scan(log, clock.now()), rel=1e-9)
+
+
+def test_heaps_stay_bounded():
+    """Evicted records must not pile up in the expiry heap between expiries"""
+    log = LazyMemoryLog(maxlen=50)
+    now = 1_000_000.0
+    for i in range(5000):
+        now += 1.0  # Far faster than anything expires
+        log.add(EmotionalRecord(label="Shame", intensity=0.9, timestamp=now + (3600 if i % 2 else 0)))
+        log.reflect(now)
+        assert len(log._expiry) <= 2 * 50 + 1
+        assert len(log._maturity) <= 2 * 50 + 1
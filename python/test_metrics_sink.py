@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from metrics_sink import NpyChunkSink, _BufferedSink, open_sink, read_metrics
+from long_simulation import run_long_simulation
+
+ROWS = [(i, i / 10, 0.5, 0.25, 1.0, 0.0) for i in range(1, 26)]
+
+
+@pytest.mark.parametrize("name", ["metrics.csv", "metrics_npy"])
+def test_sink_roundtrip_is_append_only(tmp_path, name):
+    path = str(tmp_path / name)
+    with open_sink(path, chunk_rows=8) as sink:
+        for row in ROWS[:20]:
+            sink.write(row)
+    # A second writer appends instead of truncating
+    with open_sink(path, chunk_rows=8) as sink:
+        for row in ROWS[20:]:
+            sink.write(row)
+
+    df = read_metrics(path)
+    assert list(df['step']) == [r[0] for r in ROWS]
+    assert np.allclose(df.to_numpy(), np.array(ROWS))
+
+
+def test_parquet_sink_refuses_to_overwrite(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "metrics.parquet")
+    with open_sink(path) as sink:
+        sink.write_many(ROWS)
+    with pytest.raises(FileExistsError):
+        open_sink(path)
+    assert len(read_metrics(path)) == len(ROWS)
+
+
+def test_sink_memory_is_bounded(tmp_path):
+    sink = NpyChunkSink(str(tmp_path / "chunks"), chunk_rows=16)
+    for i in range(1000):
+        sink.write(ROWS[i % len(ROWS)])
+        assert sink._rows < 16
+    sink.close()
+    assert sink.rows_written == 1000
+
+
+def test_headless_long_simulation_streams_samples(tmp_path):
+    path = str(tmp_path / "soak.csv")
+    assert run_long_simulation(steps=5000, sample_every=500, metrics_path=path, plot=False) is None
+
+    df = read_metrics(path)
+    assert list(df['step']) == list(range(500, 5001, 500))
+    assert ((df.drop(columns='step') >= 0) & (df.drop(columns='step') <= 2)).all().all()
+
+
+def test_buffered_sink_requires_a_chunk_writer(tmp_path):
+    with pytest.raises(TypeError):
+        _BufferedSink(str(tmp_path / "metrics"))
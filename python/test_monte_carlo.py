@@ -0,0 +1,24 @@
+import numpy as np
+from agent import AgentState
+from monte_carlo import SUMMARY_DTYPE, collapse_rate, run_sweep, zombie_rate
+
+
+def test_sweep_is_reproducible_across_worker_counts():
+    starts = [AgentState(), AgentState(energy=0.2, learning_pace=0.1)]
+    inline = run_sweep(n_seeds=3, initial_states=starts, steps=300, workers=1)
+    pooled = run_sweep(n_seeds=3, initial_states=starts, steps=300, workers=2)
+
+    assert inline.dtype == SUMMARY_DTYPE
+    assert len(inline) == 6
+    assert np.array_equal(inline, pooled), "Results depend on the worker layout"
+    assert len(set(inline['seed'].tolist())) == 6, "Trajectories share an RNG stream"
+
+
+def test_sweep_summary_invariants():
+    summary = run_sweep(n_seeds=4, steps=500, root_seed=1, workers=1)
+
+    for name in ['final_energy', 'final_resilience', 'final_learning_pace', 'final_motivation', 'min_energy']:
+        assert np.all((summary[name] >= 0.0) & (summary[name] <= 1.0)), name
+    assert np.all(summary['zombie_steps'] <= 500)
+    assert 0.0 <= collapse_rate(summary) <= 1.0
+    assert 0.0 <= zombie_rate(summary) <= 1.0
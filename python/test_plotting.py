@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from metrics_sink import open_sink
+from plotting import StreamDownsampler, downsample, lttb, minmax_indices, plot_downsampled
+
+
+def _series(n=100003, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    y[31337] = 1e3  # A one-sample spike must survive downsampling
+    return x, y
+
+
+def test_minmax_and_lttb_keep_extremes_within_budget():
+    x, y = _series()
+    idx = minmax_indices(y, 250)
+    assert len(idx) <= 500 and np.all(np.diff(idx) > 0)
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+    idx = lttb(x, y, 400)
+    assert len(idx) == 400 and idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 31337 in idx
+
+    short = np.arange(10.0)
+    assert np.array_equal(downsample(short, short, 100, 'lttb')[1], short)
+    with pytest.raises(ValueError):
+        downsample(short, short, 100, 'every_nth')
+
+
+@pytest.mark.parametrize("block", [13, 977, 100003])
+def test_stream_downsampler_is_bounded_and_exact_on_extremes(block):
+    x, y = _series()
+    z = np.sin(x / 500)
+    sampler = StreamDownsampler(('step', 'y', 'z'), max_points=300)
+    rows = np.column_stack((x, y, z))
+    for start in range(0, len(rows), block):
+        sampler.add(rows[start:start + block])
+
+    assert sampler.rows == len(rows)
+    assert len(sampler._buckets[0]) <= 301
+    for column, values in (('y', y), ('z', z)):
+        px, py = sampler.points(column)
+        assert len(px) <= 300
+        assert np.all(np.diff(px) > 0)
+        assert py.max() == values.max() and py.min() == values.min()
+        assert np.array_equal(values[px.astype(int)], py), "Points must be real samples"
+
+
+def test_plot_from_streamed_file_headless(tmp_path):
+    path = str(tmp_path / "metrics.csv")
+    x, y = _series(50000)
+    with open_sink(path, ('step', 'energy'), chunk_rows=4096) as sink:
+        sink.write_many(np.column_stack((x, y)))
+
+    out = tmp_path / "plot.png"
+    plot = plot_downsampled(path, ('energy',), max_points=500, save_to=str(out), show=False, chunk_rows=7000)
+    assert out.stat().st_size > 0
+    assert plot.sampler.rows == 50000
+    drawn_x, drawn_y = plot.lines['energy'].get_data()
+    assert len(drawn_x) <= 500 and max(drawn_y) == y.max()
+
+
+def test_headless_plot_leaves_the_global_backend_alone(tmp_path):
+    import matplotlib
+    backend = matplotlib.get_backend()
+    plot = plot_downsampled({'step': [1, 2, 3], 'energy': [0.1, 0.5, 0.2]}, ('energy',),
+                            save_to=str(tmp_path / "plot.png"), show=False)
+    assert matplotlib.get_backend() == backend
+    assert plot._plt is None and plot.fig.canvas.get_default_filetype() == 'png'
@@ -0,0 +1,103 @@
+import time
+import random
+import numpy as np
+from agent import Agent, AgentState
+from population import AgentPopulation, TRIGGER_NAMES
+
+FIELDS = ['energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress',
+          'zombie_flag', 'zombie_flag_count', 'recover_count', 'adversarial_env']
+
+
+def make_agents(n, rng):
+    """Agents with varied starting states (including out-of-range and NaN values)"""
+    agents = []
+    for _ in range(n):
+        state = AgentState(
+            energy=rng.uniform(-0.2, 1.2),
+            resilience=rng.uniform(0.0, 1.0),
+            learning_pace=rng.uniform(0.0, 0.6),
+            motivation=rng.choice([rng.uniform(0.0, 1.0), float('nan')]),
+            env_stress=rng.uniform(0.0, 0.6),
+            self_stress=rng.uniform(0.0, 0.6),
+        )
+        agents.append(Agent(state=state))
+    return agents
+
+
+def run_differential(monkeypatch, steps, hours_per_step, n=48, seed=7):
+    rng = random.Random(seed)
+    agents = make_agents(n, rng)
+    pop = AgentPopulation.from_agents(agents)
+
+    clock = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+
+    for _ in range(steps):
+        # Per-agent input profiles: some calm (zombie-prone), some adversarial, some out of range
+        quality = np.array([rng.uniform(-0.2, 1.2) for _ in range(n)])
+        intensity = np.array([rng.uniform(-0.1, 0.6) if j % 3 else rng.uniform(0.0, 0.15) for j in range(n)])
+        for j, a in enumerate(agents):
+            a.step(quality[j], intensity[j], "Test")
+        pop.step(quality, intensity, now=clock[0])
+        clock[0] += hours_per_step * 3600
+    return agents, pop
+
+
+def test_population_matches_scalar_agent_exactly(monkeypatch):
+    """Differential test: with a frozen clock the vectorized pipeline is bit-identical to Agent.step"""
+    agents, pop = run_differential(monkeypatch, steps=300, hours_per_step=0.0)
+
+    for j, a in enumerate(agents):
+        assert pop.state_of(j) == a.state, f"agent {j} diverged"
+        assert pop.mem_count[j] == len(a.memory.records)
+        records = list(a.memory.records)
+        assert list(pop.mem_intensity[:len(records), j]) == [r.intensity for r in records]
+        assert list(pop.mem_provisional[:len(records), j]) == [r.provisional for r in records]
+
+
+def test_population_matches_scalar_agent_with_decay(monkeypatch):
+    """Differential test with time passing: forgetting removes the same records as the scalar loop"""
+    agents, pop = run_differential(monkeypatch, steps=300, hours_per_step=5.0)
+
+    for j, a in enumerate(agents):
+        assert pop.state_of(j) == a.state, f"agent {j} diverged"
+        records = list(a.memory.records)
+        assert pop.mem_count[j] == len(records)
+        assert list(pop.mem_relevance[:len(records), j]) == [r.relevance for r in records]
+        assert list(pop.mem_timestamp[:len(records), j]) == [r.timestamp for r in records]
+
+
+def test_population_recent_outcome_matches_scalar_on_grid_inputs(monkeypatch):
+    """Intensities on a 0.1 grid are where a drifting window sum would first show up"""
+    rng = random.Random(3)
+    n = 32
+    agents = [Agent() for _ in range(n)]
+    pop = AgentPopulation.from_agents(agents)
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0)
+
+    for _ in range(200):
+        quality = np.array([rng.randrange(11) / 10 for _ in range(n)])
+        intensity = np.array([rng.randrange(8) / 10 for _ in range(n)])
+        for j, a in enumerate(agents):
+            a.step(quality[j], intensity[j], "Test")
+        pop.step(quality, intensity, now=1_000_000.0)
+
+        outcome = pop.recent_outcome()
+        assert [a.memory.window_mean for a in agents] == outcome.tolist()
+    for j, a in enumerate(agents):
+        assert pop.state_of(j) == a.state, f"agent {j} diverged"
+
+
+def test_population_trigger_and_invariants():
+    pop = AgentPopulation(1000)
+    rng = np.random.default_rng(0)
+    for step in range(200):
+        pop.step(rng.uniform(-1, 2, 1000), rng.uniform(-1, 2, 1000))
+        if step % 20 == 0:
+            triggers = [TRIGGER_NAMES[code] for code in pop.detect_recovery_trigger()]
+            assert triggers == [Agent(state=pop.state_of(j)).detect_recovery_trigger() for j in range(1000)]
+
+    for attr in FIELDS[:6]:
+        values = getattr(pop, attr)
+        assert np.all((values >= 0.0) & (values <= 1.0)), f"{attr} out of range"
+    assert np.all(pop.mem_count <= 100), "Memory limit not enforced"
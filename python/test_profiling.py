@@ -0,0 +1,39 @@
+import json
+from agent import Agent, SimulatedClock
+from profiling import PHASES, StepProfiler
+
+
+def run(agent, n=300):
+    for i in range(n):
+        agent.step((i * 37 % 100) / 100, (i * 53 % 100) / 100, "Profile")
+
+
+def test_profiler_counts_phases_without_changing_results():
+    plain = Agent(clock=SimulatedClock(seconds_per_step=7200))
+    profiled = Agent(clock=SimulatedClock(seconds_per_step=7200))
+    profiler = StepProfiler().attach(profiled)
+    run(plain)
+    run(profiled)
+
+    assert profiled.state == plain.state
+    snap = profiler.snapshot()
+    for name in PHASES + ('step',):
+        assert snap['phases'][name]['calls'] == 300, name
+        assert snap['phases'][name]['total_ns'] > 0, name
+    reflect = snap['phases']['reflect_black_history']
+    assert reflect['records_scanned'] >= reflect['records_removed'] > 0, "Simulated hours should forget records"
+    assert sum(row['calls'] for row in snap['reflect_by_memory_size'].values()) == 300
+    json.dumps(snap)
+
+
+def test_detach_restores_plain_methods():
+    agent = Agent(clock=SimulatedClock())
+    profiler = StepProfiler().attach(agent)
+    run(agent, 10)
+    profiler.detach(agent)
+    run(agent, 10)
+
+    assert profiler.phases['step'].calls == 10
+    assert not set(PHASES) & set(vars(agent)), "Wrappers left on the instance"
+    profiler.reset()
+    assert profiler.snapshot()['phases']['perceive']['calls'] == 0
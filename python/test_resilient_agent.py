@@ -1,7 +1,11 @@
 import time
 import pytest
 import math
-from agent import Agent, EmotionalRecord  # Import from agent.py in the same folder
+from collections import deque
+from agent import Agent, EmotionalRecord, EventBatcher, MemoryLog, SimulatedClock  # Import from agent.py in the same folder
+from ring_memory import RingMemoryLog
+from lazy_memory import LazyMemoryLog
+from long_simulation import run_long_simulation
 
 @pytest.fixture
 def agent():
@@ -133,3 +137,141 @@ def test_future_timestamp(agent):
     agent.reflect_black_history()
 
     assert all(r.relevance >= 0 for r in agent.memory.records), "Negative relevance from future timestamp"
+
+@pytest.mark.parametrize("memory_factory", [MemoryLog, RingMemoryLog, LazyMemoryLog])
+def test_recent_window_tracks_memory(memory_factory):
+    """Window mean must stay equal to the correctly rounded recent(10) average across eviction and forgetting"""
+    memory = memory_factory()
+    now = time.time()
+    for i in range(250):
+        memory.add(
+            EmotionalRecord(
+                label="Shame",
+                intensity=(i % 7) / 7 if i % 13 else -0.3,
+                context="past",
+                provisional=True,
+                timestamp=now - 3600 * (i % 90)
+            )
+        )
+        if i % 17 == 0:
+            memory.reflect(now)
+
+        recent = [r.intensity for r in memory.recent(10)]
+        assert memory.window_count == len(recent)
+        assert memory.window_mean == math.fsum(recent) / max(len(recent), 1)
+
+
+@pytest.mark.parametrize("memory_factory", [lambda: MemoryLog(records=deque(maxlen=0)),
+                                            lambda: RingMemoryLog(maxlen=0), lambda: LazyMemoryLog(maxlen=0)])
+def test_empty_memory_has_an_empty_window(memory_factory):
+    """maxlen=0 stores nothing, so the window must not report the dropped records"""
+    memory = memory_factory()
+    memory.add(EmotionalRecord(label="Shame", intensity=0.9, context="past"))
+    assert len(memory.records) == 0
+    assert (memory.window_count, memory.window_mean) == (0, 0.0)
+
+
+@pytest.mark.parametrize("memory_factory", [MemoryLog, RingMemoryLog, LazyMemoryLog])
+def test_window_mean_is_exact(memory_factory):
+    """Grid intensities must average to exactly 0.3 (a float running sum drifts to 0.29999999999999993)"""
+    memory = memory_factory()
+    for x in [0.0, 0.7, 0.5, 0.4, 0.4, 0.7, 0.6, 0.2, 0.0, 0.7, 0.4, 0.3, 0.6, 0.1, 0.5, 0.1, 0.1]:
+        memory.add(EmotionalRecord(label="Shame", intensity=x, context="past", provisional=False))
+    assert memory.window_mean == 0.3
+
+def test_step_many_matches_step(monkeypatch):
+    """Batched replay must give the same state as stepping one event at a time"""
+    monkeypatch.setattr(time, "time", lambda: 1_000_000.0)
+    events = [((i * 37 % 100) / 80 - 0.1, (i * 53 % 100) / 90, "Replay") for i in range(300)]
+
+    one_by_one, batched, columns = Agent(), Agent(), Agent()
+    for event in events:
+        one_by_one.step(*event)
+    assert batched.step_many(events) == 300
+    qualities, intensities, _ = zip(*events)
+    columns.step_many(list(qualities), list(intensities), "Replay")
+
+    assert batched.state == one_by_one.state
+    assert columns.state == one_by_one.state
+    assert len(batched.memory.records) == len(one_by_one.memory.records)
+
+
+def test_step_stream_snapshots(agent):
+    events = ((0.5, 0.2, "Stream") for _ in range(25))
+    snapshots = list(agent.step_stream(events, stride=10))
+
+    assert [n for n, _ in snapshots] == [10, 20, 25]
+    assert snapshots[-1][1] == agent.state
+    assert snapshots[0][1] is not agent.state, "Snapshots must be copies"
+
+def test_simulated_clock_ages_memory(monkeypatch):
+    """With a virtual clock, memories fade over simulated hours and the real clock is never read"""
+    agent = Agent(clock=SimulatedClock(seconds_per_step=3600))
+
+    def no_wall_clock():
+        raise AssertionError("Hot path touched the real clock")
+    monkeypatch.setattr(time, "time", no_wall_clock)
+
+    for _ in range(200):
+        agent.step(input_quality=0.5, emotional_intensity=0.9, label="Shame")
+
+    assert agent.clock.now() == 200 * 3600
+    assert len(agent.memory.records) < 100, "Simulated decades did not trigger forgetting"
+    assert all(r.timestamp <= agent.clock.now() for r in agent.memory.records)
+
+def test_transition_events(capsys):
+    """Transitions reach subscribers in batches, in clock order, and nothing is printed"""
+    agent = Agent(clock=SimulatedClock())
+    agent.state.resilience = 0.9
+    agent.state.learning_pace = 0.1
+    batches = []
+    batcher = agent.subscribe(EventBatcher(batches.append, batch_size=8))
+
+    for i in range(60):
+        agent.step(0.0 if i < 40 else 1.0, 0.1 if i < 40 else 0.9, "Events")
+    agent.state.recover_count = 15
+    agent.step_many([])
+    agent.state.recover_count = 0
+    agent.step_many([])
+    batcher.flush()
+
+    events = [e for batch in batches for e in batch]
+    kinds = [e.kind for e in events]
+    assert all(len(batch) == 8 for batch in batches[:-1])
+    assert {"recovery", "zombie_raised", "zombie_cleared", "force_pause", "force_reboot"} <= set(kinds)
+    assert kinds[-2:] == ["paused", "resumed"]
+    assert kinds.count("zombie_raised") - kinds.count("zombie_cleared") in (0, 1)
+    assert [e.timestamp for e in events] == sorted(e.timestamp for e in events)
+    assert capsys.readouterr().out == ""
+
+    agent.unsubscribe(batcher)
+    agent.step(0.5, 0.5, "Quiet")
+    batcher.flush()
+    assert sum(map(len, batches)) == len(events)
+
+@pytest.mark.parametrize("memory_factory", [MemoryLog, RingMemoryLog, LazyMemoryLog])
+@pytest.mark.parametrize("inputs", [(0.5, 0.6), (0.9, 0.1), (0.5, 0.29)])
+def test_fast_forward_matches_stepping(memory_factory, inputs):
+    """Once the state settles, fast_forward skips most steps and lands where stepping does"""
+    stepped = Agent(memory=memory_factory(), clock=SimulatedClock())
+    for _ in range(5000):
+        stepped.step(*inputs, "Soak")
+
+    for verify_every in (None, 500):
+        skipping = Agent(memory=memory_factory(), clock=SimulatedClock())
+        skipped = skipping.fast_forward(*inputs, "Soak", 5000, verify_every=verify_every)
+
+        assert skipped > 4000
+        assert skipping.steps_skipped == skipped
+        assert skipping.clock.now() == pytest.approx(stepped.clock.now())
+        a, b = stepped.state, skipping.state
+        assert (a.zombie_flag, a.zombie_flag_count, a.recover_count) == (b.zombie_flag, b.zombie_flag_count, b.recover_count)
+        for name in ("energy", "resilience", "learning_pace", "motivation", "env_stress", "self_stress"):
+            assert getattr(b, name) == pytest.approx(getattr(a, name), abs=1e-8), name
+        assert skipping.memory.summary()[0] == stepped.memory.summary()[0]
+
+
+def test_long_simulation_fast_forwards_constant_input():
+    df = run_long_simulation(steps=20000, sample_every=1000, plot=False, constant_input=(0.9, 0.1, "Soak"))
+    assert len(df) == 20
+    assert df.attrs['steps_skipped'] > 15000
@@ -0,0 +1,71 @@
+import time
+import random
+import numpy as np
+import pytest
+from agent import Agent, EmotionalRecord, MemoryLog
+from ring_memory import RingMemoryLog
+
+
+def test_ring_eviction_keeps_newest_in_order():
+    ring = RingMemoryLog(maxlen=100)
+    for i in range(1000):
+        ring.add(EmotionalRecord(label="Shame", intensity=float(i), context="past"))
+
+    assert len(ring) == 100, "maxlen not enforced"
+    assert list(ring.recent_columns(100).intensity) == [float(i) for i in range(900, 1000)]
+    assert [r.label for r in ring.recent(3)] == ["Shame"] * 3
+    assert all(isinstance(r, EmotionalRecord) for r in ring.recent(3))
+
+
+def test_recent_columns_is_zero_copy_view():
+    ring = RingMemoryLog()
+    for i in range(30):
+        ring.add(EmotionalRecord(label="Interest", intensity=0.1 * i))
+
+    view = ring.recent_columns(10)
+    assert len(view) == 10
+    assert np.shares_memory(view.intensity, ring._intensity), "recent_columns() copied the data"
+
+
+def test_label_tables_are_per_log():
+    first, second = RingMemoryLog(), RingMemoryLog()
+    first.add(EmotionalRecord(label="Relief", intensity=0.5, context="chat"))
+    second.add(EmotionalRecord(label="Shame", intensity=0.5, context="chat"))
+
+    assert first._names == ["Relief", "chat"] and second._names == ["Shame", "chat"]
+    assert [(r.label, r.context) for r in second.recent()] == [("Shame", "chat")]
+
+
+def test_ring_reflect_matches_memory_log():
+    """Vectorized reflect forgets and flows the same records as the deque loop"""
+    now = time.time()
+    rng = random.Random(3)
+    log, ring = MemoryLog(), RingMemoryLog()
+    for _ in range(150):
+        r = dict(label="Shame", intensity=rng.uniform(-0.2, 1.0), context="past",
+                 timestamp=now - 3600 * rng.uniform(-10, 80))
+        log.add(EmotionalRecord(**r))
+        ring.add(EmotionalRecord(**r))
+
+    shame_log, settled_log = log.reflect(now)
+    shame_ring, settled_ring = ring.reflect(now)
+
+    assert settled_ring == settled_log
+    assert shame_ring == pytest.approx(shame_log, rel=1e-12)
+    assert [r.intensity for r in ring.records] == [r.intensity for r in log.records]
+    assert [r.relevance for r in ring.records] == pytest.approx([r.relevance for r in log.records], rel=1e-12)
+    assert [r.provisional for r in ring.records] == [r.provisional for r in log.records]
+
+
+def test_ring_drop_in_for_agent():
+    rng = random.Random(11)
+    reference, columnar = Agent(), Agent(memory=RingMemoryLog())
+    for _ in range(300):
+        args = (rng.uniform(0, 1), rng.uniform(0, 1), rng.choice(["Relief", "Shame"]))
+        reference.step(*args)
+        columnar.step(*args)
+
+    for attr in ['energy', 'resilience', 'learning_pace', 'motivation', 'env_stress', 'self_stress']:
+        assert getattr(columnar.state, attr) == pytest.approx(getattr(reference.state, attr), abs=1e-9)
+    assert columnar.state.recover_count == reference.state.recover_count
+    assert len(columnar.memory) == len(reference.memory.records)
@@ -0,0 +1,91 @@
+import pytest
+
+from resilient_server import ResilientServer
+from server_events import SERVER_FIELDS, EventEngine
+from server_model import server_step
+
+
+def _schedule(engine):
+    engine.schedule_traffic(1, 0.7, 0.2)
+    engine.schedule_traffic(3000, 1.0, 0.0)
+    engine.schedule_traffic(3500, 0.6, 0.3)
+    for tick in (1200, 3700, 5000):
+        engine.schedule_failure(tick)
+    engine.sample_every(500, 8000)
+
+
+def _ticked(until):
+    """Reference: ResilientServer ticked once per step with the same schedule"""
+    server = ResilientServer(telemetry=None)
+    samples = []
+    for tick in range(1, until + 1):
+        if tick in (1200, 3700, 5000):
+            q, i = 0.0, 1.0
+        elif tick >= 3500:
+            q, i = 0.6, 0.3
+        elif tick >= 3000:
+            q, i = 1.0, 0.0
+        else:
+            q, i = 0.7, 0.2
+        server.step(q, i, "tick")
+        if tick % 500 == 0:
+            samples.append((tick, {name: getattr(server, name) for name in SERVER_FIELDS}))
+    return samples
+
+
+def test_exact_mode_matches_ticking():
+    engine = EventEngine()
+    _schedule(engine)
+    assert engine.run(8000) == _ticked(8000)
+    assert engine.ticks_computed + engine.ticks_skipped == 8000
+    assert engine.ticks_skipped > 0
+
+
+def test_tolerance_mode_skips_and_stays_close():
+    engine = EventEngine(tolerance=1e-12)
+    _schedule(engine)
+    samples = engine.run(8000)
+    assert engine.ticks_skipped > 1000
+    for (tick, state), (ref_tick, ref) in zip(samples, _ticked(8000)):
+        assert tick == ref_tick
+        assert state['fail_flag'] == ref['fail_flag']
+        assert abs(state['recover_count'] - ref['recover_count']) <= 1
+        for name in ('resource', 'load', 'capacity', 'redundancy', 'uptime'):
+            assert abs(state[name] - ref[name]) < 1e-9, (tick, name)
+
+
+def test_run_resumes_and_counts_events():
+    engine = EventEngine(traffic_quality=1.0, intensity=0.0)
+    engine.schedule_sample(10)
+    assert engine.run(5) == []
+    assert engine.tick == 5
+    samples = engine.run(10)
+    assert [tick for tick, _ in samples] == [10]
+    assert engine.events == 1
+
+
+def test_events_cannot_be_scheduled_in_the_past():
+    engine = EventEngine(traffic_quality=0.7, intensity=0.2)
+    engine.run(100)
+    for tick in (0, 50, 100):
+        with pytest.raises(ValueError):
+            engine.schedule_failure(tick)
+    engine.schedule_failure(101)
+    engine.schedule_sample(101)
+
+    reference = EventEngine(traffic_quality=0.7, intensity=0.2)
+    reference.run(100)
+    reference.state = server_step(reference.state, 0.0, 1.0)
+    assert engine.run(101) == [(101, reference.state_dict())]
+
+
+def test_simulator_step_is_the_shared_transition():
+    """ResilientServer.step and the event engine run the same server_step"""
+    server = ResilientServer(telemetry=None)
+    engine = EventEngine(server)
+    for tick in range(1, 301):
+        q, i = (0.0, 1.0) if tick % 50 == 0 else (0.3, 0.9)
+        server.step(q, i, "tick")
+        engine.schedule_traffic(tick, q, i)
+    engine.run(300)
+    assert engine.state == server.state
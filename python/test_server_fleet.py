@@ -0,0 +1,75 @@
+import numpy as np
+
+from resilient_server import ResilientServer
+from server_fleet import SERVER_FIELDS, ServerFleet, fleet_inputs, periodic_outage, rack_outage, run_fleet
+from server_model import FAIL_CAPACITY, FAIL_REDUNDANCY, HIGH_LOAD, MAX_RECOVERIES, server_step
+
+
+def test_fleet_matches_scalar_servers_node_for_node():
+    """Same per-node inputs (with partial outages) give bit-identical fields, including stopped nodes"""
+    size = 300
+    fleet = ServerFleet(size, racks=10)
+    servers = [ResilientServer() for _ in range(size)]
+    rng = np.random.default_rng(4)
+    schedule = periodic_outage(every=7, fraction=0.3)
+
+    for step in range(1, 400):
+        quality, intensity = fleet_inputs(fleet, step, schedule, rng)
+        active = fleet.should_continue()
+        fleet.step(quality, intensity, active)
+        for k, server in enumerate(servers):
+            if server.should_continue():
+                server.step(float(quality[k]), float(intensity[k]), "node")
+
+    for k in (0, 1, 77, 299):
+        assert fleet.server_state(k) == {name: getattr(servers[k], name) for name in SERVER_FIELDS}, k
+    for name in SERVER_FIELDS:
+        assert np.array_equal(getattr(fleet, name), [getattr(s, name) for s in servers]), name
+
+
+def test_fleet_matches_server_step_on_every_branch():
+    """One step from states around every threshold: high load, failure and recovery, clamps and stopped nodes"""
+    rng = np.random.default_rng(9)
+    size = 4000
+    edges = np.array([0.0, 0.01, 0.29, 0.3, 0.31, 0.39, 0.4, 0.41, 0.69, 0.7, 0.71, 0.99, 1.0])
+
+    def column():
+        return np.where(rng.random(size) < 0.5, rng.choice(edges, size), rng.random(size))
+
+    fleet = ServerFleet(size)
+    fleet.resource, fleet.load, fleet.capacity, fleet.redundancy, fleet.uptime = (column() for _ in range(5))
+    fleet.fail_flag = rng.random(size) < 0.5
+    fleet.recover_count = rng.integers(0, MAX_RECOVERIES + 2, size)
+    quality, intensity = column(), column()
+    before = [fleet.server_state(k) for k in range(size)]
+
+    fleet.step(quality, intensity, fleet.should_continue())
+
+    for k, state in enumerate(before):
+        expected = state
+        if state['recover_count'] < MAX_RECOVERIES:
+            values = server_step(tuple(state.values()), float(quality[k]), float(intensity[k]))
+            expected = dict(zip(SERVER_FIELDS, values))
+        assert fleet.server_state(k) == expected, k
+
+    load_in = np.array([s['load'] for s in before]) + (1 - quality) * intensity * 0.5
+    assert (load_in > HIGH_LOAD).any() and (load_in <= HIGH_LOAD).any()
+    assert fleet.fail_flag.any() and (~fleet.fail_flag).any()
+    assert ((fleet.capacity < FAIL_CAPACITY) & (fleet.redundancy >= FAIL_REDUNDANCY)).any()
+    assert (fleet.resource == 1.0).any() and (fleet.redundancy == 0.0).any() and (fleet.redundancy == 1.0).any()
+    assert (~fleet.should_continue()).any()
+
+
+def test_rack_outage_hits_whole_racks_and_reports_fleet_stats():
+    fleet = ServerFleet(100, racks=10)
+    rng = np.random.default_rng(0)
+    hit = rack_outage(every=5, racks_hit=2)(5, fleet, rng)
+    assert hit.sum() == 20
+    assert len(set(fleet.rack[hit].tolist())) == 2
+    assert not rack_outage(every=5)(4, fleet, rng).any()
+
+    df = run_fleet(fleet, 120, schedule=rack_outage(every=10, racks_hit=3), seed=1)
+    assert len(df) == 120
+    assert (df['recover_total'].diff().dropna() >= 0).all()
+    assert df['recover_total'].iloc[-1] == fleet.recover_count.sum()
+    assert df['stopped'].iloc[-1] == int((fleet.recover_count >= MAX_RECOVERIES).sum())
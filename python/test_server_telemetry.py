@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+import pytest
+
+from metrics_sink import read_metrics
+from resilient_server import ResilientServer, run_long_simulation
+from server_telemetry import SERVER_METRICS, TelemetryRecorder
+
+
+def run_server(server, steps, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for step in range(1, steps + 1):
+        if step % 50 == 0:
+            server.step(0.0, 1.0, "outage")
+        else:
+            server.step(rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), "normal")
+        rows.append([server.resource, server.load, server.capacity, server.redundancy,
+                     server.uptime, int(server.fail_flag), server.recover_count])
+    return np.array(rows)
+
+
+def test_ring_keeps_the_latest_steps():
+    server = ResilientServer(telemetry=TelemetryRecorder(capacity=500, block=64))
+    history = run_server(server, 5000)
+
+    recent = server.telemetry.recent()
+    assert list(recent['step']) == list(range(4500, 5000))
+    for j, name in enumerate(SERVER_METRICS):
+        assert np.array_equal(recent[name], history[-500:, j]), name
+    assert server.telemetry.last()['load'] == history[-1, 1]
+    assert len(server.recent_logs) == 500
+    assert server.recent_logs[-1]['recover_count'] == history[-1, 6]
+
+
+def test_downsampling_and_spill_cover_full_history(tmp_path):
+    spill = str(tmp_path / "telemetry.csv")
+    telemetry = TelemetryRecorder(capacity=100, levels=(7, 1000), level_history=2000, spill_path=spill, block=50)
+    history = run_server(ResilientServer(telemetry=telemetry), 3003)
+    telemetry.close()
+
+    buckets = telemetry.downsampled(7)
+    assert len(buckets) == 3003 // 7
+    full = history[:len(buckets) * 7].reshape(len(buckets), 7, -1)
+    for j, name in enumerate(SERVER_METRICS):
+        assert np.allclose(buckets[name + '_mean'], full[:, :, j].mean(axis=1)), name
+        assert np.array_equal(buckets[name + '_min'], full[:, :, j].min(axis=1)), name
+        assert np.array_equal(buckets[name + '_max'], full[:, :, j].max(axis=1)), name
+    assert list(telemetry.downsampled(1000)['step']) == [0, 1000, 2000]
+
+    spilled = read_metrics(spill)
+    assert len(spilled) == 3003
+    assert np.allclose(spilled[list(SERVER_METRICS)].to_numpy(), history)
+
+
+def test_partial_bucket_covers_the_tail():
+    telemetry = TelemetryRecorder(capacity=100, levels=(7,), block=50)
+    history = run_server(ResilientServer(telemetry=telemetry), 30)
+
+    buckets = telemetry.downsampled(7, partial=True)
+    assert list(buckets['step']) == [0, 7, 14, 21, 28]
+    assert buckets['load_max'].iloc[-1] == history[28:, 1].max()
+    assert len(telemetry.downsampled(7)) == 4
+
+
+def test_long_simulation_memory_is_independent_of_steps(tmp_path, monkeypatch):
+    """The simulator keeps a fixed ring plus at most max_points buckets, whatever the run length"""
+    monkeypatch.setattr(ResilientServer, "should_continue", lambda self: True)
+    random.seed(0)
+    spill = str(tmp_path / "run.csv")
+    server = run_long_simulation(steps=5000, max_points=100, save_to=str(tmp_path / "run.png"), spill_path=spill)
+
+    telemetry = server.telemetry
+    assert telemetry.capacity == 100 and len(telemetry) == 5000
+    assert len(telemetry.downsampled(50)) == 100
+    assert len(read_metrics(spill)) == 5000
+
+
+def test_recorder_works_without_metrics_sink(tmp_path, monkeypatch):
+    import server_telemetry
+    monkeypatch.setattr(server_telemetry, "open_sink", None)
+    server = ResilientServer()
+    history = run_server(server, 300)
+    assert np.array_equal(server.telemetry.recent()['load'], history[-100:, 1])
+    with pytest.raises(ImportError):
+        TelemetryRecorder(spill_path=str(tmp_path / "telemetry.csv"))
@@ -0,0 +1,130 @@
+import asyncio
+import random
+import pytest
+from dataclasses import asdict
+from agent import Agent, SimulatedClock
+from session_host import SessionHost
+
+LABELS = ["Relief", "Shame", "Confusion", "Interest"]
+
+
+def make_events(seed, n):
+    rng = random.Random(seed)
+    return [(rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(LABELS)) for _ in range(n)]
+
+
+def test_sessions_match_sequential_agents():
+    """Concurrent clients across many sessions get the same states as stepping each agent alone"""
+    n_sessions, n_events = 2000, 5
+    events = {sid: make_events(sid, n_events) for sid in range(n_sessions)}
+
+    async def client(host, sid):
+        return [asdict(await host.step(sid, *event)) for event in events[sid]]
+
+    async def main():
+        async with SessionHost(agent_factory=lambda: Agent(clock=SimulatedClock()), max_batch=512) as host:
+            replies = await asyncio.gather(*(client(host, sid) for sid in range(n_sessions)))
+        return host, replies
+
+    host, replies = asyncio.run(main())
+    assert host.processed == n_sessions * n_events
+    assert host.batches < host.processed, "Events were not micro-batched"
+    for sid in (0, 7, 1999):
+        reference = Agent(clock=SimulatedClock())
+        expected = []
+        for event in events[sid]:
+            reference.step(*event)
+            expected.append(asdict(reference.state))
+        assert replies[sid] == expected, f"Session {sid} diverged"
+
+
+def test_each_future_gets_the_state_after_its_own_event():
+    """Events submitted together land in one batch, yet every future sees only the events up to its own"""
+    events = {sid: make_events(sid, 20) for sid in (1, 2)}
+
+    async def main():
+        async with SessionHost(agent_factory=lambda: Agent(clock=SimulatedClock())) as host:
+            futures = {sid: [] for sid in events}
+            for k in range(20):
+                for sid in events:
+                    futures[sid].append(await host.submit(sid, *events[sid][k]))
+            states = {sid: [asdict(await f) for f in fs] for sid, fs in futures.items()}
+        return host, states
+
+    host, states = asyncio.run(main())
+    assert host.batches == 1
+    for sid, session_events in events.items():
+        reference = Agent(clock=SimulatedClock())
+        expected = []
+        for event in session_events:
+            reference.step(*event)
+            expected.append(asdict(reference.state))
+        assert states[sid] == expected
+
+
+def test_backpressure_bounds_inbox_and_keeps_order():
+    async def main():
+        host = SessionHost(agent_factory=lambda: Agent(clock=SimulatedClock()), queue_size=3, max_batch=2)
+        peak = 0
+
+        async def producer():
+            nonlocal peak
+            futures = []
+            for i in range(20):
+                futures.append(await host.submit("s", 0.5, i / 20, "Queued"))
+                peak = max(peak, host.pending("s"))
+            return await asyncio.gather(*futures)
+
+        states = await producer()
+        await host.stop()
+        return host, peak, states
+
+    host, peak, states = asyncio.run(main())
+    assert peak <= 3
+    assert len(host.agent("s").memory.records) == 20
+    assert [r.intensity for r in host.agent("s").memory.records] == [i / 20 for i in range(20)]
+    assert states[-1] == host.agent("s").state
+
+
+def test_failing_session_gets_its_exception_and_others_continue():
+    def factory():
+        agent = Agent(clock=SimulatedClock())
+        if len(created) == 1:
+            agent.step_stream = lambda events: (_ for _ in ()).throw(ValueError("broken session"))
+        created.append(agent)
+        return agent
+
+    created = []
+
+    async def main():
+        async with SessionHost(agent_factory=factory) as host:
+            first = await host.step("ok", 0.5, 0.5, "Relief")
+            results = await asyncio.gather(host.step("bad", 0.5, 0.5, "Shame"), host.step("ok", 0.5, 0.5, "Relief"),
+                                           return_exceptions=True)
+        return host, first, results
+
+    host, first, (bad, ok) = asyncio.run(main())
+    assert isinstance(bad, ValueError)
+    assert ok == host.agent("ok").state != first
+    assert host._worker is None
+
+
+def test_stop_waits_for_queued_events_and_raises_if_the_worker_died():
+    async def drained():
+        host = SessionHost(agent_factory=lambda: Agent(clock=SimulatedClock()))
+        futures = [await host.submit(sid, 0.5, 0.2, "Queued") for sid in range(50)]
+        await host.stop()
+        return all(f.done() for f in futures)
+
+    assert asyncio.run(drained())
+
+    async def died():
+        host = SessionHost(agent_factory=lambda: Agent(clock=SimulatedClock()))
+        host._drain = lambda: 1 / 0
+        future = await host.submit("s", 0.5, 0.2, "Queued")
+        with pytest.raises(ZeroDivisionError):
+            await host.stop()
+        return future
+
+    future = asyncio.run(died())
+    assert isinstance(future.exception(), ZeroDivisionError)
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import pytest
+from dataclasses import asdict
+from agent import Agent, SimulatedClock
+from session_host import SessionHost
+from session_store import TieredSessionStore, estimate_agent_bytes
+
+LABELS = ["Relief", "Shame", "Confusion", "Interest"]
+
+
+def simulated_agent():
+    return Agent(clock=SimulatedClock(seconds_per_step=600))
+
+
+def test_evicted_agents_reload_with_full_history(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    budget = 10 * estimate_agent_bytes(simulated_agent())
+    rng = random.Random(3)
+    reference = {}
+
+    store = TieredSessionStore(path, byte_budget=budget, batch_size=8, flush_interval=0.01)
+    for step in range(2000):
+        sid = rng.randrange(60)
+        event = (rng.uniform(0.1, 0.9), rng.uniform(0.0, 1.0), rng.choice(LABELS))
+        agent = store.get(sid)
+        if agent is None:
+            agent = store[sid] = simulated_agent()
+        agent.step(*event)
+        reference.setdefault(sid, simulated_agent()).step(*event)
+        assert store.hot_bytes <= budget
+    assert store.evictions > 0 and store.reloads > 0
+
+    for sid in (0, 17, 59):
+        assert asdict(store[sid].state) == asdict(reference[sid].state)
+        assert [asdict(r) for r in store[sid].memory.records] == [asdict(r) for r in reference[sid].memory.records]
+    store.close()
+
+    reopened = TieredSessionStore(path, byte_budget=budget)
+    assert len(reopened) == 0
+    for sid, agent in reference.items():
+        assert asdict(reopened[sid].state) == asdict(agent.state), f"Session {sid} lost after restart"
+        assert len(reopened[sid].memory.records) == len(agent.memory.records)
+    assert 404 not in reopened
+    reopened.close()
+
+
+def test_store_backs_session_host(tmp_path):
+    store = TieredSessionStore(str(tmp_path / "host.db"), byte_budget=5 * estimate_agent_bytes(simulated_agent()))
+
+    async def main():
+        async with SessionHost(agent_factory=simulated_agent, sessions=store) as host:
+            for _ in range(3):
+                await asyncio.gather(*(host.step(sid, 0.5, 0.4, "Hosted") for sid in range(40)))
+
+    asyncio.run(main())
+    assert len(store) <= 5
+    assert all(len(store[sid].memory.records) == 3 for sid in range(40))
+    store.close()
+
+
+def test_ids_keep_their_type(tmp_path):
+    store = TieredSessionStore(str(tmp_path / "keys.db"), byte_budget=1)  # Evicts all but the newest
+    store[1], store["1"], store[b"1"] = simulated_agent(), simulated_agent(), simulated_agent()
+    store["1"].step(0.5, 0.9, "Text id")
+    store[1].step(0.5, 0.1, "Int id")
+    store.close()
+
+    reopened = TieredSessionStore(str(tmp_path / "keys.db"))
+    assert [r.label for r in reopened[1].memory.records] == ["Int id"]
+    assert [r.label for r in reopened["1"].memory.records] == ["Text id"]
+    assert len(reopened[b"1"].memory.records) == 0
+    with pytest.raises(TypeError):
+        reopened[(1, 2)] = simulated_agent()
+    with pytest.raises(TypeError):
+        reopened[True] = simulated_agent()  # Would otherwise share session 1
+    assert reopened.get(True) is None
+    reopened.close()
+
+
+def test_flush_raises_when_the_writer_fails(tmp_path):
+    store = TieredSessionStore(str(tmp_path / "broken.db"), byte_budget=1, flush_interval=0.01)
+    store._db.close()  # Every write now fails in the writer thread
+    store["a"], store["b"] = simulated_agent(), simulated_agent()
+    with pytest.raises(RuntimeError, match="writer failed"):
+        store.flush()
+    with pytest.raises(RuntimeError):
+        store.close()